@@ -60,7 +60,7 @@ class CodeAnalyzer(object):
         """Return a smt bit vector that represents a register (architectural or
         temporal).
         """
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             if operand.name in self._arch_info.registers_all:
                 # Process architectural registers (eax, ebx, etc.)
                 expr = self.get_register_expr(operand.name, mode=mode)
@@ -68,8 +68,8 @@ class CodeAnalyzer(object):
                 # Process temporal registers (t0, t1, etc.)
                 var_name = self._get_var_name(operand.name, mode)
                 expr = self._translator.make_bitvec(operand.size, var_name)
-        elif isinstance(operand, ReilImmediateOperand):
-            expr = smtsymbol.Constant(operand.size, operand.immediate)
+        elif type(operand) is ReilImmediateOperand:
+            expr = smtsymbol.make_constant(operand.size, operand.immediate)
         else:
             raise Exception("Invalid operand: %s" % str(operand))
 
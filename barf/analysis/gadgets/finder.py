@@ -341,6 +341,11 @@ class GadgetTreeNode(object):
     """Tree Data Structure.
     """
 
+    __slots__ = [
+        '_root',
+        '_children',
+    ]
+
     def __init__(self, root):
         self._root = root
         self._children = []
@@ -251,9 +251,9 @@ class GadgetVerifier(object):
 
         constrs = []
 
-        for i in reversed(range(0, size, 8)):
-            bytes_exprs_1 = self.analyzer.get_memory_expr(addr + i // 8, 8 // 8)
-            bytes_exprs_2 = smtfunction.extract(dst, i, 8)
+        for i in reversed(range(size >> 3)):
+            bytes_exprs_1 = self.analyzer.get_memory_expr(addr + i, 1)
+            bytes_exprs_2 = smtfunction.extract(dst, i << 3, 8)
 
             constrs += [bytes_exprs_1 != bytes_exprs_2]
 
@@ -288,9 +288,9 @@ class GadgetVerifier(object):
 
         constrs = []
 
-        for i in reversed(range(0, size, 8)):
-            bytes_exprs_1 = self.analyzer.get_memory_expr(addr + i // 8, 8 // 8)
-            bytes_exprs_2 = smtfunction.extract(src, i, 8)
+        for i in reversed(range(size >> 3)):
+            bytes_exprs_1 = self.analyzer.get_memory_expr(addr + i, 1)
+            bytes_exprs_2 = smtfunction.extract(src, i << 3, 8)
 
             constrs += [bytes_exprs_1 != bytes_exprs_2]
 
@@ -97,6 +97,10 @@ class ArchitectureInformation(object):
 
 class AssemblyInstruction(object):
 
+    __slots__ = [
+        '_ir_instrs',
+    ]
+
     def __init__(self):
         self._ir_instrs = []
 
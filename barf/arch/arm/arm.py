@@ -36,6 +36,10 @@ from barf.arch import ARCH_ARM_MODE_THUMB
 from barf.arch import ArchitectureInformation
 from barf.arch import AssemblyInstruction
 
+
+# Python integer types (int and long are the same type in Python 3).
+_int_types = frozenset([int, long])
+
 # Used in CS->BARF translator
 arm_alias_reg_map = {
      "a1": "r0",
@@ -498,6 +502,22 @@ class ArmInstruction(AssemblyInstruction):
                 self._update_flags,
                 self._ldm_stm_addr_mode)
 
+    def __copy__(self):
+        # Operands are shared but the list that holds them is not, so it
+        # can be modified without affecting the original instruction.
+        instr = ArmInstruction(self._orig_instr, self._mnemonic,
+                               list(self._operands), self._arch_mode)
+
+        instr._bytes = self._bytes
+        instr._size = self._size
+        instr._address = self._address
+        instr._condition_code = self._condition_code
+        instr._update_flags = self._update_flags
+        instr._ldm_stm_addr_mode = self._ldm_stm_addr_mode
+        instr._ir_instrs = list(self._ir_instrs)
+
+        return instr
+
     def __str__(self):
         operands_str = ", ".join([str(oprnd) for oprnd in self._operands])
 
@@ -587,7 +607,7 @@ class ArmImmediateOperand(ArmOperand):
                 immediate = int(immediate)
                 self._base_hex = False
 
-        assert type(immediate) in [int, long], "Invalid immediate value type."
+        assert type(immediate) in _int_types, "Invalid immediate value type."
 
         self._immediate = immediate
         self._size = size
@@ -51,9 +51,18 @@ from capstone.arm import ARM_CC_NE
 from capstone.arm import ARM_CC_PL
 from capstone.arm import ARM_CC_VC
 from capstone.arm import ARM_CC_VS
+from capstone.arm import ARM_INS_ADD
+from capstone.arm import ARM_INS_EOR
+from capstone.arm import ARM_INS_ORR
+from capstone.arm import ARM_INS_POP
+from capstone.arm import ARM_INS_PUSH
+from capstone.arm import ARM_INS_SUB
+from capstone.arm import ARM_INS_VPOP
+from capstone.arm import ARM_INS_VPUSH
 from capstone.arm import ARM_OP_IMM
 from capstone.arm import ARM_OP_MEM
 from capstone.arm import ARM_OP_REG
+from capstone.arm import ARM_REG_ENDING
 from capstone.arm import ARM_SFT_ASR
 from capstone.arm import ARM_SFT_ASR_REG
 from capstone.arm import ARM_SFT_LSL
@@ -116,6 +125,28 @@ cc_capstone_barf_mapper = {
     ARM_CC_LO: ARM_COND_CODE_LO,
 }
 
+# Instructions that accept the THUMB two-operand short notation.
+thumb_short_notation_ids = frozenset([
+    ARM_INS_ADD,
+    ARM_INS_EOR,
+    ARM_INS_ORR,
+    ARM_INS_SUB,
+])
+
+# Instructions whose register list does not include the base register (SP
+# is implicit).
+push_pop_ids = frozenset([
+    ARM_INS_POP,
+    ARM_INS_PUSH,
+    ARM_INS_VPOP,
+    ARM_INS_VPUSH,
+])
+
+ldm_stm_mnemonic_prefixes = frozenset([
+    "ldm",
+    "stm",
+])
+
 logger = logging.getLogger(__name__)
 
 
@@ -194,6 +225,22 @@ class ArmDisassembler(Disassembler):
         # TODO: define default disassembler externally
         self._disassembler = self._available_disassemblers[architecture_mode]
 
+        # Register operands, indexed by Capstone register id. They are
+        # shared between instructions, so they must not be modified.
+        self._cs_reg_table = []
+
+        self.__setup_register_table()
+
+        # Capstone operand types already reported as not supported.
+        self._unknown_operand_types = set()
+
+        # Operand translation functions, indexed by Capstone operand type.
+        self._cs_operand_translators = {
+            ARM_OP_REG: self.__cs_translate_reg_operand,
+            ARM_OP_IMM: self.__cs_translate_imm_operand,
+            ARM_OP_MEM: self.__cs_translate_mem_operand,
+        }
+
     def disassemble(self, data, address, architecture_mode=None):
         """Disassemble the data into an instruction.
         """
@@ -219,28 +266,58 @@ class ArmDisassembler(Disassembler):
 
         return instr
 
-    def disassemble_all(self, data, address):
+    def disassemble_all(self, data, address, architecture_mode=None):
         """Disassemble the data into multiple instructions.
         """
-        raise NotImplementedError()
+        if architecture_mode is None:
+            if self._arch_mode is None:
+                architecture_mode = ARCH_ARM_MODE_THUMB
+            else:
+                architecture_mode = self._arch_mode
+
+        disassembler = self._available_disassemblers[architecture_mode]
+        translate_insn = self._cs_translate_insn
+
+        instrs = []
+
+        # Let Capstone decode the whole buffer in one pass. Decoding stops
+        # at the first invalid instruction.
+        for cs_insn in disassembler.disasm(bytes(data), address):
+            instr = translate_insn(cs_insn)
+
+            offset = cs_insn.address - address
+
+            instr.address = cs_insn.address
+            instr.size = cs_insn.size
+            instr.bytes = data[offset:offset + cs_insn.size]
+
+            instrs.append(instr)
+
+        return instrs
 
     def _cs_disassemble_one(self, data, address):
         """Disassemble the data into an instruction in string form.
         """
-        disasm = list(self._disassembler.disasm(bytes(data), address))
+        data = bytes(data)
+
+        # Only the first instruction is needed, so ask Capstone to decode
+        # just that one.
+        disasm = next(self._disassembler.disasm(data, address, 1), None)
 
         # TODO: Improve this check.
-        if len(disasm) > 0:
-            return disasm[0]
-        else:
-            cs_arm = Cs(CS_ARCH_ARM, CS_MODE_ARM)
-            cs_arm.detail = True
-            disasm = list(cs_arm.disasm(bytes(data), address))
+        if disasm:
+            return disasm
 
-            if len(disasm) > 0:
-                return disasm[0]
-            else:
-                raise InvalidDisassemblerData("CAPSTONE: Unknown instruction (Addr: {:s}).".format(hex(address)))
+        # Fall back to ARM mode (unless it is the mode that just failed).
+        cs_arm = self._available_disassemblers[ARCH_ARM_MODE_ARM]
+
+        if cs_arm is not self._disassembler:
+            disasm = next(cs_arm.disasm(data, address, 1), None)
+
+            if disasm:
+                return disasm
+
+        raise InvalidDisassemblerData("CAPSTONE: Unknown instruction (Addr: {:s}).".format(hex(address)))
 
     def __setup_available_disassemblers(self):
         arch_map = {
@@ -256,19 +333,27 @@ class ArmDisassembler(Disassembler):
         self._available_disassemblers[ARCH_ARM_MODE_ARM].detail = True
         self._available_disassemblers[ARCH_ARM_MODE_THUMB].detail = True
 
-    # Casptone to BARF translation
-    # ======================================================================== #
-    def __cs_reg_idx_to_arm_op_reg(self, cs_reg_idx, cs_insn):
-        name = str(cs_insn.reg_name(cs_reg_idx))
-        if name in arm_alias_reg_map:
-            name = arm_alias_reg_map[name]
+    def __setup_register_table(self):
+        cs_arm = self._available_disassemblers[ARCH_ARM_MODE_ARM]
 
-        if name in self._arch_info.registers_size:
-            size = self._arch_info.registers_size[name]
-        else:
-            size = self._arch_info.architecture_size
+        self._cs_reg_table = []
+
+        for cs_reg_idx in range(ARM_REG_ENDING):
+            name = str(cs_arm.reg_name(cs_reg_idx))
+            if name in arm_alias_reg_map:
+                name = arm_alias_reg_map[name]
 
-        return ArmRegisterOperand(name, size)
+            if name in self._arch_info.registers_size:
+                size = self._arch_info.registers_size[name]
+            else:
+                size = self._arch_info.architecture_size
+
+            self._cs_reg_table.append(ArmRegisterOperand(name, size))
+
+    # Casptone to BARF translation
+    # ======================================================================== #
+    def __cs_reg_idx_to_arm_op_reg(self, cs_reg_idx):
+        return self._cs_reg_table[cs_reg_idx]
 
     def __cs_shift_to_arm_op(self, cs_op, cs_insn, arm_base):
         if cs_op.shift.type == 0:
@@ -298,73 +383,97 @@ class ArmDisassembler(Disassembler):
             if cs_op.shift.value == 0:
                 raise Exception("Shift value is zero.")
         elif cs_op.shift.type <= ARM_SFT_RRX_REG:
-            amount = self.__cs_reg_idx_to_arm_op_reg(cs_op.shift.value, cs_insn)
+            amount = self.__cs_reg_idx_to_arm_op_reg(cs_op.shift.value)
         else:
             raise Exception("Unknown shift type.")
 
         return ArmShiftedRegisterOperand(arm_base, sh_type, amount, arm_base.size)
 
     def __cs_translate_operand(self, cs_op, cs_insn):
-        if cs_op.type == ARM_OP_REG:
-            reg = self.__cs_reg_idx_to_arm_op_reg(cs_op.value.reg, cs_insn)
+        translate_fn = self._cs_operand_translators.get(cs_op.type)
 
-            if cs_op.shift.type > 0:
-                oprnd = self.__cs_shift_to_arm_op(cs_op, cs_insn, reg)
-            else:
-                oprnd = reg
-        elif cs_op.type == ARM_OP_IMM:
-            oprnd = ArmImmediateOperand(cs_op.value.imm, self._arch_info.operand_size)
-        elif cs_op.type == ARM_OP_MEM:
-            reg_base = self.__cs_reg_idx_to_arm_op_reg(cs_op.mem.base, cs_insn)
-
-            # TODO: memory index type
-            index_type = ARM_MEMORY_INDEX_OFFSET
-
-            if cs_op.mem.index > 0:
-                if cs_op.mem.disp > 0:
-                    raise Exception("ARM_OP_MEM: Both index and disp > 0, only one can be.")
-
-                displacement = self.__cs_reg_idx_to_arm_op_reg(cs_op.mem.index, cs_insn)
-
-                # NOTE: In the case of a memory operand, in the second
-                # position (slot [1]), the information regarding whether
-                # or not the displacement of the operand has a shifted
-                # register is encoded in the first operand (slot [0]),
-                # that doesn't have a direct relation with the other.
-
-                # TODO: Check if this has to be reported to CS.
-                if cs_insn.operands[0].shift.type > 0:
-                    # There's a shift operation, the displacement extracted
-                    # earlier was just the base register of the shifted
-                    # register that is generating the displacement.
-                    displacement = self.__cs_shift_to_arm_op(cs_insn.operands[0], cs_insn, displacement)
+        if not translate_fn:
+            error_msg = "Instruction: " + cs_insn.mnemonic + " " + cs_insn.op_str + ". Unknown operand type: " + str(cs_op.type)
+
+            # Report each unknown operand type once, a large binary may
+            # contain many instructions using it.
+            if cs_op.type not in self._unknown_operand_types:
+                self._unknown_operand_types.add(cs_op.type)
+
+                logger.error(error_msg)
             else:
-                displacement = ArmImmediateOperand(cs_op.mem.disp, self._arch_info.operand_size)
+                logger.debug(error_msg)
 
-            disp_minus = True if cs_op.mem.index == -1 else False
+            raise CapstoneOperandNotSupported(error_msg)
 
-            oprnd = ArmMemoryOperand(reg_base, index_type, displacement, disp_minus, self._arch_info.operand_size)
-        else:
-            error_msg = "Instruction: " + cs_insn.mnemonic + " " + cs_insn.op_str + ". Unknown operand type: " + str(cs_op.type)
+        return translate_fn(cs_op, cs_insn)
 
-            logger.error(error_msg)
+    def __cs_translate_reg_operand(self, cs_op, cs_insn):
+        reg = self.__cs_reg_idx_to_arm_op_reg(cs_op.value.reg)
 
-            raise CapstoneOperandNotSupported(error_msg)
+        if cs_op.shift.type > 0:
+            oprnd = self.__cs_shift_to_arm_op(cs_op, cs_insn, reg)
+        else:
+            oprnd = reg
 
         return oprnd
 
+    def __cs_translate_imm_operand(self, cs_op, cs_insn):
+        return ArmImmediateOperand(cs_op.value.imm, self._arch_info.operand_size)
+
+    def __cs_translate_mem_operand(self, cs_op, cs_insn):
+        reg_base = self.__cs_reg_idx_to_arm_op_reg(cs_op.mem.base)
+
+        # TODO: memory index type
+        index_type = ARM_MEMORY_INDEX_OFFSET
+
+        if cs_op.mem.index > 0:
+            if cs_op.mem.disp > 0:
+                raise Exception("ARM_OP_MEM: Both index and disp > 0, only one can be.")
+
+            displacement = self.__cs_reg_idx_to_arm_op_reg(cs_op.mem.index)
+
+            # NOTE: In the case of a memory operand, in the second
+            # position (slot [1]), the information regarding whether
+            # or not the displacement of the operand has a shifted
+            # register is encoded in the first operand (slot [0]),
+            # that doesn't have a direct relation with the other.
+
+            # TODO: Check if this has to be reported to CS.
+            cs_op_0 = cs_insn.operands[0]
+
+            if cs_op_0.shift.type > 0:
+                # There's a shift operation, the displacement extracted
+                # earlier was just the base register of the shifted
+                # register that is generating the displacement.
+                displacement = self.__cs_shift_to_arm_op(cs_op_0, cs_insn, displacement)
+        else:
+            displacement = ArmImmediateOperand(cs_op.mem.disp, self._arch_info.operand_size)
+
+        disp_minus = True if cs_op.mem.index == -1 else False
+
+        return ArmMemoryOperand(reg_base, index_type, displacement, disp_minus, self._arch_info.operand_size)
+
     def _cs_translate_insn(self, cs_insn):
-        operands = [self.__cs_translate_operand(op, cs_insn) for op in cs_insn.operands]
+        # Capstone instruction attributes are computed on every access
+        # (through ctypes), so read each of them only once.
+        translate_operand = self.__cs_translate_operand
 
+        operands = [translate_operand(op, cs_insn) for op in cs_insn.operands]
+
+        cs_id = cs_insn.id
         mnemonic = cs_insn.mnemonic
+        op_str = cs_insn.op_str
+        cc = cs_insn.cc
+        update_flags = cs_insn.update_flags
 
         # Special case: register list "{rX - rX}", stored as a series of
         # registers has to be converted to ArmRegisterListOperand.
-        if "{" in cs_insn.op_str:
+        if "{" in op_str:
             reg_list = []
             op_translated = []
 
-            if not("push" in mnemonic or "pop" in mnemonic):
+            if cs_id not in push_pop_ids:
                 # First operand is the base (in push/pop, the base
                 # register, sp is omitted)
                 op_translated.append(operands[0])
@@ -386,18 +495,20 @@ class ArmDisassembler(Disassembler):
         # Remove condition code from the mnemonic, this goes first than the
         # removal of the update flags suffix, because according to UAL syntax
         # the this suffix goes after the update flags suffix in the mnemonic.
-        if cs_insn.cc != ARM_CC_INVALID and cs_insn.cc != ARM_CC_AL:
-            cc_suffix_str = cc_inverse_mapper[cc_capstone_barf_mapper[cs_insn.cc]]
+        if cc != ARM_CC_INVALID and cc != ARM_CC_AL:
+            cc_suffix_str = cc_inverse_mapper[cc_capstone_barf_mapper[cc]]
 
             if cc_suffix_str == mnemonic[-2:]:
                 mnemonic = mnemonic[:-2]
 
         # Remove update flags suffix (s)
-        if cs_insn.update_flags and mnemonic[-1] == 's':
+        if update_flags and mnemonic[-1] == 's':
             mnemonic = mnemonic[:-1]
 
+        is_ldm_stm = mnemonic[0:3] in ldm_stm_mnemonic_prefixes
+
         # Remove LDM/STM addressing modes from the mnemonic, later include it in the ArmInstruction
-        if mnemonic[0:3] == "ldm" or mnemonic[0:3] == "stm":
+        if is_ldm_stm:
             ldm_stm_am = None
             if mnemonic[-2:] in ldm_stm_am_mapper:
                 ldm_stm_am = ldm_stm_am_mapper[mnemonic[-2:]]
@@ -405,29 +516,31 @@ class ArmDisassembler(Disassembler):
 
         # TODO: Temporary hack to accommodate THUMB short notation:
         # "add r0, r1" -> "add r0, r0, r1"
-        if len(operands) == 2 and (mnemonic == "add" or
-                                   mnemonic == "eor" or
-                                   mnemonic == "orr" or
-                                   mnemonic == "sub"):
+        if len(operands) == 2 and cs_id in thumb_short_notation_ids:
             operands = [operands[0], operands[0], operands[1]]
 
         instr = ArmInstruction(
-            mnemonic + " " + cs_insn.op_str,
+            mnemonic + " " + op_str,
             mnemonic,
             operands,
             self._arch_mode
         )
 
-        if cs_insn.cc != ARM_CC_INVALID:
-            instr.condition_code = cc_capstone_barf_mapper[cs_insn.cc]
+        if cc != ARM_CC_INVALID:
+            instr.condition_code = cc_capstone_barf_mapper[cc]
 
-        if cs_insn.update_flags:
+        if update_flags:
             instr.update_flags = True
 
-        if mnemonic[0:3] == "ldm" or mnemonic[0:3] == "stm":
+        if is_ldm_stm:
             instr.ldm_stm_addr_mode = ldm_stm_am
-            if "!" in cs_insn.op_str:
-                instr.operands[0].wb = True
+            if "!" in op_str:
+                # Do not modify the (shared) base register operand.
+                base = instr.operands[0]
+                base_wb = ArmRegisterOperand(base.name, base.size)
+                base_wb.wb = True
+
+                instr.operands[0] = base_wb
 
         # TODO: LOAD/STORE MODE (it may be necessary to parse the mnemonic).
 
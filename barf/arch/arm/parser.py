@@ -29,18 +29,9 @@ from __future__ import absolute_import
 
 import copy
 import logging
+import re
 
-from pyparsing import alphanums
-from pyparsing import Combine
-from pyparsing import Literal
-from pyparsing import nums
-from pyparsing import Optional
-from pyparsing import Or
-from pyparsing import Suppress
-from pyparsing import Word
-from pyparsing import ZeroOrMore
-from pyparsing import Group
-from pyparsing import LineEnd
+from collections import OrderedDict
 
 from barf.arch import ARCH_ARM_MODE_THUMB
 from barf.arch.arm import ArmArchitectureInformation
@@ -55,355 +46,482 @@ from barf.arch.arm import ARM_MEMORY_INDEX_POST
 from barf.arch.arm import ARM_MEMORY_INDEX_PRE
 from barf.arch.arm import cc_mapper
 from barf.arch.arm import ldm_stm_am_mapper
+from barf.utils.utils import add_to_lru_cache
 
 logger = logging.getLogger(__name__)
 
-arch_info = None
+
+# Lexer
+# ============================================================================ #
+_TOKEN_RE = re.compile(r"0x[0-9a-f]+|[0-9]+|\w+|\S")
+
+_REG_NUM_RE = re.compile(r"[rdcp][0-9]+$")
+
+_REG_NAMES = frozenset([
+    "sp", "lr", "pc", "fp", "ip", "sl", "sb", "cpsr", "fpscr", "apsr", "cpsr_fc",
+])
+
+_NORM_RE = re.compile(r"\s*,\s*|\s+|\b0x0+(?=[0-9a-f])")
+
+# End of input marker (it does not match any rule).
+_END = ""
+
+_SHIFT_TYPES = frozenset(["lsl", "lsr", "asr", "ror", "rrx"])
+
+_SIGNS = frozenset(["+", "-"])
+
+
+def _normalize_replace(match):
+    text = match.group()
+
+    if "," in text:
+        return ", "
+
+    if text[0] == "0":
+        return "0x"
+
+    return " "
+
+
+def _normalize(instr):
+    """Return the canonical form of an instruction string, that is, in
+    lowercase, with single spaces, a space after each comma and no leading
+    zeros in hexadecimal numbers.
+    """
+    return _NORM_RE.sub(_normalize_replace, instr.lower()).strip()
+
+
+def _build_mnemonic_table():
+    """Build a table that maps every suffixed mnemonic to its components,
+    that is, (instruction, condition code, update flags, ldm/stm addressing
+    mode).
+    """
+    ccs = [""] + list(cc_mapper.keys())
+    ams = [""] + list(ldm_stm_am_mapper.keys())
+
+    def cc_plus_uf(ins):
+        for cc in ccs:
+            yield cc, (ins, cc, False, "")
+            yield cc + "s", (ins, cc, True, "")     # pre-UAL syntax
+            yield "s" + cc, (ins, cc, True, "")     # UAL syntax
+
+    def cc_only(ins):
+        for cc in ccs:
+            yield cc, (ins, cc, False, "")
+
+    def cc_plus_am(ins):
+        for cc in ccs:
+            for am in ams:
+                yield cc + am, (ins, cc, False, am)
+
+    mnemonics = [
+        ("mov", cc_plus_uf),
+        ("and", cc_plus_uf),
+        ("eor", cc_plus_uf),
+        ("orr", cc_plus_uf),
+
+        ("ldr", cc_only),
+        ("str", cc_only),
+        ("ldrb", cc_only),
+        ("strb", cc_only),
+        ("ldrh", cc_only),
+        ("strh", cc_only),
+        ("ldrd", cc_only),
+        ("strd", cc_only),
+
+        ("ldm", cc_plus_am),
+        ("stm", cc_plus_am),
+
+        ("add", cc_plus_uf),
+        ("sub", cc_plus_uf),
+        ("rsb", cc_plus_uf),
+        ("cmp", cc_only),
+        ("cmn", cc_only),
+
+        ("lsl", cc_plus_uf),
+
+        ("mul", cc_plus_uf),
+
+        ("b", cc_only),
+        ("bl", cc_only),
+        ("bx", cc_only),
+    ]
+
+    table = {}
+
+    # When a mnemonic can be split in more than one way, the first entry in
+    # the list above takes precedence.
+    for ins, suffixes in mnemonics:
+        for suffix, components in suffixes(ins):
+            table.setdefault(ins + suffix, components)
+
+    return table
+
+
+_MNEMONIC_TABLE = _build_mnemonic_table()
 
 
 # Parsing functions
 # ============================================================================ #
-def process_shifted_register(tokens):
+# Operands are shared among parsed instructions as they are not modified
+# once built (except for register operands with the write-back mark set,
+# which are never pooled).
+_register_pool = {}
 
-    base = process_register(tokens["base"])
-    sh_type = tokens["type"]
-    amount = tokens.get("amount", None)
+_immediate_pool = {}
+_immediate_pool_size = 4096
 
-    if amount:
-        if "imm" in amount:
-            amount = ArmImmediateOperand("".join(amount["imm"]), arch_info.operand_size)
-        elif "reg" in amount:
-            amount = process_register(amount["reg"])
-        else:
-            raise Exception("Unknown amount type.")
 
+def process_shifted_register(base, sh_type, amount):
     return ArmShiftedRegisterOperand(base, sh_type, amount, base.size)
 
 
-def process_register(tokens):
-    name = tokens["name"]
+def process_register(arch_info, name):
     if name in arch_info.registers_size:
         size = arch_info.registers_size[name]
     else:
         size = arch_info.architecture_size
-    oprnd = ArmRegisterOperand(name, size)
+
+    key = name, size
+
+    oprnd = _register_pool.get(key)
+
+    if oprnd is None:
+        oprnd = _register_pool[key] = ArmRegisterOperand(name, size)
 
     return oprnd
 
 
-def parse_operand(string, location, tokens):
-    """Parse an ARM instruction operand.
+def process_immediate(arch_info, string):
+    size = arch_info.operand_size
+
+    key = string, size
+
+    oprnd = _immediate_pool.get(key)
+
+    if oprnd is None:
+        oprnd = ArmImmediateOperand(string, size)
+
+        if len(_immediate_pool) < _immediate_pool_size:
+            _immediate_pool[key] = oprnd
+
+    return oprnd
+
+
+def _parse_immediate(tokens, i):
+    """Parse an immediate value (with optional hash and sign). Return the
+    immediate string and the next token index or None, if there is no
+    match.
     """
+    if tokens[i] == "#":
+        i += 1
 
-    if "immediate_operand" in tokens:
-        size = arch_info.operand_size
-        oprnd = ArmImmediateOperand("".join(tokens["immediate_operand"]), size)
+    sign = ""
 
-    if "register_operand" in tokens:
-        oprnd = process_register(tokens["register_operand"])
+    if tokens[i] in _SIGNS:
+        sign = tokens[i]
+        i += 1
 
-        # TODO: Figure out where to really store this flag, instead of in the register class
-        if "wb" in tokens["register_operand"]:
-            oprnd.wb = True
+    if not tokens[i][:1].isdigit():
+        return None
 
-    if "memory_operand" in tokens:
-        mem_oprnd = tokens["memory_operand"]
+    return sign + tokens[i], i + 1
 
-        if "offset" in mem_oprnd:
-            index_type = ARM_MEMORY_INDEX_OFFSET
-            mem_oprnd = mem_oprnd["offset"]
-        elif "pre" in mem_oprnd:
+
+def _parse_register(tokens, i):
+    """Parse a register (with optional write-back mark). Return the register
+    name, the write-back mark and the next token index or None, if there is
+    no match.
+    """
+    name = tokens[i]
+
+    if name not in _REG_NAMES and not _REG_NUM_RE.match(name):
+        return None
+
+    wb = tokens[i + 1] == "!"
+
+    return name, wb, i + 2 if wb else i + 1
+
+
+def _parse_shift(arch_info, tokens, i):
+    """Parse the shift part of a shifted register operand. Return the shift
+    type, the shift amount operand and the next token index or None, if
+    there is no match.
+    """
+    if tokens[i] != "," or tokens[i + 1] not in _SHIFT_TYPES:
+        return None
+
+    sh_type = tokens[i + 1]
+    i += 2
+
+    amount = None
+
+    imm = _parse_immediate(tokens, i)
+
+    if imm:
+        amount = process_immediate(arch_info, imm[0])
+        i = imm[1]
+    else:
+        reg = _parse_register(tokens, i)
+
+        if reg:
+            amount = process_register(arch_info, reg[0])
+            i = reg[2]
+
+    return sh_type, amount, i
+
+
+def _parse_register_or_shifted_register(arch_info, tokens, i):
+    """Parse a register or a shifted register. Return the register operand,
+    the write-back mark and the next token index or None, if there is no
+    match.
+    """
+    reg = _parse_register(tokens, i)
+
+    if not reg:
+        return None
+
+    name, wb, i = reg
+
+    oprnd = process_register(arch_info, name)
+
+    shift = _parse_shift(arch_info, tokens, i)
+
+    if shift:
+        sh_type, amount, i = shift
+
+        return process_shifted_register(oprnd, sh_type, amount), False, i
+
+    return oprnd, wb, i
+
+
+def _parse_displacement(arch_info, tokens, i):
+    """Parse the displacement of a memory operand (with optional sign).
+    Return the minus sign mark, the displacement operand and the next token
+    index or None, if there is no match.
+    """
+    minus = False
+
+    if tokens[i] in _SIGNS:
+        minus = tokens[i] == "-"
+        i += 1
+
+    imm = _parse_immediate(tokens, i)
+
+    if imm:
+        return minus, process_immediate(arch_info, imm[0]), imm[1]
+
+    reg = _parse_register_or_shifted_register(arch_info, tokens, i)
+
+    if reg:
+        return minus, reg[0], reg[2]
+
+    return None
+
+
+def _parse_memory(arch_info, tokens, i):
+    """Parse a memory operand. Return the memory operand and the next token
+    index.
+    """
+    reg = _parse_register(tokens, i + 1)
+
+    if not reg:
+        raise Exception("Invalid memory operand base register.")
+
+    base, _, i = reg
+
+    disp_minus, displ_imm = False, None
+
+    if tokens[i] == ",":
+        disp = _parse_displacement(arch_info, tokens, i + 1)
+
+        if not disp or tokens[disp[2]] != "]":
+            raise Exception("Invalid memory operand displacement.")
+
+        disp_minus, displ_imm, i = disp
+
+        if tokens[i + 1] == "!":
             index_type = ARM_MEMORY_INDEX_PRE
-            mem_oprnd = mem_oprnd["pre"]
-        elif "post" in mem_oprnd:
-            index_type = ARM_MEMORY_INDEX_POST
-            mem_oprnd = mem_oprnd["post"]
+            i += 2
         else:
-            raise Exception("Unknown index type.")
+            index_type = ARM_MEMORY_INDEX_OFFSET
+            i += 1
+    elif tokens[i] == "]":
+        index_type = ARM_MEMORY_INDEX_OFFSET
+        i += 1
 
-        reg_base = process_register(mem_oprnd["base"])
-        disp = mem_oprnd.get("disp", None)
-        disp_minus = True if mem_oprnd.get("minus") else False
+        disp = _parse_displacement(arch_info, tokens, i + 1) if tokens[i] == "," else None
 
         if disp:
-            if "shift" in disp:
-                displ_imm = process_shifted_register(disp["shift"])
-            elif "reg" in disp:
-                displ_imm = process_register(disp["reg"])
-            elif "imm" in disp:
-                displ_imm = ArmImmediateOperand("".join(disp["imm"]), arch_info.operand_size)
-            else:
-                raise Exception("Unknown displacement type.")
-        else:
-            displ_imm = None
-
-        size = arch_info.operand_size
-        # TODO: Add sizes for LDR/STR variations (half word, byte, double word)
-        oprnd = ArmMemoryOperand(reg_base, index_type, displ_imm, disp_minus, size)
-
-    if "shifted_register" in tokens:
-        oprnd = process_shifted_register(tokens["shifted_register"])
-
-    if "register_list_operand" in tokens:
-        parsed_reg_list = tokens["register_list_operand"]
-        reg_list = []
-        for reg_range in parsed_reg_list:
-            start_reg = process_register(reg_range[0])
-            if len(reg_range) > 1:
-                end_reg = process_register(reg_range[1])
-                reg_list.append([start_reg, end_reg])
+            index_type = ARM_MEMORY_INDEX_POST
+            disp_minus, displ_imm, i = disp
+    else:
+        raise Exception("Invalid memory operand.")
+
+    reg_base = process_register(arch_info, base)
+
+    size = arch_info.operand_size
+    # TODO: Add sizes for LDR/STR variations (half word, byte, double word)
+    oprnd = ArmMemoryOperand(reg_base, index_type, displ_imm, disp_minus, size)
+
+    return oprnd, i
+
+
+def _parse_register_list(arch_info, tokens, i):
+    """Parse a register list operand. Return the register list operand and
+    the next token index.
+    """
+    reg_list = []
+
+    i += 1
+
+    if tokens[i] != "}":
+        while True:
+            start = _parse_register(tokens, i)
+
+            if not start:
+                raise Exception("Invalid register list.")
+
+            i = start[2]
+
+            if tokens[i] == "-":
+                end = _parse_register(tokens, i + 1)
+
+                if not end:
+                    raise Exception("Invalid register range.")
+
+                i = end[2]
+
+                reg_list.append([process_register(arch_info, start[0]), process_register(arch_info, end[0])])
             else:
-                reg_list.append([start_reg])
+                reg_list.append([process_register(arch_info, start[0])])
 
-        oprnd = ArmRegisterListOperand(reg_list, reg_list[0][0].size)
+            if tokens[i] != ",":
+                break
 
-    return oprnd
+            i += 1
 
+        if tokens[i] != "}":
+            raise Exception("Invalid register list.")
 
-def parse_instruction(string, location, tokens):
-    """Parse an ARM instruction.
+    oprnd = ArmRegisterListOperand(reg_list, reg_list[0][0].size)
+
+    return oprnd, i + 1
+
+
+def parse_operand(arch_info, tokens, i):
+    """Parse an ARM instruction operand.
     """
-    mnemonic_str = tokens.get("mnemonic")
-    operands = [op for op in tokens.get("operands", [])]
+    token = tokens[i]
 
-    instr = ArmInstruction(
-        string,
-        mnemonic_str["ins"],
-        operands,
-        arch_info.architecture_mode
-    )
+    if token == "[":
+        return _parse_memory(arch_info, tokens, i)
 
-    if "cc" in mnemonic_str:
-        instr.condition_code = cc_mapper[mnemonic_str["cc"]]
+    if token == "{":
+        return _parse_register_list(arch_info, tokens, i)
 
-    if "uf" in mnemonic_str:
-        instr.update_flags = True
+    imm = _parse_immediate(tokens, i)
 
-    if "ldm_stm_addr_mode" in mnemonic_str:
-        instr.ldm_stm_addr_mode = ldm_stm_am_mapper[mnemonic_str["ldm_stm_addr_mode"]]
+    if imm:
+        return process_immediate(arch_info, imm[0]), imm[1]
 
-    return instr
+    reg = _parse_register_or_shifted_register(arch_info, tokens, i)
 
+    if not reg:
+        raise Exception("Invalid operand.")
 
-# Grammar Rules
-# ============================================================================ #
-mul      = Literal("*")
-plus     = Literal("+")
-minus    = Literal("-")
-comma    = Literal(",")
-lbracket = Literal("[")
-rbracket = Literal("]")
-lbrace   = Literal("{")
-rbrace   = Literal("}")
-hashsign = Literal("#")
-exclamation    = Literal("!")
-caret   = Literal("^")
-
-hex_num = Combine(Literal("0x") + Word("0123456789abcdef"))
-dec_num = Word("0123456789")
-
-# Operand Parsing
-# ============================================================================ #
-sign = Optional(Or([plus, minus("minus")]))
-
-immediate = Group(Optional(Suppress(hashsign)) + (sign + Or([hex_num, dec_num]))("value"))
-
-register = Group(Or([
-    Combine(Literal("r") + Word(nums)("reg_num")),
-    Combine(Literal("d") + Word(nums)("reg_num")),
-    Combine(Literal("c") + Word(nums)("reg_num")),
-    Combine(Literal("p") + Word(nums)("reg_num")),
-    Literal("sp"),
-    Literal("lr"),
-    Literal("pc"),
-    Literal("fp"),
-    Literal("ip"),
-    Literal("sl"),
-    Literal("sb"),
-    Literal("cpsr"),
-    Literal("fpscr"),
-    Literal("apsr"),
-    Literal("cpsr_fc"),
-])("name") + Optional(exclamation)("wb"))
-
-shift_type = Or([
-    Literal("lsl"),
-    Literal("lsr"),
-    Literal("asr"),
-    Literal("ror"),
-    Literal("rrx"),
-])
+    oprnd, wb, i = reg
 
-shift_amount = Group(Or([immediate("imm"), register("reg")]))
-
-shifted_register = Group(register("base") + Suppress(comma) + shift_type("type") + Optional(shift_amount("amount")))
-
-displacement = Group(Or([immediate("imm"), register("reg"), shifted_register("shift")]))
-
-offset_memory_operand = Group(
-    Suppress(lbracket) +
-    register("base") +
-    Optional(
-        Suppress(comma) +
-        sign +
-        displacement("disp")
-    ) +
-    Suppress(rbracket)
-)
-
-pre_indexed_memory_operand = Group(
-    Suppress(lbracket) +
-    register("base") +
-    Suppress(comma) +
-    sign +
-    displacement("disp") +
-    Suppress(rbracket) +
-    Suppress(exclamation)
-)
-
-post_indexed_memory_operand = Group(
-    Suppress(lbracket) +
-    register("base") +
-    Suppress(rbracket) +
-    Suppress(comma) +
-    sign +
-    displacement("disp")
-)
-
-memory_operand = Group(Or([
-    offset_memory_operand("offset"),
-    pre_indexed_memory_operand("pre"),
-    post_indexed_memory_operand("post")
-]))
-
-register_range = Group(register("start") + Optional(Suppress(minus) + register("end")))
-
-register_list_operand = Group(
-    Suppress(lbrace) +
-    Optional(ZeroOrMore(register_range + Suppress(comma)) + register_range) +
-    Suppress(rbrace)
-)
-
-operand = (Or([
-    immediate("immediate_operand"),
-    register("register_operand"),
-    shifted_register("shifted_register"),
-    memory_operand("memory_operand"),
-    register_list_operand("register_list_operand")
-])).setParseAction(parse_operand)
-
-# Instruction Parsing
-# ============================================================================ #
-condition_code = Optional(Or([
-    Literal("eq"),
-    Literal("ne"),
+    # TODO: Figure out where to really store this flag, instead of in the register class
+    if wb:
+        oprnd = ArmRegisterOperand(oprnd.name, oprnd.size)
+        oprnd.wb = True
 
-    Literal("cs"), Literal("hs"),
-    Literal("cc"), Literal("lo"),
+    return oprnd, i
 
-    Literal("mi"),
-    Literal("pl"),
 
-    Literal("vs"),
-    Literal("vc"),
+def parse_instruction(arch_info, arch_mode, string):
+    """Parse an ARM instruction.
+    """
+    tokens = _TOKEN_RE.findall(string)
+    tokens.append(_END)
 
-    Literal("hi"),
-    Literal("ls"),
+    mnemonic = tokens[0]
 
-    Literal("ge"),
-    Literal("lt"),
+    if not mnemonic.isalnum():
+        raise Exception("Invalid mnemonic.")
 
-    Literal("gt"),
-    Literal("le"),
+    ins, cc, uf, am = _MNEMONIC_TABLE.get(mnemonic, (mnemonic, "", False, ""))
 
-    Literal("al"),
-]))("cc")
+    operands = []
 
-ldm_stm_addr_mode = Optional(Or([
-    Literal("ia"),
-    Literal("ib"),
-    Literal("da"),
-    Literal("db"),
+    i = 1
 
-    Literal("fd"),
-    Literal("fa"),
-    Literal("ed"),
-    Literal("ea"),
-]))("ldm_stm_addr_mode")
+    if tokens[i] != _END:
+        while True:
+            oprnd, i = parse_operand(arch_info, tokens, i)
 
-update_flags = Optional(Literal("s"))("uf")
+            operands.append(oprnd)
 
-cc_plus_uf = Or([
-    condition_code + update_flags,  # pre-UAL syntax
-    update_flags + condition_code,  # UAL syntax
-])
+            if tokens[i] != ",":
+                break
 
-mnemonic = Group(Or([
-    Combine(Literal("mov")("ins") + cc_plus_uf),
-    Combine(Literal("and")("ins") + cc_plus_uf),
-    Combine(Literal("eor")("ins") + cc_plus_uf),
-    Combine(Literal("orr")("ins") + cc_plus_uf),
+            i += 1
 
-    Combine(Literal("ldr")("ins") + condition_code),
-    Combine(Literal("str")("ins") + condition_code),
-    Combine(Literal("ldrb")("ins") + condition_code),
-    Combine(Literal("strb")("ins") + condition_code),
-    Combine(Literal("ldrh")("ins") + condition_code),
-    Combine(Literal("strh")("ins") + condition_code),
-    Combine(Literal("ldrd")("ins") + condition_code),
-    Combine(Literal("strd")("ins") + condition_code),
+    if tokens[i] != _END:
+        raise Exception("Unexpected token: %s" % tokens[i])
 
-    Combine(Literal("ldm")("ins") + condition_code + ldm_stm_addr_mode),
-    Combine(Literal("stm")("ins") + condition_code + ldm_stm_addr_mode),
+    instr = ArmInstruction(
+        string,
+        ins,
+        operands,
+        arch_mode
+    )
 
-    Combine(Literal("add")("ins") + cc_plus_uf),
-    Combine(Literal("sub")("ins") + cc_plus_uf),
-    Combine(Literal("rsb")("ins") + cc_plus_uf),
-    Combine(Literal("cmp")("ins") + condition_code),
-    Combine(Literal("cmn")("ins") + condition_code),
+    if cc:
+        instr.condition_code = cc_mapper[cc]
 
-    Combine(Literal("lsl")("ins") + cc_plus_uf),
+    if uf:
+        instr.update_flags = True
 
-    Combine(Literal("mul")("ins") + cc_plus_uf),
+    if am:
+        instr.ldm_stm_addr_mode = ldm_stm_am_mapper[am]
 
-    Combine(Literal("b")("ins") + condition_code),
-    Combine(Literal("bl")("ins") + condition_code),
-    Combine(Literal("bx")("ins") + condition_code),
+    return instr
 
-    Word(alphanums)("ins"),
-]))
 
-instruction = (
-    mnemonic("mnemonic") +
-    Optional(ZeroOrMore(operand + Suppress(comma)) + operand)("operands") +
-    LineEnd()
-).setParseAction(parse_instruction)
+# Parser
+# ============================================================================ #
+_valid_operand_sizes = frozenset([8, 16, 32, 64, 80, 128])
 
 
 class ArmParser(object):
     """ARM Instruction Parser.
     """
 
-    def __init__(self, architecture_mode=ARCH_ARM_MODE_THUMB):
-        global arch_info
+    def __init__(self, architecture_mode=ARCH_ARM_MODE_THUMB, cache_size=16384):
+        self._arch_info = ArmArchitectureInformation(architecture_mode)
+        self._arch_mode = self._arch_info.architecture_mode
 
-        arch_info = ArmArchitectureInformation(architecture_mode)
-
-        self._cache = {}
+        # Least recently used instructions are evicted first.
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
 
     def parse(self, instr):
         """Parse an ARM instruction.
         """
         # Commented to get the exception trace of a parser error.
         try:
-            instr_lower = instr.lower()
+            instr_norm = _normalize(instr)
+
+            instr_asm = self._cache.pop(instr_norm, None)
 
-            if instr_lower not in self._cache:
-                instr_asm = instruction.parseString(instr_lower)[0]
+            if instr_asm is None:
+                instr_asm = parse_instruction(self._arch_info, self._arch_mode, instr_norm)
 
-                self._cache[instr_lower] = instr_asm
+            add_to_lru_cache(self._cache, self._cache_size, instr_norm, instr_asm)
 
-            instr_asm = copy.deepcopy(self._cache[instr_lower])
+            instr_asm = copy.copy(instr_asm)
 
             # self._check_instruction(instr_asm)
         except Exception:
@@ -415,14 +533,18 @@ class ArmParser(object):
 
         return instr_asm
 
+    def parse_many(self, instrs):
+        """Parse a list of ARM instructions.
+        """
+        return [self.parse(instr) for instr in instrs]
+
     def _check_instruction(self, instr):
-        # Check operands size.
-        assert all([oprnd.size in [8, 16, 32, 64, 80, 128]
-                        for oprnd in instr.operands]), \
+        for oprnd in instr.operands:
+            # Check operands size.
+            assert oprnd.size in _valid_operand_sizes, \
                 "Invalid operand size: %s" % instr
 
-        # Check memory operand parameters.
-        assert all([oprnd.base_reg or oprnd.index_type or oprnd.displacement
-                        for oprnd in instr.operands
-                            if isinstance(oprnd, ArmMemoryOperand)]), \
-                "Invalid memory operand parameters: %s" % instr
+            # Check memory operand parameters.
+            if isinstance(oprnd, ArmMemoryOperand):
+                assert oprnd.base_reg or oprnd.index_type or oprnd.displacement, \
+                    "Invalid memory operand parameters: %s" % instr
@@ -35,7 +35,6 @@ from barf.arch import ARCH_X86_MODE_32
 from barf.arch import ARCH_X86_MODE_64
 from barf.arch.arm import ArmArchitectureInformation
 from barf.arch.x86 import X86ArchitectureInformation
-from barf.arch.x86.translator import X86Translator
 from barf.core.reil import ReilMnemonic
 from barf.core.reil.container import ReilContainer
 from barf.core.reil.container import ReilContainerInvalidAddressError
@@ -77,6 +76,10 @@ class Emulator(object):
         self.sp = None
         self.ws = None
 
+        # REIL containers of the instructions processed by `execute`, keyed
+        # by address, size and text.
+        self.__containers = {}
+
         # Load instruction pointer register.
         if isinstance(self.arch_info, X86ArchitectureInformation):
             if self.arch_info.architecture_mode == ARCH_X86_MODE_32:
@@ -178,7 +181,7 @@ class Emulator(object):
         handler_fn_post(self, asm_instr, handler_param_post)
 
         # delete temporal registers
-        regs = self.ir_emulator.registers.keys()
+        regs = list(self.ir_emulator.registers.keys())
 
         for r in regs:
             if r.startswith("t"):
@@ -187,14 +190,14 @@ class Emulator(object):
         return next_addr if next_addr else asm_instr.address + asm_instr.size
 
     def __translate(self, asm_instr):
-        reil_translator = X86Translator(self.arch_info.architecture_mode)
+        key = asm_instr.address, asm_instr.size, str(asm_instr)
 
-        # Create ReilContainer
-        instr_container = ReilContainer()
-        instr_seq = ReilSequence()
-        for reil_instr in reil_translator.translate(asm_instr):
-            instr_seq.append(reil_instr)
-        instr_container.add(instr_seq)
+        instr_container = self.__containers.get(key)
+
+        if instr_container is None:
+            instr_container = self.__build_reil_container(asm_instr)
+
+            self.__containers[key] = instr_container
 
         return instr_container
 
@@ -308,8 +311,7 @@ class Emulator(object):
         container = ReilContainer()
         instr_seq = ReilSequence()
 
-        for reil_instr in reil_translator.translate(asm_instr):
-            instr_seq.append(reil_instr)
+        instr_seq.extend(reil_translator.translate(asm_instr))
 
         container.add(instr_seq)
 
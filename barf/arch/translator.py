@@ -113,6 +113,23 @@ class InstructionTranslator(object):
 
         return trans_instrs
 
+    def translate_many(self, instructions):
+        """Return REIL representation of a list of instructions, as a
+        list with the translation of each one.
+        """
+        translate = self._translate
+        trans_instrs = []
+
+        for instruction in instructions:
+            try:
+                trans_instrs.append(translate(instruction))
+            except Exception:
+                self._log_translation_exception(instruction)
+
+                raise TranslationError("Unknown error")
+
+        return trans_instrs
+
     def reset(self):
         """Restart REIL register name generator.
         """
@@ -145,6 +162,12 @@ class TranslationBuilder(object):
 
         self._arch_info = architecture_information
 
+        # Immediate operands already built for this translation, indexed
+        # by (value, size). Constants such as 1 or 0 are requested many
+        # times (flags, branches) and, since operands are never modified,
+        # the same instance can be reused.
+        self._immediates = {}
+
     def add(self, instruction):
         self._instructions.append(instruction)
 
@@ -152,7 +175,16 @@ class TranslationBuilder(object):
         return ReilRegisterOperand(self._ir_name_generator.get_next(), size)
 
     def immediate(self, value, size):
-        return ReilImmediateOperand(value, size)
+        key = (value, size)
+
+        imm = self._immediates.get(key)
+
+        if imm is None:
+            imm = ReilImmediateOperand(value, size)
+
+            self._immediates[key] = imm
+
+        return imm
 
     def label(self, name):
         return ReilLabel(name)
@@ -30,6 +30,8 @@ from __future__ import absolute_import
 import copy
 import logging
 
+from collections import OrderedDict
+
 from pyparsing import alphanums
 from pyparsing import alphas
 from pyparsing import Combine
@@ -46,6 +48,7 @@ from barf.arch.x86 import X86ImmediateOperand
 from barf.arch.x86 import X86Instruction
 from barf.arch.x86 import X86MemoryOperand
 from barf.arch.x86 import X86RegisterOperand
+from barf.utils.utils import add_to_lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -277,12 +280,14 @@ class X86Parser(object):
     """x86 Instruction Parser.
     """
 
-    def __init__(self, architecture_mode):
+    def __init__(self, architecture_mode, cache_size=16384):
         global arch_info, modifier_size
 
         arch_info = X86ArchitectureInformation(architecture_mode)
 
-        self._cache = {}
+        # Least recently used instructions are evicted first.
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
 
         modifier_size["far ptr"] = arch_info.architecture_size
         modifier_size["far"] = arch_info.architecture_size
@@ -294,12 +299,14 @@ class X86Parser(object):
         try:
             instr_lower = instr.lower()
 
-            if instr_lower not in self._cache:
+            instr_asm = self._cache.pop(instr_lower, None)
+
+            if instr_asm is None:
                 instr_asm = instruction.parseString(instr_lower)[0]
 
-                self._cache[instr_lower] = instr_asm
+            add_to_lru_cache(self._cache, self._cache_size, instr_lower, instr_asm)
 
-            instr_asm = copy.deepcopy(self._cache[instr_lower])
+            instr_asm = copy.copy(instr_asm)
 
             # self._check_instruction(instr_asm)
         except Exception:
@@ -28,8 +28,6 @@ import logging
 
 from barf.arch import ARCH_X86_MODE_32
 from barf.arch import ARCH_X86_MODE_64
-from barf.arch.helper import extract_bit
-from barf.arch.helper import extract_sign_bit
 from barf.arch.translator import FlagTranslator
 from barf.arch.translator import InstructionTranslator
 from barf.arch.translator import RegisterTranslator
@@ -60,43 +58,34 @@ class X86FlagTranslator(object):
         tmp0 = tb.temporal(8)
         tmp1 = tb.temporal(8)
         tmp2 = tb.temporal(8)
-        tmp3 = tb.temporal(8)
-        tmp4 = tb.temporal(8)
-        tmp5 = tb.temporal(8)
-        tmp6 = tb.temporal(8)
-        tmp7 = tb.temporal(8)
-        tmp8 = tb.temporal(8)
 
-        zero = tb.immediate(0, 8)
-
-        imm4 = tb.immediate(4, 8)
+        imm0 = tb.immediate(0xf, oprnd0.size)
         immn4 = tb.immediate(-4, 8)
 
-        # Extract lower byte.
-        tb.add(tb._builder.gen_str(oprnd0, tmp0))
-        tb.add(tb._builder.gen_str(oprnd1, tmp1))
-
         # Zero-extend lower 4 bits.
-        tb.add(tb._builder.gen_bsh(tmp0, imm4, tmp2))
-        tb.add(tb._builder.gen_bsh(tmp2, immn4, tmp4))
+        tb.add(tb._builder.gen_and(oprnd0, imm0, tmp0))
+        tb.add(tb._builder.gen_and(oprnd1, imm0, tmp1))
 
-        tb.add(tb._builder.gen_bsh(tmp1, imm4, tmp3))
-        tb.add(tb._builder.gen_bsh(tmp3, immn4, tmp5))
+        if subtraction:
+            tb.add(tb._builder.gen_sub(tmp0, tmp1, tmp2))
+        else:
+            tb.add(tb._builder.gen_add(tmp0, tmp1, tmp2))
 
         if cf:
-            tb.add(tb._builder.gen_str(cf, tmp7))
-        else:
-            tb.add(tb._builder.gen_str(zero, tmp7))
+            tmp3 = tb.temporal(8)
+            tmp4 = tb.temporal(8)
 
-        if subtraction:
-            tb.add(tb._builder.gen_sub(tmp4, tmp5, tmp6))
-            tb.add(tb._builder.gen_sub(tmp6, tmp7, tmp8))
-        else:
-            tb.add(tb._builder.gen_add(tmp4, tmp5, tmp6))
-            tb.add(tb._builder.gen_add(tmp6, tmp7, tmp8))
+            tb.add(tb._builder.gen_str(cf, tmp3))
+
+            if subtraction:
+                tb.add(tb._builder.gen_sub(tmp2, tmp3, tmp4))
+            else:
+                tb.add(tb._builder.gen_add(tmp2, tmp3, tmp4))
+
+            tmp2 = tmp4
 
         # Move bit 4 to AF flag.
-        tb.add(tb._builder.gen_bsh(tmp8, immn4, self._flags.af))
+        tb.add(tb._builder.gen_bsh(tmp2, immn4, self._flags.af))
 
     def update_pf(self, tb, result):
         tmp0 = tb.temporal(result.size)
@@ -138,36 +127,39 @@ class X86FlagTranslator(object):
     def update_of(self, tb, oprnd0, oprnd1, result, subtraction=False):
         assert oprnd0.size == oprnd1.size
 
-        imm0 = tb.immediate(1, 1)
+        # OF is set when the sign of the result differs from the sign of
+        # oprnd0 and the operands have the same sign (different signs, for
+        # subtractions). Compute it on whole operands and extract the sign
+        # bit once.
+        size = oprnd0.size
 
-        tmp0 = tb.temporal(1)
-        tmp1 = tb.temporal(1)
-        tmp2 = tb.temporal(1)
-        tmp3 = tb.temporal(1)
+        tmp0 = tb.temporal(size)
+        tmp1 = tb.temporal(size)
+        tmp2 = tb.temporal(size)
 
-        # Extract sign bit.
-        oprnd0_sign = extract_sign_bit(tb, oprnd0)
-        if subtraction:
-            oprnd1_sign = tb.temporal(1)
-            oprnd1_sign_tmp = extract_sign_bit(tb, oprnd1)
-            # Invert sign bit of oprnd2.
-            tb.add(tb._builder.gen_xor(oprnd1_sign_tmp, imm0, oprnd1_sign))
+        shift0 = tb.immediate(-(size - 1), size)
+
+        if result.size != size:
+            result_low = tb.temporal(size)
+
+            tb.add(tb._builder.gen_str(result, result_low))
         else:
-            oprnd1_sign = extract_sign_bit(tb, oprnd1)
-        result_sign = extract_bit(tb, result, oprnd0.size - 1)
-
-        # Compute OF.
-        # (sign bit oprnd0 ^ sign bit oprnd1)
-        tb.add(tb._builder.gen_xor(oprnd0_sign, oprnd1_sign, tmp0))
-        # (sign bit oprnd0 ^ sign bit oprnd1 ^ 1)
-        tb.add(tb._builder.gen_xor(tmp0, imm0, tmp1))
-        # (sign bit oprnd0 ^ sign bit result)
-        tb.add(tb._builder.gen_xor(oprnd0_sign, result_sign, tmp2))
-        # (sign bit oprnd0 ^ sign bit oprnd1 ^ 1) & (sign bit oprnd0 ^ sign bit result)
-        tb.add(tb._builder.gen_and(tmp1, tmp2, tmp3))
+            result_low = result
+
+        tb.add(tb._builder.gen_xor(oprnd0, oprnd1, tmp0))
+
+        if not subtraction:
+            tmp3 = tb.temporal(size)
+
+            tb.add(tb._builder.gen_xor(tmp0, tb.immediate(2**size - 1, size), tmp3))
+
+            tmp0 = tmp3
+
+        tb.add(tb._builder.gen_xor(oprnd0, result_low, tmp1))
+        tb.add(tb._builder.gen_and(tmp0, tmp1, tmp2))
 
         # Save result.
-        tb.add(tb._builder.gen_str(tmp3, self._flags.of))
+        tb.add(tb._builder.gen_bsh(tmp2, shift0, self._flags.of))
 
     def update_cf(self, tb, oprnd0, result):
         imm0 = tb.immediate(2**oprnd0.size, result.size)
@@ -373,19 +365,26 @@ class X86Translator(InstructionTranslator):
         self._ws = ReilImmediateOperand(self._arch_info.address_size // 8,
                                         self._arch_info.address_size)
 
+        # Branch target address operands, indexed by (address, size).
+        self._address_cache = {}
+
     def _translate(self, instruction):
         mnemonic = instruction.mnemonic
 
         # Check whether it refers to the strings instruction or the sse
-        # instruction.
-        if instruction.mnemonic in ["movsd"]:
-            if instruction.bytes[0] not in ["\xa4", "\xa5"]:
+        # instruction. Only the latter has a register (xmm) operand, the
+        # string one takes memory operands or none at all (whatever the
+        # prefixes are).
+        if mnemonic == "movsd":
+            if any(isinstance(oprnd, X86RegisterOperand) for oprnd in instruction.operands):
                 mnemonic += "_sse"
 
         tb = TranslationBuilder(self._ir_name_generator, self._arch_info)
 
-        if mnemonic in dispatcher:
-            dispatcher[mnemonic](self, tb, instruction)
+        translate_fn = dispatcher.get(mnemonic)
+
+        if translate_fn:
+            translate_fn(self, tb, instruction)
         else:
             tb.add(self._builder.gen_unkn())
 
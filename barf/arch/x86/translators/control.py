@@ -56,14 +56,14 @@ def _translate_call(self, tb, instruction):
     tb.add(self._builder.gen_jcc(imm1, addr_oprnd))
 
 
-def _translate_jcc(self, tb, instruction, condition_code):
-    # Jump if condition (condition_code) is met.
+def _translate_jcc(self, tb, instruction, eval_cc_fn):
+    # Jump if condition (eval_cc_fn) is met.
     # Flags Affected
     # None.
 
     oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
 
-    oprnd_cc = X86ConditionCodeHelper.evaluate_cc(self._flags, tb, condition_code)
+    oprnd_cc = eval_cc_fn(self._flags, tb)
 
     addr_oprnd = _translate_address(self, tb, oprnd0)
 
@@ -71,27 +71,27 @@ def _translate_jcc(self, tb, instruction, condition_code):
 
 
 def _translate_ja(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'a')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_a)
 
 
 def _translate_jae(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'ae')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_ae)
 
 
 def _translate_jb(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'b')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_b)
 
 
 def _translate_jbe(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'be')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_be)
 
 
 def _translate_jc(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'c')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_c)
 
 
 def _translate_je(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'e')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_e)
 
 
 def _translate_jecxz(self, tb, instruction):
@@ -112,19 +112,19 @@ def _translate_jecxz(self, tb, instruction):
 
 
 def _translate_jg(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'g')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_g)
 
 
 def _translate_jge(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'ge')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_ge)
 
 
 def _translate_jl(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'l')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_l)
 
 
 def _translate_jle(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'le')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_le)
 
 
 def _translate_jmp(self, tb, instruction):
@@ -142,119 +142,121 @@ def _translate_jmp(self, tb, instruction):
 
 
 def _translate_jna(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'na')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_na)
 
 
 def _translate_jnae(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nae')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nae)
 
 
 def _translate_jnb(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nb')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nb)
 
 
 def _translate_jnbe(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nbe')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nbe)
 
 
 def _translate_jnc(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nc')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nc)
 
 
 def _translate_jne(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'ne')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_ne)
 
 
 def _translate_jng(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'ng')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_ng)
 
 
 def _translate_jnge(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nge')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nge)
 
 
 def _translate_jnl(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nl')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nl)
 
 
 def _translate_jnle(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nle')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nle)
 
 
 def _translate_jno(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'no')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_no)
 
 
 def _translate_jnp(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'np')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_np)
 
 
 def _translate_jns(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'ns')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_ns)
 
 
 def _translate_jnz(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'nz')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_nz)
 
 
 def _translate_jo(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'o')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_o)
 
 
 def _translate_jp(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'p')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_p)
 
 
 def _translate_jpe(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'pe')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_pe)
 
 
 def _translate_jpo(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'po')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_po)
 
 
 def _translate_js(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 's')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_s)
 
 
 def _translate_jz(self, tb, instruction):
-    _translate_jcc(self, tb, instruction, 'z')
+    _translate_jcc(self, tb, instruction, X86ConditionCodeHelper.evaluate_z)
 
 
 def _translate_loop(self, tb, instruction):
     # Flags Affected
     # None.
 
-    oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
+    arch_mode = self._arch_mode
+    builder = self._builder
 
-    counter_x86 = __get_loopcc_implicit_operand(self._arch_mode)
+    oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
 
-    counter = self._reg_acc_translator.read(tb, counter_x86)
+    counter = self._reg_acc_translator.read(tb, _loop_counter[arch_mode])
 
     addr_oprnd = _translate_address(self, tb, oprnd0)
 
     tmp0 = tb.temporal(counter.size)
 
-    imm0 = tb.immediate(1, counter.size)
+    imm0 = _loop_counter_one[arch_mode]
 
-    tb.add(self._builder.gen_str(counter, tmp0))
-    tb.add(self._builder.gen_sub(tmp0, imm0, counter))
-    tb.add(self._builder.gen_jcc(counter, addr_oprnd))  # keep looping
+    tb.add(builder.gen_str(counter, tmp0))
+    tb.add(builder.gen_sub(tmp0, imm0, counter))
+    tb.add(builder.gen_jcc(counter, addr_oprnd))  # keep looping
 
 
 def _translate_loopcc(self, tb, instruction, condition_code):
     # Flags Affected
     # None.
 
-    oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
+    arch_mode = self._arch_mode
+    builder = self._builder
 
-    counter_x86 = __get_loopcc_implicit_operand(self._arch_mode)
+    oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
 
-    counter = self._reg_acc_translator.read(tb, counter_x86)
+    counter = self._reg_acc_translator.read(tb, _loop_counter[arch_mode])
 
     addr_oprnd = _translate_address(self, tb, oprnd0)
 
-    end_addr = ReilImmediateOperand((instruction.address + instruction.size) << 8, self._arch_info.address_size + 8)
+    end_addr = _get_address_operand(self, instruction.address + instruction.size, self._arch_info.address_size + 8)
 
     tmp0 = tb.temporal(counter.size)
 
@@ -262,22 +264,22 @@ def _translate_loopcc(self, tb, instruction, condition_code):
     counter_not_zero = tb.temporal(1)
     branch_cond = tb.temporal(1)
 
-    imm0 = tb.immediate(1, counter.size)
-    imm1 = tb.immediate(1, 1)
+    imm0 = _loop_counter_one[arch_mode]
+    imm1 = _loop_true
 
     keep_looping_lbl = tb.label('keep_looping')
 
     neg_cond = negate_reg(tb, X86ConditionCodeHelper.evaluate_cc(self._flags, tb, condition_code))
 
-    tb.add(self._builder.gen_str(counter, tmp0))
-    tb.add(self._builder.gen_sub(tmp0, imm0, counter))
-    tb.add(self._builder.gen_bisz(counter, counter_zero))
-    tb.add(self._builder.gen_xor(counter_zero, imm1, counter_not_zero))
-    tb.add(self._builder.gen_and(counter_not_zero, neg_cond, branch_cond))
-    tb.add(self._builder.gen_jcc(branch_cond, keep_looping_lbl))
-    tb.add(self._builder.gen_jcc(imm0, end_addr))  # exit loop
+    tb.add(builder.gen_str(counter, tmp0))
+    tb.add(builder.gen_sub(tmp0, imm0, counter))
+    tb.add(builder.gen_bisz(counter, counter_zero))
+    tb.add(builder.gen_xor(counter_zero, imm1, counter_not_zero))
+    tb.add(builder.gen_and(counter_not_zero, neg_cond, branch_cond))
+    tb.add(builder.gen_jcc(branch_cond, keep_looping_lbl))
+    tb.add(builder.gen_jcc(imm0, end_addr))  # exit loop
     tb.add(keep_looping_lbl)
-    tb.add(self._builder.gen_jcc(imm0, addr_oprnd))
+    tb.add(builder.gen_jcc(imm0, addr_oprnd))
 
 
 def _translate_loope(self, tb, instruction):
@@ -288,42 +290,44 @@ def _translate_loopne(self, tb, instruction):
     return _translate_loopcc(self, tb, instruction, 'ne')
 
 
-def _translate_loopnz(self, tb, instruction):
-    return _translate_loopcc(self, tb, instruction, 'nz')
+# LOOPNZ and LOOPZ are aliases of LOOPNE and LOOPE, respectively.
+_translate_loopnz = _translate_loopne
 
-
-def _translate_loopz(self, tb, instruction):
-    return _translate_loopcc(self, tb, instruction, 'z')
+_translate_loopz = _translate_loope
 
 
 def _translate_ret(self, tb, instruction):
     # Flags Affected
     # None.
 
+    builder = self._builder
+    sp = self._sp
+    sp_size = sp.size
+
     imm1 = tb.immediate(1, 1)
-    imm8 = tb.immediate(8, self._sp.size)
+    imm8 = tb.immediate(8, sp_size)
 
-    tmp0 = tb.temporal(self._sp.size)
-    tmp1 = tb.temporal(self._sp.size)
-    tmp2 = tb.temporal(self._sp.size + 8)
+    tmp0 = tb.temporal(sp_size)
+    tmp1 = tb.temporal(sp_size)
+    tmp2 = tb.temporal(sp_size + 8)
 
-    tb.add(self._builder.gen_ldm(self._sp, tmp1))
-    tb.add(self._builder.gen_add(self._sp, self._ws, tmp0))
-    tb.add(self._builder.gen_str(tmp0, self._sp))
+    tb.add(builder.gen_ldm(sp, tmp1))
+    tb.add(builder.gen_add(sp, self._ws, tmp0))
+    tb.add(builder.gen_str(tmp0, sp))
 
     # Free stack.
     if len(instruction.operands) > 0:
         oprnd0 = self._reg_acc_translator.read(tb, instruction.operands[0])
 
-        imm0 = tb.immediate(oprnd0.immediate & (2 ** self._sp.size - 1), self._sp.size)
+        imm0 = tb.immediate(oprnd0.immediate & (2 ** sp_size - 1), sp_size)
 
-        tmp3 = tb.temporal(self._sp.size)
+        tmp3 = tb.temporal(sp_size)
 
-        tb.add(self._builder.gen_add(self._sp, imm0, tmp3))
-        tb.add(self._builder.gen_str(tmp3, self._sp))
+        tb.add(builder.gen_add(sp, imm0, tmp3))
+        tb.add(builder.gen_str(tmp3, sp))
 
-    tb.add(self._builder.gen_bsh(tmp1, imm8, tmp2))
-    tb.add(self._builder.gen_jcc(imm1, tmp2))
+    tb.add(builder.gen_bsh(tmp1, imm8, tmp2))
+    tb.add(builder.gen_jcc(imm1, tmp2))
 
 
 # Auxiliary functions
@@ -331,15 +335,37 @@ def _translate_ret(self, tb, instruction):
 def _translate_address(self, tb, oprnd):
     addr_oprnd_size = oprnd.size + 8
 
-    if isinstance(oprnd, ReilRegisterOperand):
+    # NOTE: Operands are checked by exact type (REIL operand classes are not
+    # subclassed) and immediates go first, since direct branches are the
+    # most common case.
+    oprnd_type = type(oprnd)
+
+    if oprnd_type is ReilImmediateOperand:
+        addr_oprnd = _get_address_operand(self, oprnd.immediate, addr_oprnd_size)
+    elif oprnd_type is ReilRegisterOperand:
         oprnd_tmp = tb.temporal(addr_oprnd_size)
         addr_oprnd = tb.temporal(addr_oprnd_size)
         imm = ReilImmediateOperand(8, addr_oprnd_size)
 
         tb.add(self._builder.gen_str(oprnd, oprnd_tmp))
         tb.add(self._builder.gen_bsh(oprnd_tmp, imm, addr_oprnd))
-    elif isinstance(oprnd, ReilImmediateOperand):
-        addr_oprnd = ReilImmediateOperand(oprnd.immediate << 8, addr_oprnd_size)
+
+    return addr_oprnd
+
+
+def _get_address_operand(self, address, size):
+    # Branch targets repeat a lot (loops, calls to the same function,
+    # fall-through addresses), so reuse the address operand. REIL operands
+    # are never modified once built, hence it is safe to share them
+    # between instructions.
+    key = (address, size)
+
+    addr_oprnd = self._address_cache.get(key)
+
+    if not addr_oprnd:
+        addr_oprnd = ReilImmediateOperand(address << 8, size)
+
+        self._address_cache[key] = addr_oprnd
 
     return addr_oprnd
 
@@ -350,13 +376,19 @@ def __get_jecxz_implicit_operand():
     return oprnd
 
 
-def __get_loopcc_implicit_operand(arch_mode):
-    if arch_mode == ARCH_X86_MODE_32:
-        oprnd = X86RegisterOperand('ecx', 32)
-    elif arch_mode == ARCH_X86_MODE_64:
-        oprnd = X86RegisterOperand('rcx', 64)
+# Loop instructions implicit operand and constants, indexed by architecture
+# mode. These are shared between translations and must not be modified.
+_loop_counter = {
+    ARCH_X86_MODE_32: X86RegisterOperand('ecx', 32),
+    ARCH_X86_MODE_64: X86RegisterOperand('rcx', 64),
+}
 
-    return oprnd
+_loop_counter_one = {
+    ARCH_X86_MODE_32: ReilImmediateOperand(1, 32),
+    ARCH_X86_MODE_64: ReilImmediateOperand(1, 64),
+}
+
+_loop_true = ReilImmediateOperand(1, 1)
 
 
 dispatcher = {
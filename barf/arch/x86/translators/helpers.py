@@ -35,8 +35,7 @@ class X86ConditionCodeHelper(object):
 
     @staticmethod
     def evaluate_cc(flags, tb, condition_code):
-        eval_cond_fn_name = 'evaluate_' + condition_code
-        eval_cond_fn = getattr(X86ConditionCodeHelper, eval_cond_fn_name, None)
+        eval_cond_fn = _cc_evaluators.get(condition_code)
 
         if not eval_cond_fn:
             raise NotImplementedError('Invalid condition code')
@@ -198,3 +197,12 @@ class X86ConditionCodeHelper(object):
     def evaluate_z(flags, tb):
         # zero (ZF=1)
         return flags.zf
+
+
+# Condition code evaluators indexed by condition code (resolved once, so
+# evaluating a condition does not require a per-call attribute lookup).
+_cc_evaluators = dict(
+    (name[len('evaluate_'):], getattr(X86ConditionCodeHelper, name))
+    for name in dir(X86ConditionCodeHelper)
+    if name.startswith('evaluate_') and name != 'evaluate_cc'
+)
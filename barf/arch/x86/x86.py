@@ -37,6 +37,10 @@ from barf.arch import ArchitectureInformation
 from barf.arch import AssemblyInstruction
 
 
+# Python integer types (int and long are the same type in Python 3).
+_int_types = frozenset([int, long])
+
+
 class X86ArchitectureInformation(ArchitectureInformation):
     """This class describe the Intel x86 architecture."""
 
@@ -606,6 +610,18 @@ class X86Instruction(AssemblyInstruction):
         self._address = state['_address']
         self._arch_mode = state['_arch_mode']
 
+    def __copy__(self):
+        # Operands are shared but the list that holds them is not, so it
+        # can be modified without affecting the original instruction.
+        instr = X86Instruction(self._prefix, self._mnemonic,
+                               list(self._operands), self._arch_mode)
+
+        instr._bytes = self._bytes
+        instr._size = self._size
+        instr._address = self._address
+
+        return instr
+
 
 class X86Operand(object):
     """Representation of x86 operand."""
@@ -665,7 +681,7 @@ class X86ImmediateOperand(X86Operand):
     def __init__(self, immediate, size=None):
         super(X86ImmediateOperand, self).__init__("")
 
-        assert type(immediate) in [int, long], "Invalid immediate value type."
+        assert type(immediate) in _int_types, "Invalid immediate value type."
 
         self._immediate = immediate
         self._size = size
@@ -50,6 +50,7 @@ from .core.binary import BinaryFile
 from .core.reil.emulator import ReilEmulator
 from .core.smt.smtsolver import CVC4Solver
 from .core.smt.smtsolver import SmtSolverNotFound
+from .core.smt.smtsolver import Z3NativeSolver
 from .core.smt.smtsolver import Z3Solver
 from .core.smt.smttranslator import SmtTranslator
 
@@ -57,6 +58,7 @@ logger = logging.getLogger(__name__)
 
 # Choose between SMT Solvers...
 SMT_SOLVER = "Z3"
+# SMT_SOLVER = "Z3_NATIVE"
 # SMT_SOLVER = "CVC4"
 # SMT_SOLVER = None
 
@@ -151,12 +153,14 @@ class BARF(object):
             # Set SMT Solver.
             self.smt_solver = None
 
-            if SMT_SOLVER not in ("Z3", "CVC4"):
+            if SMT_SOLVER not in ("Z3", "Z3_NATIVE", "CVC4"):
                 raise Exception("{} SMT solver not supported.".format(SMT_SOLVER))
 
             try:
                 if SMT_SOLVER == "Z3":
                     self.smt_solver = Z3Solver()
+                elif SMT_SOLVER == "Z3_NATIVE":
+                    self.smt_solver = Z3NativeSolver()
                 elif SMT_SOLVER == "CVC4":
                     self.smt_solver = CVC4Solver()
             except SmtSolverNotFound:
@@ -102,7 +102,7 @@ class Memory(object):
                 raise InvalidAddressError()
 
             return chunk
-        elif isinstance(key, int) or isinstance(key, long):
+        elif isinstance(key, (int, long)):
             return self._read_byte(key)
         else:
             raise TypeError("Invalid argument type: {}".format(type(key)))
@@ -29,6 +29,11 @@ from barf.core.reil import ReilInstruction
 from barf.core.reil import ReilMnemonic
 
 
+# Operands are never modified once an instruction is built, so every
+# instruction shares the same empty operand.
+_empty_oprnd = ReilEmptyOperand()
+
+
 class ReilBuilder(object):
 
     """REIL Instruction Builder. Generate REIL instructions, easily.
@@ -116,19 +121,19 @@ class ReilBuilder(object):
     def gen_ldm(src, dst):
         """Return a LDM instruction.
         """
-        return ReilBuilder.build(ReilMnemonic.LDM, src, ReilEmptyOperand(), dst)
+        return ReilBuilder.build(ReilMnemonic.LDM, src, _empty_oprnd, dst)
 
     @staticmethod
     def gen_stm(src, dst):
         """Return a STM instruction.
         """
-        return ReilBuilder.build(ReilMnemonic.STM, src, ReilEmptyOperand(), dst)
+        return ReilBuilder.build(ReilMnemonic.STM, src, _empty_oprnd, dst)
 
     @staticmethod
     def gen_str(src, dst):
         """Return a STR instruction.
         """
-        return ReilBuilder.build(ReilMnemonic.STR, src, ReilEmptyOperand(), dst)
+        return ReilBuilder.build(ReilMnemonic.STR, src, _empty_oprnd, dst)
 
     # Conditional Instructions
     # ======================================================================== #
@@ -136,13 +141,13 @@ class ReilBuilder(object):
     def gen_bisz(src, dst):
         """Return a BISZ instruction.
         """
-        return ReilBuilder.build(ReilMnemonic.BISZ, src, ReilEmptyOperand(), dst)
+        return ReilBuilder.build(ReilMnemonic.BISZ, src, _empty_oprnd, dst)
 
     @staticmethod
     def gen_jcc(src, dst):
         """Return a JCC instruction.
         """
-        return ReilBuilder.build(ReilMnemonic.JCC, src, ReilEmptyOperand(), dst)
+        return ReilBuilder.build(ReilMnemonic.JCC, src, _empty_oprnd, dst)
 
     # Other Instructions
     # ======================================================================== #
@@ -150,25 +155,19 @@ class ReilBuilder(object):
     def gen_unkn():
         """Return an UNKN instruction.
         """
-        empty_reg = ReilEmptyOperand()
-
-        return ReilBuilder.build(ReilMnemonic.UNKN, empty_reg, empty_reg, empty_reg)
+        return ReilBuilder.build(ReilMnemonic.UNKN, _empty_oprnd, _empty_oprnd, _empty_oprnd)
 
     @staticmethod
     def gen_undef():
         """Return an UNDEF instruction.
         """
-        empty_reg = ReilEmptyOperand()
-
-        return ReilBuilder.build(ReilMnemonic.UNDEF, empty_reg, empty_reg, empty_reg)
+        return ReilBuilder.build(ReilMnemonic.UNDEF, _empty_oprnd, _empty_oprnd, _empty_oprnd)
 
     @staticmethod
     def gen_nop():
         """Return a NOP instruction.
         """
-        empty_reg = ReilEmptyOperand()
-
-        return ReilBuilder.build(ReilMnemonic.NOP, empty_reg, empty_reg, empty_reg)
+        return ReilBuilder.build(ReilMnemonic.NOP, _empty_oprnd, _empty_oprnd, _empty_oprnd)
 
     # Extensions
     # ======================================================================== #
@@ -178,9 +177,7 @@ class ReilBuilder(object):
         """
         assert src.size <= dst.size
 
-        empty_reg = ReilEmptyOperand()
-
-        return ReilBuilder.build(ReilMnemonic.SEXT, src, empty_reg, dst)
+        return ReilBuilder.build(ReilMnemonic.SEXT, src, _empty_oprnd, dst)
 
     @staticmethod
     def gen_sdiv(src1, src2, dst):
@@ -38,6 +38,12 @@ class ReilSequence(object):
     """Reil instruction sequence.
     """
 
+    __slots__ = [
+        '__assembly',
+        '__sequence',
+        '__next_seq_address',
+    ]
+
     def __init__(self, assembly=None):
         self.__assembly = assembly
         self.__sequence = []
@@ -50,6 +56,9 @@ class ReilSequence(object):
     def append(self, instruction):
         self.__sequence.append(instruction)
 
+    def extend(self, instructions):
+        self.__sequence.extend(instructions)
+
     def fetch(self, address):
         base_addr, index = split_address(address)
 
@@ -111,6 +120,10 @@ class ReilContainer(object):
     """Reil instruction container.
     """
 
+    __slots__ = [
+        '__container',
+    ]
+
     def __init__(self):
         self.__container = {}
 
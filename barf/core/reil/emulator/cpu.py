@@ -25,14 +25,15 @@
 from __future__ import absolute_import
 from __future__ import print_function
 
+import operator
 import random
 
+from functools import partial
+
 from barf.core.reil import ReilImmediateOperand
 from barf.core.reil import ReilMnemonic
 from barf.core.reil import ReilRegisterOperand
 from barf.utils.utils import extract_sign_bit
-from barf.utils.utils import extract_value
-from barf.utils.utils import insert_value
 from barf.utils.utils import twos_complement
 
 
@@ -65,20 +66,24 @@ class ReilCpu(object):
         self.__regs_written = set()
         self.__regs_read = set()
 
+        # Register information (base register, base size, offset and
+        # whether it is a native register) indexed by name and size.
+        self.__regs_info = {}
+
         # Instruction implementation.
         self.__executors = {
             # Arithmetic Instructions
-            ReilMnemonic.ADD: self.__execute_binary_op,
-            ReilMnemonic.SUB: self.__execute_binary_op,
-            ReilMnemonic.MUL: self.__execute_binary_op,
-            ReilMnemonic.DIV: self.__execute_binary_op,
-            ReilMnemonic.MOD: self.__execute_binary_op,
+            ReilMnemonic.ADD: partial(self.__execute_plain_binary_op, operator.add),
+            ReilMnemonic.SUB: partial(self.__execute_plain_binary_op, operator.sub),
+            ReilMnemonic.MUL: partial(self.__execute_plain_binary_op, operator.mul),
+            ReilMnemonic.DIV: partial(self.__execute_unsigned_div_op, operator.floordiv),
+            ReilMnemonic.MOD: partial(self.__execute_unsigned_div_op, operator.mod),
             ReilMnemonic.BSH: self.__execute_bsh,
 
             # Bitwise Instructions
-            ReilMnemonic.AND: self.__execute_binary_op,
-            ReilMnemonic.OR:  self.__execute_binary_op,
-            ReilMnemonic.XOR: self.__execute_binary_op,
+            ReilMnemonic.AND: partial(self.__execute_plain_binary_op, operator.and_),
+            ReilMnemonic.OR:  partial(self.__execute_plain_binary_op, operator.or_),
+            ReilMnemonic.XOR: partial(self.__execute_plain_binary_op, operator.xor),
 
             # Data Transfer Instructions
             ReilMnemonic.LDM: self.__execute_ldm,
@@ -96,18 +101,25 @@ class ReilCpu(object):
 
             # Extensions
             ReilMnemonic.SEXT: self.__execute_sext,
-            ReilMnemonic.SDIV: self.__execute_binary_op,
-            ReilMnemonic.SMOD: self.__execute_binary_op,
-            ReilMnemonic.SMUL: self.__execute_binary_op,
+            ReilMnemonic.SDIV: self.__execute_signed_binary_op,
+            ReilMnemonic.SMOD: self.__execute_signed_binary_op,
+            ReilMnemonic.SMUL: self.__execute_signed_binary_op,
         }
 
+        # Same executors, indexed by mnemonic (mnemonics are small
+        # consecutive integers).
+        self.__executors_table = [None] * (max(self.__executors) + 1)
+
+        for mnemonic, executor in self.__executors.items():
+            self.__executors_table[mnemonic] = executor
+
     def execute(self, instr):
         if DEBUG:
             print("0x%08x:%02x : %s" % (instr.address >> 8,
                                         instr.address & 0xff,
                                         instr))
 
-        next_addr = self.__executors[instr.mnemonic](instr)
+        next_addr = self.__executors_table[instr.mnemonic](instr)
 
         return next_addr
 
@@ -145,9 +157,9 @@ class ReilCpu(object):
     # Read/Write methods
     # ======================================================================== #
     def read_operand(self, operand):
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             value = self.__read_register(operand)
-        elif isinstance(operand, ReilImmediateOperand):
+        elif type(operand) is ReilImmediateOperand:
             value = operand.immediate
         else:
             raise Exception("Invalid operand type : %s" % str(operand))
@@ -155,7 +167,7 @@ class ReilCpu(object):
         return value
 
     def write_operand(self, operand, value):
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             self.__write_register(operand, value)
         else:
             raise Exception("Invalid operand type : %s" % str(operand))
@@ -177,31 +189,52 @@ class ReilCpu(object):
     # Read/Write auxiliary methods
     # ======================================================================== #
     def __get_register_info(self, register):
-        if self.__arch and register.name in self.__arch.alias_mapper:
-            base_register, offset = self.__arch.alias_mapper[register.name]
-            base_size = self.__arch.registers_size[base_register]
-        else:
-            base_register, offset = register.name, 0
-            base_size = register.size
+        key = register.name, register.size
 
-        return base_register, base_size, offset
+        info = self.__regs_info.get(key)
 
-    def __get_register_value(self, register):
-        base_register, base_size, offset = self.__get_register_info(register)
+        if info is None:
+            name, size = key
 
-        if base_register not in self.__regs:
-            self.__regs[base_register] = random.randint(0, 2**base_size - 1)
+            alias = self.__arch.alias_mapper.get(name) if self.__arch else None
 
-        base_value = self.__regs[base_register]
+            if alias:
+                base_register, offset = alias
+                base_size = self.__arch.registers_size[base_register]
+            else:
+                base_register, offset = name, 0
+                base_size = size
+
+            mask = (1 << size) - 1
+
+            # Whether the register spans the whole base register.
+            full = offset == 0 and size == base_size
+
+            native = self.__arch is not None and name in self.__arch.registers_gp_all
 
-        return base_register, base_value, offset
+            info = self.__regs_info[key] = base_register, base_size, offset, mask, full, native
+
+        return info
+
+    def __get_register_value(self, base_register, base_size):
+        base_value = self.__regs.get(base_register)
+
+        if base_value is None:
+            base_value = self.__regs[base_register] = random.randint(0, 2**base_size - 1)
+
+        return base_value
 
     def __read_register(self, register):
-        base_register, base_value, offset = self.__get_register_value(register)
-        value = extract_value(base_value, offset, register.size)
+        base_register, base_size, offset, mask, _, native = self.__get_register_info(register)
+        base_value = self.__regs.get(base_register)
+
+        if base_value is None:
+            base_value = self.__get_register_value(base_register, base_size)
+
+        value = (base_value >> offset) & mask
 
         # Keep track of native register reads.
-        if self.__arch and register.name in self.__arch.registers_gp_all:
+        if native:
             self.__regs_read.add(register.name)
 
         if DEBUG:
@@ -210,13 +243,18 @@ class ReilCpu(object):
         return value
 
     def __write_register(self, register, value):
-        base_register, base_value, offset = self.__get_register_value(register)
-        base_value_new = insert_value(base_value, value, offset, register.size)
+        base_register, base_size, offset, mask, full, native = self.__get_register_info(register)
+
+        if full:
+            base_value_new = value & mask
+        else:
+            base_value = self.__get_register_value(base_register, base_size)
+            base_value_new = (base_value & ~(mask << offset)) | ((value & mask) << offset)
 
         self.__regs[base_register] = base_value_new
 
         # Keep track of native register writes.
-        if self.__arch and register.name in self.__arch.registers_gp_all:
+        if native:
             self.__regs_written.add(register.name)
 
         if DEBUG:
@@ -307,10 +345,15 @@ class ReilCpu(object):
         op1_size = instr.operands[1].size
 
         # Check sign bit.
-        if extract_sign_bit(op1_val, op1_size) == 0:
-            op2_val = op0_val << op1_val
+        if op1_val >> (op1_size - 1) == 0:
+            # Shifting out every bit of the result gives zero, skip
+            # building a huge intermediate value.
+            if op1_val < instr.operands[2].size:
+                op2_val = op0_val << op1_val
+            else:
+                op2_val = 0
         else:
-            op2_val = op0_val >> twos_complement(op1_val, op1_size)
+            op2_val = op0_val >> ((1 << op1_size) - op1_val)
 
         self.write_operand(instr.operands[2], op2_val)
 
@@ -343,7 +386,7 @@ class ReilCpu(object):
         else:
             result = result_tmp
 
-        return result & (2**result_size-1)
+        return result & ((1 << result_size) - 1)
 
     def __signed_mod(self, oprnd0, oprnd1, result_size):
         op0_val = self.read_operand(oprnd0)
@@ -352,7 +395,7 @@ class ReilCpu(object):
 
         remainder = op0_val - (op1_val * quotient)
 
-        return remainder & (2**result_size-1)
+        return remainder & ((1 << result_size) - 1)
 
     def __signed_mul(self, oprnd0, oprnd1, result_size):
         op0_val = self.read_operand(oprnd0)
@@ -379,35 +422,48 @@ class ReilCpu(object):
         else:
             result = result_tmp
 
-        return result & (2**result_size-1)
+        return result & ((1 << result_size) - 1)
+
+    def __execute_plain_binary_op(self, operation, instr):
+        """Execute an ADD, SUB, MUL, AND, OR or XOR instruction (the
+        operation needs no checks).
+        """
+        oprnd0, oprnd1, oprnd2 = instr.operands
 
-    def __execute_binary_op(self, instr):
-        op_map = {
-            ReilMnemonic.ADD: lambda a, b: a + b,
-            ReilMnemonic.SUB: lambda a, b: a - b,
-            ReilMnemonic.MUL: lambda a, b: a * b,   # unsigned multiplication
-            ReilMnemonic.DIV: lambda a, b: a // b,  # unsigned division
-            ReilMnemonic.MOD: lambda a, b: a % b,   # unsigned modulo
+        op2_val = operation(self.read_operand(oprnd0), self.read_operand(oprnd1))
 
-            ReilMnemonic.AND: lambda a, b: a & b,
-            ReilMnemonic.OR:  lambda a, b: a | b,
-            ReilMnemonic.XOR: lambda a, b: a ^ b,
-        }
+        self.write_operand(oprnd2, op2_val)
 
-        op0_val = self.read_operand(instr.operands[0])
-        op1_val = self.read_operand(instr.operands[1])
+        return None
+
+    def __execute_unsigned_div_op(self, operation, instr):
+        """Execute a DIV or MOD instruction.
+        """
+        oprnd0, oprnd1, oprnd2 = instr.operands
+
+        op0_val = self.read_operand(oprnd0)
+        op1_val = self.read_operand(oprnd1)
 
-        if instr.mnemonic in [ReilMnemonic.DIV, ReilMnemonic.MOD] and op1_val == 0:
+        if op1_val == 0:
             raise ReilCpuZeroDivisionError()
 
-        if instr.mnemonic in [ReilMnemonic.SDIV]:
+        op2_val = operation(op0_val, op1_val)
+
+        self.write_operand(oprnd2, op2_val)
+
+        return None
+
+    def __execute_signed_binary_op(self, instr):
+        """Execute a SDIV, SMOD or SMUL instruction.
+        """
+        mnemonic = instr.mnemonic
+
+        if mnemonic == ReilMnemonic.SDIV:
             op2_val = self.__signed_div(instr.operands[0], instr.operands[1], instr.operands[2].size)
-        elif instr.mnemonic in [ReilMnemonic.SMOD]:
+        elif mnemonic == ReilMnemonic.SMOD:
             op2_val = self.__signed_mod(instr.operands[0], instr.operands[1], instr.operands[2].size)
-        elif instr.mnemonic in [ReilMnemonic.SMUL]:
-            op2_val = self.__signed_mul(instr.operands[0], instr.operands[1], instr.operands[2].size)
         else:
-            op2_val = op_map[instr.mnemonic](op0_val, op1_val)
+            op2_val = self.__signed_mul(instr.operands[0], instr.operands[1], instr.operands[2].size)
 
         self.write_operand(instr.operands[2], op2_val)
 
@@ -507,7 +563,7 @@ class ReilCpu(object):
         op0_val = self.read_operand(instr.operands[0])
         op0_msb = extract_sign_bit(op0_val, op0_size)
 
-        op2_mask = (2**op2_size-1) & ~(2**op0_size-1) if op0_msb == 1 else 0x0
+        op2_mask = ((1 << op2_size) - 1) & ~((1 << op0_size) - 1) if op0_msb == 1 else 0x0
 
         op2_val = op0_val | op2_mask
 
@@ -58,6 +58,10 @@ from barf.core.reil.emulator import ReilMemoryEx
 logger = logging.getLogger("reilemulator")
 
 
+def _empty_handler(emulator, instruction, parameter):
+    pass
+
+
 class ReilEmulator(object):
 
     """Reil Emulator."""
@@ -91,6 +95,8 @@ class ReilEmulator(object):
 
         ip = start if start else container[0].address
 
+        execute_one = self.__execute_one
+
         while ip and ip != end:
             try:
                 instr = container.fetch(ip)
@@ -99,7 +105,7 @@ class ReilEmulator(object):
 
                 raise ReilCpuInvalidAddressError()
 
-            next_ip = self.__execute_one(instr)
+            next_ip = execute_one(instr)
 
             ip = next_ip if next_ip else container.get_next_address(ip)
 
@@ -111,15 +117,24 @@ class ReilEmulator(object):
         if context:
             self.__cpu.registers = dict(context)
 
+        execute_one = self.__execute_one
+
         for instr in instructions:
-            self.__execute_one(instr)
+            execute_one(instr)
 
         return dict(self.__cpu.registers), self.__mem
 
     def single_step(self, instruction):
         return self.__execute_one(instruction)
 
-    def __execute_one(self, instruction):
+    def __execute_one_unhandled(self, instruction):
+        next_addr = self.__cpu.execute(instruction)
+
+        self.__tainter.taint(instruction)
+
+        return next_addr
+
+    def __execute_one_handled(self, instruction):
         # Execute pre instruction handlers
         handler_fn_pre, handler_param_pre = self.__instr_handler_pre
         handler_fn_pre(self, instruction, handler_param_pre)
@@ -165,16 +180,28 @@ class ReilEmulator(object):
     def set_instruction_pre_handler(self, func, parameter):
         self.__instr_handler_pre = (func, parameter)
 
+        self.__update_execute_one()
+
     def set_instruction_post_handler(self, func, parameter):
         self.__instr_handler_post = (func, parameter)
 
+        self.__update_execute_one()
+
     # Instruction's handler auxiliary methods
     # ======================================================================== #
     def __set_default_handlers(self):
-        empty_fn, empty_param = lambda emu, instr, param: None, None
-
-        self.__instr_handler_pre = (empty_fn, empty_param)
-        self.__instr_handler_post = (empty_fn, empty_param)
+        self.__instr_handler_pre = (_empty_handler, None)
+        self.__instr_handler_post = (_empty_handler, None)
+
+        self.__update_execute_one()
+
+    def __update_execute_one(self):
+        # Skip the handlers calls when none is set.
+        if self.__instr_handler_pre[0] is _empty_handler and \
+            self.__instr_handler_post[0] is _empty_handler:
+            self.__execute_one = self.__execute_one_unhandled
+        else:
+            self.__execute_one = self.__execute_one_handled
 
     # Read/Write methods
     # ======================================================================== #
@@ -59,10 +59,19 @@ class ReilMemory(object):
     def read(self, address, size):
         """Read arbitrary size content from memory.
         """
+        memory = self._memory
         value = 0x0
 
-        for i in range(0, size):
-            value |= self._read_byte(address + i) << (i * 8)
+        # Access the memory directly, only uninitialized locations need a
+        # call to _read_byte.
+        try:
+            for i in range(0, size):
+                value |= memory[address + i] << (i * 8)
+        except KeyError:
+            value = 0x0
+
+            for i in range(0, size):
+                value |= self._read_byte(address + i) << (i * 8)
 
         return value
 
@@ -80,13 +89,10 @@ class ReilMemory(object):
     def write(self, address, size, value):
         """Write arbitrary size content to memory.
         """
-        for i in range(0, size):
-            self.__write_byte(address + i, (value >> (i * 8)) & 0xff)
+        memory = self._memory
 
-    def __write_byte(self, address, value):
-        """Write byte in memory.
-        """
-        self._memory[address] = value & 0xff
+        for i in range(0, size):
+            memory[address + i] = (value >> (i * 8)) & 0xff
 
     # Misc methods
     # ======================================================================== #
@@ -153,15 +159,14 @@ class ReilMemoryEx(ReilMemory):
         (False, None). Otherwise, it returns (True, memory content).
 
         """
+        memory = self._memory
         value = 0x0
 
-        for i in range(0, size):
-            addr = address + i
-
-            if addr in self._memory:
-                value |= self._read_byte(addr) << (i * 8)
-            else:
-                return False, None
+        try:
+            for i in range(0, size):
+                value |= memory[address + i] << (i * 8)
+        except KeyError:
+            return False, None
 
         return True, value
 
@@ -203,19 +208,19 @@ class ReilMemoryEx(ReilMemory):
     def write(self, address, size, value):
         """Write arbitrary size content to memory.
         """
+        memory = self._memory
+        memory_prev = self.__memory_prev
+
         for i in range(0, size):
-            self.__write_byte(address + i, (value >> (i * 8)) & 0xff)
+            addr = address + i
 
-        self.__write_count += 1
+            # Save previous address content.
+            if addr in memory:
+                memory_prev[addr] = memory[addr]
 
-    def __write_byte(self, address, value):
-        """Write byte in memory.
-        """
-        # Save previous address content.
-        if address in self._memory:
-            self.__memory_prev[address] = self._memory[address]
+            memory[addr] = (value >> (i * 8)) & 0xff
 
-        self._memory[address] = value & 0xff
+        self.__write_count += 1
 
     # Misc methods
     # ======================================================================== #
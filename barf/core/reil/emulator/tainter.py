@@ -42,6 +42,9 @@ class ReilEmulatorTainter(object):
         self.__taint_reg = set()   # Register-level tainting
         self.__taint_mem = set()   # Byte-level tainting
 
+        # Base register of each register name.
+        self.__base_registers = {}
+
         # Taint function lookup table.
         self.__tainter = {
             # Arithmetic Instructions
@@ -78,8 +81,14 @@ class ReilEmulatorTainter(object):
             ReilMnemonic.SMUL: self.__taint_binary_op,
         }
 
+        # Same functions, indexed by mnemonic.
+        self.__tainter_table = [None] * (max(self.__tainter) + 1)
+
+        for mnemonic, fn in self.__tainter.items():
+            self.__tainter_table[mnemonic] = fn
+
     def taint(self, instruction):
-        self.__tainter[instruction.mnemonic](instruction)
+        self.__tainter_table[instruction.mnemonic](instruction)
 
     def reset(self):
         # Taint information.
@@ -89,9 +98,9 @@ class ReilEmulatorTainter(object):
     # Operand taint methods
     # ======================================================================== #
     def get_operand_taint(self, operand):
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             taint = self.get_register_taint(operand.name)
-        elif isinstance(operand, ReilImmediateOperand):
+        elif type(operand) is ReilImmediateOperand:
             taint = False
         else:
             raise Exception("Invalid operand: %s" % str(operand))
@@ -99,13 +108,13 @@ class ReilEmulatorTainter(object):
         return taint
 
     def set_operand_taint(self, operand, taint):
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             self.set_register_taint(operand.name, taint)
         else:
             raise Exception("Invalid operand: %s" % str(operand))
 
     def clear_operand_taint(self, operand):
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             self.clear_register_taint(operand.name)
         else:
             raise Exception("Invalid operand: %s" % str(operand))
@@ -148,12 +157,17 @@ class ReilEmulatorTainter(object):
     # Taint auxiliary methods
     # ======================================================================== #
     def __get_base_register(self, register):
-        if self.__arch and register in self.__arch.alias_mapper and \
-            register not in self.__arch.registers_flags:
-            # NOTE: Flags are tainted individually.
-            base_name, _ = self.__arch.alias_mapper[register]
-        else:
-            base_name = register
+        base_name = self.__base_registers.get(register)
+
+        if base_name is None:
+            if self.__arch and register in self.__arch.alias_mapper and \
+                register not in self.__arch.registers_flags:
+                # NOTE: Flags are tainted individually.
+                base_name, _ = self.__arch.alias_mapper[register]
+            else:
+                base_name = register
+
+            self.__base_registers[register] = base_name
 
         return base_name
 
@@ -58,6 +58,10 @@ from past.builtins import long
 DISPLAY_SIZE = True     # Display operands size in instruction
 
 
+# Python integer types (int and long are the same type in Python 3).
+_int_types = frozenset([int, long])
+
+
 class ReilMnemonic(object):
 
     """Enumeration of IR mnemonics.
@@ -422,7 +426,7 @@ class ReilImmediateOperand(ReilOperand):
     def __init__(self, immediate, size=None):
         super(ReilImmediateOperand, self).__init__(size)
 
-        assert type(immediate) in [int, long], "Invalid immediate value type."
+        assert type(immediate) in _int_types, "Invalid immediate value type."
 
         self._immediate = immediate
 
@@ -520,6 +524,8 @@ class ReilEmptyOperand(ReilOperand):
     """Representation of an IR instruction's empty operand.
     """
 
+    __slots__ = []
+
     def __init__(self):
         super(ReilEmptyOperand, self).__init__(size=None)
 
@@ -538,6 +544,10 @@ class ReilEmptyOperand(ReilOperand):
 
 class ReilLabel(object):
 
+    __slots__ = [
+        '_name',
+    ]
+
     def __init__(self, name):
         self._name = name
 
@@ -27,6 +27,16 @@ from __future__ import absolute_import
 from barf.core.smt.smtsymbol import BitVec
 from barf.core.smt.smtsymbol import Bool
 from barf.core.smt.smtsymbol import Constant
+from barf.core.smt.smtsymbol import _int_types
+from barf.core.smt.smtsymbol import _make_bitvec
+from barf.core.smt.smtsymbol import _may_have_known_bits
+from barf.core.smt.smtsymbol import known_bits
+from barf.core.smt.smtsymbol import make_constant
+
+# Names of the indexed operations, built once for each set of indices.
+_zero_extend_ops = {}
+_sign_extend_ops = {}
+_extract_ops = {}
 
 
 def zero_extend(s, size):
@@ -35,7 +45,15 @@ def zero_extend(s, size):
     if size == s.size:
         return s
 
-    return BitVec(size, "(_ zero_extend {})".format(size - s.size), s)
+    if type(s) is Constant:
+        return make_constant(size, s._number)
+
+    op = _zero_extend_ops.get(size - s.size)
+
+    if op is None:
+        op = _zero_extend_ops[size - s.size] = "(_ zero_extend {})".format(size - s.size)
+
+    return _make_bitvec(size, op, s)
 
 
 def sign_extend(s, size):
@@ -44,7 +62,20 @@ def sign_extend(s, size):
     if size == s.size:
         return s
 
-    return BitVec(size, "(_ sign_extend {})".format(size - s.size), s)
+    if type(s) is Constant:
+        value = s._number
+
+        if value >> (s.size - 1):
+            value |= ((1 << size) - 1) & ~((1 << s.size) - 1)
+
+        return make_constant(size, value)
+
+    op = _sign_extend_ops.get(size - s.size)
+
+    if op is None:
+        op = _sign_extend_ops[size - s.size] = "(_ sign_extend {})".format(size - s.size)
+
+    return _make_bitvec(size, op, s)
 
 
 def extract(s, offset, size):
@@ -53,17 +84,82 @@ def extract(s, offset, size):
     if offset == 0 and size == s.size:
         return s
 
-    return BitVec(size, "(_ extract {} {})".format(offset + size - 1, offset), s)
+    # Extracting exactly one of the operands of a concat or the operand of a
+    # zero extension.
+    if s._op == "concat":
+        end = s.size
+
+        for child in s._children:
+            end -= child.size
+
+            if end == offset and child.size == size:
+                return child
+    elif offset == 0 and s._op is not None and s._op.startswith("(_ zero_extend ") and \
+            s._children[0].size == size:
+        return s._children[0]
+
+    # All the extracted bits are known.
+    mask = (1 << size) - 1
+    known_zero, known_one = known_bits(s)
+
+    if (known_zero >> offset) & mask | (known_one >> offset) & mask == mask:
+        return make_constant(size, known_one >> offset)
+
+    op = _extract_ops.get((offset, size))
+
+    if op is None:
+        op = _extract_ops[(offset, size)] = "(_ extract {} {})".format(offset + size - 1, offset)
+
+    return _make_bitvec(size, op, s)
 
 
 def ite(size, cond, true, false):
     assert type(cond) is Bool
 
-    return BitVec(size, "ite", cond, true, false)
+    # Integer operands are turned into (shared) constants.
+    if type(true) in _int_types:
+        true = make_constant(size, true)
+
+    if type(false) in _int_types:
+        false = make_constant(size, false)
+
+    if true is false:
+        return true
+
+    # Both branches have the same value.
+    if _may_have_known_bits(true) and _may_have_known_bits(false):
+        true_zeros, true_ones = known_bits(true)
+        false_zeros, false_ones = known_bits(false)
+
+        if true_zeros & false_zeros | true_ones & false_ones == (1 << size) - 1:
+            return make_constant(size, true_ones)
+
+    return _make_bitvec(size, "ite", cond, true, false)
 
 
 def concat(size, *args):
     if len(args) == 1:
         return args[0]
 
-    return BitVec(size * len(args), "concat", *args)
+    # All the operands are constants, or their bits are all known (checked
+    # in a single pass, stopping at the first operand that is not).
+    value = 0
+
+    for arg in args:
+        if type(arg) is Constant:
+            value = (value << arg.size) | arg._number
+            continue
+
+        if not _may_have_known_bits(arg):
+            break
+
+        known_zero, known_one = known_bits(arg)
+
+        if known_zero | known_one != (1 << arg.size) - 1:
+            break
+
+        value = (value << arg.size) | known_one
+    else:
+        return make_constant(size * len(args), value)
+
+    return _make_bitvec(size * len(args), "concat", *args)
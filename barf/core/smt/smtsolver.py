@@ -29,12 +29,72 @@ import re
 import subprocess
 import platform
 
+from collections import OrderedDict
+
+from barf.core.smt.smtsymbol import BitVec
+from barf.core.smt.smtsymbol import BitVecArray
 from barf.core.smt.smtsymbol import Bool
+from barf.core.smt.smtsymbol import known_true
+
+try:
+    import z3
+except ImportError:
+    z3 = None
 
 logger = logging.getLogger(__name__)
 
+_symbol_re = re.compile(r"[^\s()]+")
+
+# Bit vector value closing a get-value response, in any of the forms the
+# solvers print: #x<hex>, #b<binary> or (_ bv<decimal> <size>).
+_value_re = re.compile(r"(?:#x([0-9a-fA-F]+)|#b([01]+)|\(_\s+bv([0-9]+)\s+[0-9]+\))\s*\)\s*\)\s*$")
+
+
+def _parse_value(response):
+    """Return the value of a get-value response as an integer.
+    """
+    # The value is at the end of the response, after the (possibly long)
+    # expression echoed by the solver. Try matching from where it should
+    # start before searching the whole response.
+    start = response.rfind("(_" if response.endswith(")))") else "#")
+
+    match = _value_re.match(response, start) if start >= 0 else None
+
+    if not match:
+        match = _value_re.search(response)
+
+    if not match:
+        raise Exception("Unexpected get-value response: {}".format(response))
+
+    hex_value, bin_value, dec_value = match.groups()
+
+    if hex_value is not None:
+        return int(hex_value, 16)
+
+    if bin_value is not None:
+        return int(bin_value, 2)
+
+    return int(dec_value)
+
+
+# Solvers found installed (the check spawns a process).
+_installed_solvers = set()
+
+# Idle z3 processes, already reset, ready to be reused by new solvers.
+_z3_processes = []
+_z3_processes_size = 4
+
+# z3 processes in use. Keeping them referenced from here ensures they never
+# take part in a garbage collected cycle along with their solver, where the
+# pipes could be finalized (closed) after the process was put back into the
+# idle list.
+_z3_processes_busy = set()
+
 
 def _check_solver_installation(solver):
+    if solver in _installed_solvers:
+        return True
+
     found = True
     try:
         if platform.system() == "Windows":
@@ -44,25 +104,179 @@ def _check_solver_installation(solver):
     except subprocess.CalledProcessError as e:
         if e.returncode == 0x1:
             found = False
+
+    if found:
+        _installed_solvers.add(solver)
+
     return found
 
 
+def _parentheses_depth(line, quoted):
+    # Return the change in nesting depth of a line, and whether it ends
+    # inside a string literal. Parentheses within string literals (for
+    # instance, in error messages) are not counted. A quote inside a
+    # literal is written twice, which toggles the state back and forth.
+    if not quoted and '"' not in line:
+        return line.count("(") - line.count(")"), False
+
+    depth = 0
+
+    for i, chunk in enumerate(line.split('"')):
+        if i > 0:
+            quoted = not quoted
+
+        if not quoted:
+            depth += chunk.count("(") - chunk.count(")")
+
+    return depth, quoted
+
+
+def _read_response(stream):
+    # Long responses (for instance, the expression echoed back by get-value)
+    # are split across several lines. Read until parentheses are balanced.
+    line = stream.readline()
+
+    depth, quoted = _parentheses_depth(line, False)
+
+    if depth <= 0 and not quoted:
+        return line[:-1]
+
+    # Lines are joined once at the end, appending them to the response one
+    # at a time copies it over and over.
+    lines = [line]
+
+    while depth > 0 or quoted:
+        line = stream.readline()
+
+        if not line:
+            break
+
+        delta, quoted = _parentheses_depth(line, quoted)
+
+        depth += delta
+
+        lines.append(line)
+
+    response = "".join(lines)
+
+    return response[:-1] if response.endswith("\n") else response
+
+
 class SmtSolverNotFound(Exception):
     pass
 
 
+class _ResultCache(object):
+    """Cache of satisfiability results.
+
+    A problem is represented by the set of commands (declarations and
+    assertions) that define it. A subset of a satisfiable problem is
+    satisfiable and a superset of an unsatisfiable problem is
+    unsatisfiable, so a result can be reused even when that exact problem
+    was never checked before. Entries are indexed by their commands, so a
+    lookup only tests the entries that share a command with the problem.
+    A non-positive size disables the cache.
+    """
+
+    def __init__(self, size=256):
+        self._size = size
+
+        self.clear()
+
+    def clear(self):
+        # Entries, oldest first, along with the commands they are indexed
+        # by.
+        self._sat = OrderedDict()
+        self._unsat = OrderedDict()
+
+        # Satisfiable problems are indexed by each of their commands (a
+        # problem contained in one has any of its commands in it) and
+        # unsatisfiable ones by their smallest command (one contained in
+        # a problem has that command in it).
+        self._sat_index = {}
+        self._unsat_index = {}
+
+    def lookup(self, problem):
+        if problem in self._unsat:
+            return "unsat"
+
+        if problem in self._sat:
+            return "sat"
+
+        if self._unsat_index:
+            for command in problem:
+                for entry in self._unsat_index.get(command, ()):
+                    if entry <= problem:
+                        return "unsat"
+
+        if self._sat_index and problem:
+            for entry in self._sat_index.get(next(iter(problem)), ()):
+                if problem <= entry:
+                    return "sat"
+
+        return None
+
+    def store(self, problem, status):
+        if self._size <= 0 or not problem:
+            return
+
+        if status == "sat":
+            entries, index, commands = self._sat, self._sat_index, problem
+        elif status == "unsat":
+            entries, index, commands = self._unsat, self._unsat_index, (min(problem),)
+        else:
+            return
+
+        if problem in entries:
+            return
+
+        entries[problem] = commands
+
+        for command in commands:
+            index.setdefault(command, set()).add(problem)
+
+        if len(entries) > self._size:
+            entry, commands = entries.popitem(last=False)
+
+            for command in commands:
+                bucket = index[command]
+
+                bucket.discard(entry)
+
+                if not bucket:
+                    del index[command]
+
+
 class Z3Solver(object):
 
-    def __init__(self):
+    def __init__(self, cache_size=256):
         self._name = "z3"
 
         self._status = "unknown"
+        self._text = None
+        self._checked = False
 
         self._declarations = {}
         self._constraints = []
+        self._asserted = set()
+        self._problem = set()
+
+        # Names declared, in order, and the length of the declared names and
+        # constraints lists at each push (to rewind them on pop).
+        self._declared = []
+        self._scopes = []
+
+        # Values read from the current model, by expression.
+        self._values = {}
+
+        # Results of the problems checked (a non-positive size disables
+        # the cache).
+        self._results = _ResultCache(cache_size)
 
         self._process = None
 
+        self._pending = []
+
         self._check_solver()
 
         self._start_solver()
@@ -72,13 +286,23 @@ class Z3Solver(object):
             raise SmtSolverNotFound("{} solver is not installed".format(self._name))
 
     def _start_solver(self):
-        self._process = subprocess.Popen("z3 -smt2 -in", shell=True, bufsize=0, stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True)
+        if _z3_processes:
+            self._process = _z3_processes.pop()
+        else:
+            self._process = subprocess.Popen("z3 -smt2 -in", shell=True, bufsize=0, stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True)
+
+        _z3_processes_busy.add(self._process)
 
         # Set z3 declaration scopes.
         self._write("(set-option :global-decls false)")
         self._write("(set-logic QF_AUFBV)")
 
     def _stop_solver(self):
+        self._pending = []
+
+        if self._process and self._release_process():
+            self._process = None
+
         if self._process:
             self._process.stdin.close()
             self._process.stdout.close()
@@ -86,15 +310,67 @@ class Z3Solver(object):
             self._process.kill()
             self._process.wait()
 
+            if _z3_processes_busy is not None:
+                _z3_processes_busy.discard(self._process)
+
             self._process = None
 
+    def _release_process(self):
+        # Keep the process for a later solver, starting a new one is much
+        # more expensive than resetting it.
+        if _z3_processes is None or len(_z3_processes) >= _z3_processes_size:
+            return False
+
+        if self._process.poll() is not None:
+            return False
+
+        if not self._reset_process():
+            return False
+
+        _z3_processes_busy.discard(self._process)
+        _z3_processes.append(self._process)
+
+        return True
+
+    def _reset_process(self):
+        try:
+            self._process.stdin.write("(reset)\n(echo \"ready\")\n")
+
+            # Skip any unread output (e.g. errors) up to the echo, so the
+            # next response read belongs to the next command.
+            while True:
+                line = self._process.stdout.readline()
+
+                if not line:
+                    return False
+
+                if line == "ready\n":
+                    return True
+        except (IOError, OSError, ValueError):
+            return False
+
     def _write(self, command):
-        logger.debug("> %s", command)
+        # Commands are sent in batches, right before reading a response.
+        self._pending.append(command)
+
+    def _flush(self):
+        if self._pending:
+            # Terminate every command, including the last one, with a newline
+            # while joining them (saves copying each command on write).
+            self._pending.append("")
+
+            commands = "\n".join(self._pending)
+
+            logger.debug("> %s", commands)
+
+            self._process.stdin.write(commands)
 
-        self._process.stdin.writelines(command + "\n")
+            self._pending = []
 
     def _read(self):
-        response = self._process.stdout.readline()[:-1]
+        self._flush()
+
+        response = _read_response(self._process.stdout)
 
         logger.debug("< %s", response)
 
@@ -104,57 +380,171 @@ class Z3Solver(object):
         self._stop_solver()
 
     def __str__(self):
-        declarations = [d.declaration for d in self._declarations.values()]
-        constraints = ["(assert {})".format(c) for c in self._constraints]
+        # The text is kept until declarations or constraints change.
+        if self._text is None:
+            declarations = [d.declaration for d in self._declarations.values()]
+            constraints = ["(assert {})".format(c) for c in self._constraints]
+
+            self._text = "\n".join(declarations + constraints)
+
+        return self._text
+
+    def serialize(self, out):
+        """Write the declarations and assertions of the solver, in SMT-LIB
+        format, to a file-like object.
+        """
+        for declaration in self._declarations.values():
+            out.write(declaration.declaration)
+            out.write("\n")
 
-        return "\n".join(declarations + constraints)
+        for constraint in self._constraints:
+            out.write("(assert ")
+            constraint.serialize(out)
+            out.write(")\n")
 
     def add(self, constraint):
         assert isinstance(constraint, Bool)
 
-        self._write("(assert {})".format(constraint))
+        # Expressions are hash-consed, so a repeated constraint is usually
+        # the very same object.
+        if id(constraint) in self._asserted:
+            return
+
+        # Constraints that always hold do not change the problem (nor its
+        # status).
+        if known_true(constraint):
+            return
+
+        command = "(assert " + str(constraint) + ")"
+
+        if command in self._problem:
+            return
+
+        self._write(command)
 
         self._constraints.append(constraint)
+        self._asserted.add(id(constraint))
+        self._problem.add(command)
 
         self._status = "unknown"
+        self._text = None
+        self._checked = False
 
     def check(self):
         assert self._status in ("sat", "unsat", "unknown")
 
         if self._status == "unknown":
-            self._write("(check-sat)")
-            self._status = self._read()
+            problem = frozenset(self._problem)
+
+            status = self._results.lookup(problem)
+
+            if status is None:
+                status = self._check_sat()
+
+                self._results.store(problem, status)
+
+            self._status = status
 
         return self._status
 
+    def _check_sat(self):
+        self._write("(check-sat)")
+
+        self._checked = True
+        self._values = {}
+
+        return self._read()
+
     def reset(self):
-        self._stop_solver()
+        # Reset the solver in place instead of restarting it. Neither
+        # reset-assertions nor popping a base scope fit here: the first keeps
+        # top-level declarations and the second puts z3 in incremental mode,
+        # which solves these problems noticeably slower. Commands not sent
+        # yet are dropped, they do not produce output.
+        self._pending = []
+
+        if self._reset_process():
+            self._write("(set-option :global-decls false)")
+            self._write("(set-logic QF_AUFBV)")
+        else:
+            self._stop_solver()
+            self._start_solver()
 
         self._status = "unknown"
+        self._text = None
+        self._checked = False
 
         self._declarations = {}
         self._constraints = []
+        self._asserted = set()
+        self._problem = set()
 
-        self._start_solver()
+        self._declared = []
+        self._scopes = []
+
+        self._results.clear()
 
     def get_value(self, expr):
         assert self.check() == "sat"
 
-        self._write("(get-value ({}))".format(expr))
+        # A model is only available after the solver checked the problem
+        # itself, which is not the case when the result came from the cache.
+        if not self._checked:
+            self._check_sat()
+
+        # The model does not change until the next check, so each
+        # expression is only queried once.
+        expr = str(expr)
+
+        value = self._values.get(expr)
+
+        if value is None:
+            self._write("(get-value ({}))".format(expr))
 
-        response = self._read()
+            value = _parse_value(self._read())
 
-        regex = r"\(\(([^\s]+|\(.*\))\s#x([^\s]+)\)\)"
-        match = re.search(regex, response).groups()[1]
+            self._values[expr] = value
 
-        return int(match, 16)
+        return value
 
     def declare_fun(self, name, fun):
         if name in self._declarations:
             raise Exception("Symbol already declare.")
 
+        declaration = fun.declaration
+
         self._declarations[name] = fun
-        self._write(fun.declaration)
+        self._write(declaration)
+        self._text = None
+
+        self._declared.append(name)
+        self._problem.add(declaration)
+
+    def push(self):
+        self._write("(push 1)")
+
+        self._scopes.append((len(self._declared), len(self._constraints), self._status))
+
+    def pop(self):
+        self._write("(pop 1)")
+
+        declared, constraints, status = self._scopes.pop()
+
+        for name in self._declared[declared:]:
+            self._problem.discard(self._declarations.pop(name).declaration)
+
+        for constraint in self._constraints[constraints:]:
+            self._asserted.discard(id(constraint))
+            self._problem.discard("(assert " + str(constraint) + ")")
+
+        del self._declared[declared:]
+        del self._constraints[constraints:]
+
+        # The problem is back to the one at the push, and so is its status.
+        # The model is not, get_value checks the problem again to get one.
+        self._status = status
+        self._text = None
+        self._checked = False
 
     @property
     def declarations(self):
@@ -167,12 +557,21 @@ class CVC4Solver(object):
         self._name = "cvc4"
 
         self._status = "unknown"
+        self._text = None
 
         self._declarations = {}
         self._constraints = []
+        self._asserted = set()
+
+        # Names declared, in order, and the length of the declared names and
+        # constraints lists at each push (to rewind them on pop).
+        self._declared = []
+        self._scopes = []
 
         self._process = None
 
+        self._pending = []
+
         self._check_solver()
 
         self._start_solver()
@@ -191,6 +590,8 @@ class CVC4Solver(object):
         self._write("(set-option :produce-models true)")
 
     def _stop_solver(self):
+        self._pending = []
+
         if self._process:
             self._process.kill()
             self._process.wait()
@@ -198,12 +599,27 @@ class CVC4Solver(object):
             self._process = None
 
     def _write(self, command):
-        logger.debug("> %s", command)
+        # Commands are sent in batches, right before reading a response.
+        self._pending.append(command)
+
+    def _flush(self):
+        if self._pending:
+            # Terminate every command, including the last one, with a newline
+            # while joining them (saves copying each command on write).
+            self._pending.append("")
+
+            commands = "\n".join(self._pending)
+
+            logger.debug("> %s", commands)
 
-        self._process.stdin.writelines(command + "\n")
+            self._process.stdin.write(commands)
+
+            self._pending = []
 
     def _read(self):
-        response = self._process.stdout.readline()[:-1]
+        self._flush()
+
+        response = _read_response(self._process.stdout)
 
         logger.debug("< %s", response)
 
@@ -213,19 +629,48 @@ class CVC4Solver(object):
         self._stop_solver()
 
     def __str__(self):
-        declarations = [d.declaration for d in self._declarations.values()]
-        constraints = ["(assert {})".format(c) for c in self._constraints]
+        # The text is kept until declarations or constraints change.
+        if self._text is None:
+            declarations = [d.declaration for d in self._declarations.values()]
+            constraints = ["(assert {})".format(c) for c in self._constraints]
+
+            self._text = "\n".join(declarations + constraints)
+
+        return self._text
 
-        return "\n".join(declarations + constraints)
+    def serialize(self, out):
+        """Write the declarations and assertions of the solver, in SMT-LIB
+        format, to a file-like object.
+        """
+        for declaration in self._declarations.values():
+            out.write(declaration.declaration)
+            out.write("\n")
+
+        for constraint in self._constraints:
+            out.write("(assert ")
+            constraint.serialize(out)
+            out.write(")\n")
 
     def add(self, constraint):
         assert isinstance(constraint, Bool)
 
-        self._write("(assert {})".format(constraint))
+        # Expressions are hash-consed, so a repeated constraint is usually
+        # the very same object.
+        if id(constraint) in self._asserted:
+            return
+
+        # Constraints that always hold do not change the problem (nor its
+        # status).
+        if known_true(constraint):
+            return
+
+        self._write("(assert " + str(constraint) + ")")
 
         self._constraints.append(constraint)
+        self._asserted.add(id(constraint))
 
         self._status = "unknown"
+        self._text = None
 
     def check(self):
         assert self._status in ("sat", "unsat", "unknown")
@@ -240,9 +685,14 @@ class CVC4Solver(object):
         self._stop_solver()
 
         self._status = "unknown"
+        self._text = None
 
         self._declarations = {}
         self._constraints = []
+        self._asserted = set()
+
+        self._declared = []
+        self._scopes = []
 
         self._start_solver()
 
@@ -251,19 +701,241 @@ class CVC4Solver(object):
 
         self._write("(get-value ({}))".format(expr))
 
-        response = self._read()
+        return _parse_value(self._read())
+
+    def declare_fun(self, name, fun):
+        if name in self._declarations:
+            raise Exception("Symbol already declare.")
+
+        declaration = fun.declaration
+
+        self._declarations[name] = fun
+        self._write(declaration)
+        self._text = None
+
+        self._declared.append(name)
+
+    def push(self):
+        self._write("(push 1)")
+
+        self._scopes.append((len(self._declared), len(self._constraints)))
+
+    def pop(self):
+        self._write("(pop 1)")
+
+        declared, constraints = self._scopes.pop()
+
+        for name in self._declared[declared:]:
+            del self._declarations[name]
+
+        for constraint in self._constraints[constraints:]:
+            self._asserted.discard(id(constraint))
+
+        del self._declared[declared:]
+        del self._constraints[constraints:]
+
+        # CVC4 only answers get-value right after a check-sat, so the
+        # problem is checked again even if its status is known.
+        self._status = "unknown"
+        self._text = None
+
+    @property
+    def declarations(self):
+        return self._declarations
+
+
+class Z3NativeSolver(object):
+    """Z3 solver running in-process through its Python bindings, instead
+    of exchanging SMT-LIB commands with a z3 process.
+    """
+
+    def __init__(self):
+        self._name = "z3"
+
+        self._status = "unknown"
+        self._text = None
+
+        self._declarations = {}
+        self._constraints = []
+        self._asserted = set()
+
+        # Z3 terms of the declared symbols, by name.
+        self._terms = {}
+
+        # Assertions not passed to the solver yet. They are parsed and
+        # added all at once, when the solver is next used.
+        self._pending = []
+
+        # Names declared, in order, and the length of the declared names and
+        # constraints lists at each push (to rewind them on pop).
+        self._declared = []
+        self._scopes = []
+
+        self._solver = None
+
+        self._check_solver()
+
+        self._start_solver()
+
+    def _check_solver(self):
+        if z3 is None:
+            raise SmtSolverNotFound("{} Python bindings are not installed".format(self._name))
+
+    def _start_solver(self):
+        self._solver = z3.SolverFor("QF_AUFBV")
+
+    def _stop_solver(self):
+        self._solver = None
+
+    def _parse(self, command):
+        logger.debug("> %s", command)
+
+        # Only pass the symbols used in the command, the bindings convert the
+        # whole declaration dictionary on every call.
+        terms = self._terms
+        decls = {name: terms[name] for name in set(_symbol_re.findall(command)) if name in terms}
+
+        return z3.parse_smt2_string(command, decls=decls)
 
-        regex = r"\(\(([^\s]+|\(.*\))\s\(_\sbv([0-9]*)\s[0-9]*\)\)\)"
-        match = re.search(regex, response).groups()[1]
+    def __str__(self):
+        # The text is kept until declarations or constraints change.
+        if self._text is None:
+            declarations = [d.declaration for d in self._declarations.values()]
+            constraints = ["(assert {})".format(c) for c in self._constraints]
+
+            self._text = "\n".join(declarations + constraints)
+
+        return self._text
+
+    def serialize(self, out):
+        """Write the declarations and assertions of the solver, in SMT-LIB
+        format, to a file-like object.
+        """
+        for declaration in self._declarations.values():
+            out.write(declaration.declaration)
+            out.write("\n")
+
+        for constraint in self._constraints:
+            out.write("(assert ")
+            constraint.serialize(out)
+            out.write(")\n")
+
+    def add(self, constraint):
+        assert isinstance(constraint, Bool)
+
+        # Expressions are hash-consed, so a repeated constraint is usually
+        # the very same object.
+        if id(constraint) in self._asserted:
+            return
+
+        # Constraints that always hold do not change the problem (nor its
+        # status).
+        if known_true(constraint):
+            return
+
+        self._pending.append("(assert " + str(constraint) + ")")
+
+        self._constraints.append(constraint)
+        self._asserted.add(id(constraint))
+
+        self._status = "unknown"
+        self._text = None
 
-        return int(match)
+    def _flush(self):
+        if self._pending:
+            self._solver.add(self._parse("\n".join(self._pending)))
+
+            self._pending = []
+
+    def check(self):
+        assert self._status in ("sat", "unsat", "unknown")
+
+        if self._status == "unknown":
+            self._flush()
+
+            self._status = str(self._solver.check())
+
+        return self._status
+
+    def reset(self):
+        self._stop_solver()
+
+        self._status = "unknown"
+        self._text = None
+
+        self._declarations = {}
+        self._constraints = []
+        self._asserted = set()
+
+        self._terms = {}
+        self._pending = []
+
+        self._declared = []
+        self._scopes = []
+
+        self._start_solver()
+
+    def get_value(self, expr):
+        assert self.check() == "sat"
+
+        # Declared symbols are looked up directly. Other expressions have to
+        # be parsed, and only assertions can be, so the expression is
+        # extracted from a trivial one.
+        term = self._terms.get(str(expr))
+
+        if term is None:
+            term = self._parse("(assert (= {0} {0}))".format(expr))[0].arg(0)
+
+        value = self._solver.model().eval(term, model_completion=True)
+
+        return value.as_long()
 
     def declare_fun(self, name, fun):
         if name in self._declarations:
             raise Exception("Symbol already declare.")
 
+        if isinstance(fun, BitVecArray):
+            term = z3.Array(name, z3.BitVecSort(fun.key_size), z3.BitVecSort(fun.value_size))
+        elif isinstance(fun, BitVec):
+            term = z3.BitVec(name, fun.size)
+        elif isinstance(fun, Bool):
+            term = z3.Bool(name)
+        else:
+            raise Exception("Unsupported symbol type.")
+
         self._declarations[name] = fun
-        self._write(fun.declaration)
+        self._terms[name] = term
+        self._text = None
+
+        self._declared.append(name)
+
+    def push(self):
+        self._flush()
+
+        self._solver.push()
+
+        self._scopes.append((len(self._declared), len(self._constraints)))
+
+    def pop(self):
+        # Pending assertions were all made after the last push.
+        self._pending = []
+
+        self._solver.pop()
+
+        declared, constraints = self._scopes.pop()
+
+        for name in self._declared[declared:]:
+            del self._declarations[name]
+            del self._terms[name]
+
+        for constraint in self._constraints[constraints:]:
+            self._asserted.discard(id(constraint))
+
+        del self._declared[declared:]
+        del self._constraints[constraints:]
+
+        self._status = "unknown"
+        self._text = None
 
     @property
     def declarations(self):
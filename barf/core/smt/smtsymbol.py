@@ -24,42 +24,464 @@
 
 from __future__ import absolute_import
 
+import weakref
+
 from past.builtins import long
 
+# Python integer types (int and long are the same type in Python 3).
+_int_types = frozenset([int, long])
+
+# Hash-consing table of expressions. Expressions of the same type built from
+# the same operator and operands (by identity) are shared. The table holds
+# weak references; entries of dead expressions are purged once the table
+# grows past its limit (cheaper than a WeakValueDictionary callback each).
+_symbols = {}
+_symbols_limit = 1 << 12
+
+# Constants created from Python integers when mixed with bit vectors.
+_constants = {}
+_constants_size = 1 << 16
+
+# Operators that are folded when all the bits of their result are known,
+# and how deep known bits are looked for in an expression.
+_bitwise_ops = frozenset(["bvand", "bvor", "bvxor", "bvnot"])
+_known_bits_depth = 8
+
+# Constant mask and formatter by size.
+_constant_formats = {}
+
 
 def _cast_to_bool(value):
-    if type(value) is bool:
-        value = Bool(str(value).lower())
+    if type(value) is Bool:
+        return value
 
-    assert type(value) == Bool
+    if type(value) is bool:
+        return Bool("true" if value else "false")
 
-    return value
+    raise TypeError("Invalid boolean operand: {}".format(value))
 
 
 def _cast_to_bitvec(value, size):
-    if type(value) in (int, long):
-        value = Constant(size, value)
+    # Fast path, operands are mostly bit vectors of the same size.
+    if type(value) is BitVec and value.size == size:
+        return value
+
+    if type(value) in _int_types:
+        constant = _constants.get((value, size))
+
+        if constant is not None:
+            return constant
+
+        return make_constant(size, value)
+
+    if type(value) is Constant and value.size == size:
+        return value
+
+    raise TypeError("Invalid bit vector operand: {}".format(value))
+
+
+def make_constant(size, value):
+    """Return a constant of the given size and value. Constants are shared
+    (small ones, up to 8 bits, always are).
+    """
+    key = (value & ((1 << size) - 1), size)
+
+    constant = _constants.get(key)
+
+    if constant is None:
+        constant = Constant(size, value)
+
+        if len(_constants) < _constants_size or size <= 8:
+            _constants[key] = constant
+
+    return constant
+
+
+def _shl(value, amount, size):
+    # Bound the shift amount, the result is truncated to size bits anyway.
+    return value << min(amount, size)
+
+
+def _lshr(value, amount, size):
+    return value >> amount
+
+
+def _udiv(value, divisor, size):
+    # Division by zero is defined by SMT-LIB as all ones.
+    return value // divisor if divisor else (1 << size) - 1
+
+
+def _urem(value, divisor, size):
+    # Remainder by zero is defined by SMT-LIB as the dividend.
+    return value % divisor if divisor else value
+
+
+# Operations evaluated at construction time when all operands are constants.
+_folds = {
+    "bvadd": lambda a, b, size: a + b,
+    "bvsub": lambda a, b, size: a - b,
+    "bvmul": lambda a, b, size: a * b,
+    "bvand": lambda a, b, size: a & b,
+    "bvor": lambda a, b, size: a | b,
+    "bvxor": lambda a, b, size: a ^ b,
+    "bvshl": _shl,
+    "bvlshr": _lshr,
+    "bvudiv": _udiv,
+    "bvurem": _urem,
+    "bvnot": lambda a, size: ~a,
+    "bvneg": lambda a, size: -a,
+}
+
+
+def _fold_bitvec(size, value, a, b):
+    if type(a) is Constant and type(b) is Constant:
+        if a is b and value in ("bvnot", "bvneg"):
+            return make_constant(size, _folds[value](a._number, size))
+
+        return make_constant(size, _folds[value](a._number, b._number, size))
+
+    if value == "bvand":
+        # x & 0 = 0, x & -1 = x
+        mask = (1 << size) - 1
+
+        if type(a) is Constant:
+            if a._number == 0:
+                return a
+            if a._number == mask:
+                return b
+        if type(b) is Constant:
+            if b._number == 0:
+                return b
+            if b._number == mask:
+                return a
+    elif value == "bvor":
+        # x | -1 = -1, x | 0 = x
+        mask = (1 << size) - 1
+
+        if type(a) is Constant:
+            if a._number == mask:
+                return a
+            if a._number == 0:
+                return b
+        if type(b) is Constant:
+            if b._number == mask:
+                return b
+            if b._number == 0:
+                return a
+    elif value == "bvxor" and a is b:
+        # x ^ x = 0
+        return make_constant(size, 0)
+    elif value in ("bvxor", "bvadd"):
+        # x ^ 0 = x, x + 0 = x
+        if type(a) is Constant and a._number == 0:
+            return b
+        if type(b) is Constant and b._number == 0:
+            return a
+    elif value in ("bvsub", "bvshl", "bvlshr"):
+        # x - 0 = x, x << 0 = x, x >> 0 = x
+        if type(b) is Constant and b._number == 0:
+            return a
+
+    return None
+
+
+def _make_bitvec(size, value, *children):
+    if value in _folds:
+        # Only operations with a constant operand, or with the same operand
+        # twice (this includes unary operations), can be folded.
+        a = children[0]
+        b = children[-1]
+
+        if type(a) is Constant or type(b) is Constant or a is b:
+            folded = _fold_bitvec(size, value, a, b)
+
+            if folded is not None:
+                return folded
+
+    # NOTE: Symbols keep a reference to their children, so the children ids
+    # in the key remain valid while the expression is alive.
+    if len(children) == 2:
+        key = (size, value, id(children[0]), id(children[1]))
+    else:
+        key = (size, value) + tuple(map(id, children))
+
+    ref = _symbols.get(key)
+    bitvec = ref() if ref is not None else None
+
+    if bitvec is None:
+        if value in _bitwise_ops and \
+                (_may_have_known_bits(children[0]) or _may_have_known_bits(children[-1])):
+            known_zero, known_one = _known_bits_op(size, value, children, _known_bits_depth)
+
+            if known_zero | known_one == (1 << size) - 1:
+                return make_constant(size, known_one)
+
+        bitvec = BitVec(size, value, *children)
+
+        _add_symbol(key, bitvec)
+
+    return bitvec
+
+
+def known_bits(bitvec, depth=None):
+    """Return two masks, with the bits of a bit vector known to be zero
+    and the ones known to be one.
+    """
+    if depth is None:
+        depth = _known_bits_depth
+
+    known = bitvec._known
+
+    if known is None:
+        if type(bitvec) is Constant:
+            known = (~bitvec._number & ((1 << bitvec.size) - 1), bitvec._number)
+        elif bitvec._op is None or depth == 0:
+            known = (0, 0)
+        else:
+            known = _known_bits_op(bitvec.size, bitvec._op, bitvec._children, depth - 1)
+
+        bitvec._known = known
+
+    return known
+
+
+def _may_have_known_bits(bitvec):
+    # Cheap test to skip computing the known bits of most expressions.
+    op = bitvec._op
+
+    return type(bitvec) is Constant or \
+        (op is not None and (op in _bitwise_ops or op in ("concat", "ite") or op.startswith("(_ ")))
+
+
+def _known_bits_op(size, value, children, depth):
+    mask = (1 << size) - 1
+
+    if value == "bvand":
+        zeros, ones = 0, mask
+
+        for child in children:
+            child_zeros, child_ones = known_bits(child, depth)
+
+            zeros |= child_zeros
+            ones &= child_ones
+    elif value == "bvor":
+        zeros, ones = mask, 0
+
+        for child in children:
+            child_zeros, child_ones = known_bits(child, depth)
+
+            zeros &= child_zeros
+            ones |= child_ones
+    elif value == "bvxor":
+        zeros, ones = mask, 0
+
+        for child in children:
+            child_zeros, child_ones = known_bits(child, depth)
+
+            zeros, ones = (zeros & child_zeros) | (ones & child_ones), \
+                          (zeros & child_ones) | (ones & child_zeros)
+    elif value == "bvnot":
+        ones, zeros = known_bits(children[0], depth)
+    elif value == "concat":
+        zeros, ones = 0, 0
+
+        # The first operand is the most significant one.
+        for child in children:
+            child_zeros, child_ones = known_bits(child, depth)
+
+            zeros = (zeros << child.size) | child_zeros
+            ones = (ones << child.size) | child_ones
+    elif value == "ite":
+        # Bits known to be the same in both branches.
+        true_zeros, true_ones = known_bits(children[1], depth)
+        false_zeros, false_ones = known_bits(children[2], depth)
+
+        zeros, ones = true_zeros & false_zeros, true_ones & false_ones
+    elif value.startswith("(_ zero_extend "):
+        zeros, ones = known_bits(children[0], depth)
+
+        zeros |= mask & ~((1 << children[0].size) - 1)
+    elif value.startswith("(_ sign_extend "):
+        zeros, ones = known_bits(children[0], depth)
+
+        sign = 1 << (children[0].size - 1)
+        extension = mask & ~((1 << children[0].size) - 1)
+
+        if zeros & sign:
+            zeros |= extension
+        elif ones & sign:
+            ones |= extension
+    elif value.startswith("(_ extract "):
+        zeros, ones = known_bits(children[0], depth)
+
+        offset = int(value.split()[3][:-1])
+
+        zeros = (zeros >> offset) & mask
+        ones = (ones >> offset) & mask
+    else:
+        zeros, ones = 0, 0
+
+    return zeros, ones
+
+
+def _make_bool(value, *children):
+    if len(children) == 2:
+        key = (Bool, value, id(children[0]), id(children[1]))
+    else:
+        key = (Bool, value) + tuple(map(id, children))
+
+    ref = _symbols.get(key)
+    boolean = ref() if ref is not None else None
+
+    if boolean is None:
+        boolean = Bool(value, *children)
+
+        _add_symbol(key, boolean)
 
-    assert type(value) in (Constant, BitVec) and value.size == size
+    return boolean
 
-    return value
+
+def known_true(boolean):
+    """Return whether a boolean expression holds whatever the value of its
+    symbols is (as far as can be told without a solver).
+    """
+    op = boolean._op
+
+    if op is None:
+        return boolean._value == "true"
+
+    if op in ("=", "bvule", "bvuge", "bvsle", "bvsge"):
+        a, b = boolean._children
+
+        if a is b:
+            return True
+
+        if op == "=" and type(a) in (Constant, BitVec) and type(b) in (Constant, BitVec) and \
+                _may_have_known_bits(a) and _may_have_known_bits(b):
+            mask = (1 << a.size) - 1
+            a_zeros, a_ones = known_bits(a)
+            b_zeros, b_ones = known_bits(b)
+
+            return a_zeros | a_ones == mask and a_ones == b_ones and b_zeros | b_ones == mask
+
+    return False
+
+
+def _add_symbol(key, symbol):
+    global _symbols_limit
+
+    _symbols[key] = weakref.ref(symbol)
+
+    if len(_symbols) > _symbols_limit:
+        for dead in [k for k, ref in _symbols.items() if ref() is None]:
+            del _symbols[dead]
+
+        _symbols_limit = max(1 << 12, 2 * len(_symbols))
+
+
+# Associative operators, nested applications of these are serialized as a
+# single n-ary application, e.g. (and a (and b c)) as (and a b c).
+_associative_ops = frozenset([
+    "and", "or", "xor", "bvadd", "bvmul", "bvand", "bvor", "bvxor",
+])
+
+
+def _flatten(symbol):
+    # Return the operands of the nested applications of the operator of
+    # symbol, in order.
+    operands = []
+    pending = [symbol]
+
+    while pending:
+        item = pending.pop()
+
+        if item._op == symbol._op:
+            pending.extend(reversed(item._children))
+        else:
+            operands.append(item)
+
+    return operands
 
 
 class Symbol(object):
 
+    __slots__ = [
+        '_value',
+        '_op',
+        '_children',
+        '__weakref__',
+    ]
+
     def __init__(self, value, *children):
-        self._value = str(value) if len(children) == 0 else "({:s} {:s})".format(value, " ".join([str(c) for c in children]))
+        # The string representation of a non-leaf symbol is built on demand
+        # (most intermediate expressions are never turned into strings).
+        if children:
+            self._value = None
+            self._op = value
+            self._children = children
+        else:
+            self._value = str(value)
+            self._op = None
+            self._children = None
 
     @property
     def value(self):
+        if self._value is None:
+            self._value = "".join(self._chunks())
+
         return self._value
 
+    def serialize(self, out):
+        """Write the SMT-LIB representation of the symbol to a file-like
+        object.
+        """
+        for chunk in self._chunks():
+            out.write(chunk)
+
+    def _chunks(self):
+        # Walk the expression iteratively so deeply nested expressions do not
+        # hit the recursion limit. The string of intermediate symbols is not
+        # built, which keeps the work linear in the size of the expression.
+        stack = [self]
+
+        # Local names for what the loop uses (a global lookup per item adds
+        # up on large expressions).
+        pop = stack.pop
+        push = stack.append
+        associative_ops = _associative_ops
+        str_type = str
+
+        while stack:
+            item = pop()
+
+            if type(item) is str_type:
+                yield item
+            elif item._value is not None:
+                yield item._value
+            else:
+                op = item._op
+
+                yield "(" + op
+
+                push(")")
+
+                if op in associative_ops:
+                    children = _flatten(item)
+                else:
+                    children = item._children
+
+                for child in reversed(children):
+                    push(child)
+                    push(" ")
+
     def __str__(self):
-        return self._value
+        return self.value
 
 
 class Bool(Symbol):
 
+    __slots__ = []
+
     def __init__(self, value, *children):
         super(Bool, self).__init__(value, *children)
 
@@ -69,33 +491,33 @@ class Bool(Symbol):
 
     # Comparison operators
     def __eq__(self, other):
-        return Bool("=", self, _cast_to_bool(other))
+        return _make_bool("=", self, _cast_to_bool(other))
 
     def __ne__(self, other):
-        return Bool("not", self == other)
+        return _make_bool("not", self == other)
 
     # Logical operators
     def __and__(self, other):
-        return Bool("and", self, _cast_to_bool(other))
+        return _make_bool("and", self, _cast_to_bool(other))
 
     def __or__(self, other):
-        return Bool("or", self, _cast_to_bool(other))
+        return _make_bool("or", self, _cast_to_bool(other))
 
     def __xor__(self, other):
-        return Bool("xor", self, _cast_to_bool(other))
+        return _make_bool("xor", self, _cast_to_bool(other))
 
     def __invert__(self):
-        return Bool("not", self)
+        return _make_bool("not", self)
 
     # Reverse logical operators
     def __rand__(self, other):
-        return Bool("and", _cast_to_bool(other), self)
+        return _make_bool("and", _cast_to_bool(other), self)
 
     def __ror__(self, other):
-        return Bool("or", _cast_to_bool(other), self)
+        return _make_bool("or", _cast_to_bool(other), self)
 
     def __rxor__(self, other):
-        return Bool("xor", _cast_to_bool(other), self)
+        return _make_bool("xor", _cast_to_bool(other), self)
 
     def __key(self):
         return (self._value,)
@@ -106,129 +528,146 @@ class Bool(Symbol):
 
 class BitVec(Symbol):
 
+    __slots__ = [
+        'size',
+        '_known',
+    ]
+
     def __init__(self, size, value, *children):
-        super(BitVec, self).__init__(value, *children)
+        # Same as Symbol.__init__, inlined (bit vectors are the most
+        # frequently built symbols).
+        if children:
+            self._value = None
+            self._op = value
+            self._children = children
+        else:
+            self._value = str(value)
+            self._op = None
+            self._children = None
 
         self.size = size
 
+        # Known bits (see known_bits), computed on demand.
+        self._known = None
+
     @property
     def declaration(self):
         return "(declare-fun {} () (_ BitVec {}))".format(self.value, self.size)
 
     # Arithmetic operators
     def __add__(self, other):
-        return BitVec(self.size, "bvadd", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvadd", self, _cast_to_bitvec(other, self.size))
 
     def __sub__(self, other):
-        return BitVec(self.size, "bvsub", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvsub", self, _cast_to_bitvec(other, self.size))
 
     def __mul__(self, other):
-        return BitVec(self.size, "bvmul", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvmul", self, _cast_to_bitvec(other, self.size))
 
     def __div__(self, other):
-        return BitVec(self.size, "bvsdiv", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvsdiv", self, _cast_to_bitvec(other, self.size))
 
     def __floordiv__(self, other):
-        return BitVec(self.size, "bvsdiv", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvsdiv", self, _cast_to_bitvec(other, self.size))
 
     def __mod__(self, other):
-        return BitVec(self.size, "bvsmod", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvsmod", self, _cast_to_bitvec(other, self.size))
 
     def __neg__(self):
-        return BitVec(self.size, "bvneg", self)
+        return _make_bitvec(self.size, "bvneg", self)
 
     # Reverse arithmetic operators
     def __radd__(self, other):
-        return BitVec(self.size, "bvadd", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvadd", _cast_to_bitvec(other, self.size), self)
 
     def __rsub__(self, other):
-        return BitVec(self.size, "bvsub", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvsub", _cast_to_bitvec(other, self.size), self)
 
     def __rmul__(self, other):
-        return BitVec(self.size, "bvmul", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvmul", _cast_to_bitvec(other, self.size), self)
 
     def __rdiv__(self, other):
-        return BitVec(self.size, "bvsdiv", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvsdiv", _cast_to_bitvec(other, self.size), self)
 
     def __rfloordiv__(self, other):
-        return BitVec(self.size, "bvsdiv", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvsdiv", _cast_to_bitvec(other, self.size), self)
 
     def __rmod__(self, other):
-        return BitVec(self.size, "bvsmod", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvsmod", _cast_to_bitvec(other, self.size), self)
 
     # Bitwise operators
     def __and__(self, other):
-        return BitVec(self.size, "bvand", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvand", self, _cast_to_bitvec(other, self.size))
 
     def __xor__(self, other):
-        return BitVec(self.size, "bvxor", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvxor", self, _cast_to_bitvec(other, self.size))
 
     def __or__(self, other):
-        return BitVec(self.size, "bvor", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvor", self, _cast_to_bitvec(other, self.size))
 
     def __lshift__(self, other):
-        return BitVec(self.size, "bvshl", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvshl", self, _cast_to_bitvec(other, self.size))
 
     def __rshift__(self, other):
-        return BitVec(self.size, "bvlshr", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvlshr", self, _cast_to_bitvec(other, self.size))
 
     def __invert__(self):
-        return BitVec(self.size, "bvnot", self)
+        return _make_bitvec(self.size, "bvnot", self)
 
     # Reverse bitwise operators
     def __rand__(self, other):
-        return BitVec(self.size, "bvand", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvand", _cast_to_bitvec(other, self.size), self)
 
     def __rxor__(self, other):
-        return BitVec(self.size, "bvxor", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvxor", _cast_to_bitvec(other, self.size), self)
 
     def __ror__(self, other):
-        return BitVec(self.size, "bvor", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvor", _cast_to_bitvec(other, self.size), self)
 
     def __rlshift__(self, other):
-        return BitVec(self.size, "bvshl", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvshl", _cast_to_bitvec(other, self.size), self)
 
     def __rrshift__(self, other):
-        return BitVec(self.size, "bvlshr", _cast_to_bitvec(other, self.size), self)
+        return _make_bitvec(self.size, "bvlshr", _cast_to_bitvec(other, self.size), self)
 
     # Comparison operators (signed)
     def __lt__(self, other):
-        return Bool("bvslt", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvslt", self, _cast_to_bitvec(other, self.size))
 
     def __le__(self, other):
-        return Bool("bvsle", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvsle", self, _cast_to_bitvec(other, self.size))
 
     def __eq__(self, other):
-        return Bool("=", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("=", self, _cast_to_bitvec(other, self.size))
 
     def __ne__(self, other):
-        return Bool("not", self == other)
+        return _make_bool("not", self == other)
 
     def __gt__(self, other):
-        return Bool("bvsgt", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvsgt", self, _cast_to_bitvec(other, self.size))
 
     def __ge__(self, other):
-        return Bool("bvsge", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvsge", self, _cast_to_bitvec(other, self.size))
 
     # Comparison operators (unsigned)
     def ult(self, other):
-        return Bool("bvult", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvult", self, _cast_to_bitvec(other, self.size))
 
     def ule(self, other):
-        return Bool("bvule", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvule", self, _cast_to_bitvec(other, self.size))
 
     def ugt(self, other):
-        return Bool("bvugt", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvugt", self, _cast_to_bitvec(other, self.size))
 
     def uge(self, other):
-        return Bool("bvuge", self, _cast_to_bitvec(other, self.size))
+        return _make_bool("bvuge", self, _cast_to_bitvec(other, self.size))
 
     # Arithmetic operators (unsigned)
     def udiv(self, other):
-        return BitVec(self.size, "bvudiv", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvudiv", self, _cast_to_bitvec(other, self.size))
 
     def umod(self, other):
-        return BitVec(self.size, "bvurem", self, _cast_to_bitvec(other, self.size))
+        return _make_bitvec(self.size, "bvurem", self, _cast_to_bitvec(other, self.size))
 
     def __key(self):
         return (self._value, self.size)
@@ -239,26 +678,44 @@ class BitVec(Symbol):
 
 class Constant(BitVec):
 
+    __slots__ = [
+        '_number',
+    ]
+
     def __init__(self, size, value, *children):
-        super(Constant, self).__init__(size, self._cast_value(value, size), *children)
+        number, string = self._cast_value(value, size)
 
-        self.size = size
+        super(Constant, self).__init__(size, string, *children)
+
+        self._number = number
 
     def _cast_value(self, value, size):
-        # Truncate value.
-        value = value & ((1 << size) - 1)
+        try:
+            mask, fmt = _constant_formats[size]
+        except KeyError:
+            mask = (1 << size) - 1
 
-        # Format number, choose between binary and hexadecimal notation.
-        if size < 8:
-            value_str = "#b{0:0{fill}b}".format(value, fill=size // 1)
-        else:
-            value_str = "#x{0:0{fill}x}".format(value, fill=size // 4)
+            # Format number, choose between binary and hexadecimal notation.
+            if size < 8:
+                fmt = ("#b{:0" + str(size) + "b}").format
+            else:
+                fmt = ("#x%0" + str(size // 4) + "x").__mod__
 
-        return value_str
+            _constant_formats[size] = mask, fmt
+
+        # Truncate value.
+        value = value & mask
+
+        return value, fmt(value)
 
 
 class Array(Symbol):
 
+    __slots__ = [
+        'key_size',
+        'value_size',
+    ]
+
     def __init__(self, key_size, value_size, value, *children):
         super(Array, self).__init__(value, *children)
 
@@ -268,6 +725,13 @@ class Array(Symbol):
 
 class BitVecArray(object):
 
+    __slots__ = [
+        'array',
+        'name',
+        'key_size',
+        'value_size',
+    ]
+
     def __init__(self, key_size, value_size, name, *children):
         self.array = Array(key_size, value_size, name, *children)
         self.name = name
@@ -280,12 +744,33 @@ class BitVecArray(object):
                                                                                 self.value_size)
 
     def select(self, key):
-        return BitVec(self.value_size, "select", self.array, _cast_to_bitvec(key, self.key_size))
+        key = _cast_to_bitvec(key, self.key_size)
+
+        # Read over the stores whose key is known to be equal to, or
+        # different from, the one being read. Otherwise, the select has to
+        # be built on top of the whole chain of stores.
+        array = self.array
+
+        while array._op == "store":
+            array_base, store_key, store_value = array._children
+
+            if store_key is key:
+                return store_value
+
+            if type(store_key) is not Constant or type(key) is not Constant:
+                break
+
+            if store_key._number == key._number:
+                return store_value
+
+            array = array_base
+
+        return _make_bitvec(self.value_size, "select", array, key)
 
     def store(self, key, value):
-        return Array(self.key_size, self.value_size, "(store {} {} {})".format(self.array,
-                                                                               _cast_to_bitvec(key, self.key_size),
-                                                                               _cast_to_bitvec(value, self.value_size)))
+        return Array(self.key_size, self.value_size, "store", self.array,
+                     _cast_to_bitvec(key, self.key_size),
+                     _cast_to_bitvec(value, self.value_size))
 
     # Index operators
     def __getitem__(self, key):
@@ -299,13 +784,13 @@ class BitVecArray(object):
         assert isinstance(other.array, Array)
         assert other.array.key_size == self.array.key_size and other.array.value_size == self.array.value_size
 
-        return Bool("=", self.array, other.array)
+        return _make_bool("=", self.array, other.array)
 
     def __neq__(self, other):
         assert isinstance(other.array, Array)
         assert other.array.key_size == self.array.key_size and other.array.value_size == self.array.value_size
 
-        return Bool("not", self.__eq__(other))
+        return _make_bool("not", self.__eq__(other))
 
     def __key(self):
         return (self._value,
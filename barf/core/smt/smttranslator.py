@@ -47,6 +47,10 @@ t2_0 (bvadd t0_1 t1_0))". It also send the following commands to the solver:
 from __future__ import absolute_import
 
 import logging
+import operator
+
+from copy import copy
+from functools import partial
 
 import barf.core.smt.smtfunction as smtfunction
 import barf.core.smt.smtsymbol as smtsymbol
@@ -55,9 +59,24 @@ from barf.core.reil.reil import ReilImmediateOperand
 from barf.core.reil.reil import ReilMnemonic
 from barf.core.reil.reil import ReilRegisterOperand
 from barf.utils.utils import VariableNamer
+from barf.utils.utils import extract_sign_bit
+from barf.utils.utils import twos_complement
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of stores chained on the memory before binding them to a
+# new memory version.
+_MEM_PENDING_STORES_MAX = 16
+
+
+def _is_temporal(name):
+    # REIL temporal registers are named 't' followed by a number.
+    return name[:1] == "t" and name[1:].isdigit()
+
+
+class SmtTranslatorInvalidInstruction(Exception):
+    pass
+
 
 class SmtTranslator(object):
 
@@ -80,27 +99,48 @@ class SmtTranslator(object):
         self._mem_init = smtsymbol.BitVecArray(address_size, 8, "MEM_{}".format(self._mem_instance))
         self._mem_curr = self.make_array(self._address_size, "MEM_{}".format(self._mem_instance))
 
+        # Number of stores applied to the current memory that have not
+        # been bound to a new memory version yet (see _translate_stm).
+        self._mem_pending = 0
+
         # A variable name mapper maps variable names to its current
         # 'version' of the variable, e.i., 'eax' -> 'eax_3'
         self._var_name_mappers = {}
 
+        # Current name of each variable (same as asking its mapper, but
+        # without building the name string on every read).
+        self._var_names_curr = {}
+
         self._arch_regs_size = {}
         self._arch_alias_mapper = {}
 
+        # Register aliases along with the size of their base register,
+        # e.i., 'ax' -> ('eax', 0, 32)
+        self._arch_alias_info = {}
+
+        # Translated source register operands, keyed by (variable
+        # name, offset, size). Variable names carry their version, so
+        # entries never go stale.
+        self._src_oprnd_cache = {}
+
+        # Variable names bound to an expression (a variable or a
+        # constant) instead of being declared, e.i., 't1_1' -> 't0_0'
+        self._aliases = {}
+
         # Instructions translators (from REIL to SMT expressions)
         self._instr_translators = {
             # Arithmetic Instructions
-            ReilMnemonic.ADD: self._translate_add,
-            ReilMnemonic.SUB: self._translate_sub,
-            ReilMnemonic.MUL: self._translate_mul,
-            ReilMnemonic.DIV: self._translate_div,
-            ReilMnemonic.MOD: self._translate_mod,
+            ReilMnemonic.ADD: partial(self._translate_binary_op, operator.add, True),
+            ReilMnemonic.SUB: partial(self._translate_binary_op, operator.sub, True),
+            ReilMnemonic.MUL: partial(self._translate_binary_op, operator.mul, True),
+            ReilMnemonic.DIV: partial(self._translate_binary_op, smtsymbol.BitVec.udiv, True),
+            ReilMnemonic.MOD: partial(self._translate_binary_op, smtsymbol.BitVec.umod, True),
             ReilMnemonic.BSH: self._translate_bsh,
 
             # Bitwise Instructions
-            ReilMnemonic.AND: self._translate_and,
-            ReilMnemonic.OR: self._translate_or,
-            ReilMnemonic.XOR: self._translate_xor,
+            ReilMnemonic.AND: partial(self._translate_binary_op, operator.and_, False),
+            ReilMnemonic.OR: partial(self._translate_binary_op, operator.or_, False),
+            ReilMnemonic.XOR: partial(self._translate_binary_op, operator.xor, False),
 
             # Data Transfer Instructions
             ReilMnemonic.LDM: self._translate_ldm,
@@ -114,7 +154,6 @@ class SmtTranslator(object):
             # Other Instructions
             ReilMnemonic.UNDEF: self._translate_undef,
             ReilMnemonic.UNKN: self._translate_unkn,
-            ReilMnemonic.NOP: self._translate_nop,
 
             # Extensions
             ReilMnemonic.SEXT: self._translate_sext,
@@ -123,13 +162,31 @@ class SmtTranslator(object):
             ReilMnemonic.SMUL: self._translate_smul,
         }
 
+        # Same translators, indexed by mnemonic (mnemonics are small
+        # consecutive integers).
+        self._instr_translators_table = [None] * (max(self._instr_translators) + 1)
+
+        for mnemonic, translator in self._instr_translators.items():
+            self._instr_translators_table[mnemonic] = translator
+
     def translate(self, instr):
         """Return the SMT representation of a REIL instruction.
         """
-        try:
-            translator = self._instr_translators[instr.mnemonic]
+        mnemonic = instr.mnemonic
+
+        # NOP has no formula representation.
+        if mnemonic == ReilMnemonic.NOP:
+            return []
+
+        translators = self._instr_translators_table
 
-            return translator(*instr.operands)
+        if mnemonic >= len(translators) or translators[mnemonic] is None:
+            raise SmtTranslatorInvalidInstruction("Invalid instruction mnemonic: {}".format(mnemonic))
+
+        oprnd1, oprnd2, oprnd3 = instr.operands
+
+        try:
+            return translators[mnemonic](oprnd1, oprnd2, oprnd3)
         except Exception:
             logger.error("Failed to translate instruction: %s", instr, exc_info=True)
 
@@ -169,8 +226,13 @@ class SmtTranslator(object):
 
         self._mem_init = smtsymbol.BitVecArray(self._address_size, 8, "MEM_{}".format(self._mem_instance))
         self._mem_curr = self.make_array(self._address_size, "MEM_{}".format(self._mem_instance))
+        self._mem_pending = 0
 
         self._var_name_mappers = {}
+        self._var_names_curr = {}
+
+        self._src_oprnd_cache = {}
+        self._aliases = {}
 
     def set_arch_alias_mapper(self, alias_mapper):
         """Set native register alias mapper.
@@ -188,16 +250,27 @@ class SmtTranslator(object):
         """
         self._arch_alias_mapper = alias_mapper
 
+        self._update_arch_alias_info()
+
     def set_arch_registers_size(self, registers_size):
         """Set registers.
         """
         self._arch_regs_size = registers_size
 
+        self._update_arch_alias_info()
+
     def make_bitvec(self, size, name):
-        assert size in [1, 8, 16, 32, 40, 64, 72, 128, 256]
+        assert size in {1, 8, 16, 32, 40, 64, 72, 128, 256}
+
+        bv = self._solver.declarations.get(name)
+
+        if bv is not None:
+            return bv
 
-        if name in self._solver.declarations:
-            return self._solver.declarations[name]
+        bv = self._aliases.get(name)
+
+        if bv is not None:
+            return bv
 
         bv = smtsymbol.BitVec(size, name)
 
@@ -206,10 +279,12 @@ class SmtTranslator(object):
         return bv
 
     def make_array(self, size, name):
-        assert size in [32, 64]
+        assert size in {32, 64}
+
+        arr = self._solver.declarations.get(name)
 
-        if name in self._solver.declarations:
-            return self._solver.declarations[name]
+        if arr is not None:
+            return arr
 
         arr = smtsymbol.BitVecArray(size, 8, name)
 
@@ -219,6 +294,14 @@ class SmtTranslator(object):
 
     # Auxiliary functions
     # ======================================================================== #
+    def _update_arch_alias_info(self):
+        """Merge register aliases and sizes in a single table.
+        """
+        self._arch_alias_info = {}
+
+        for name, (base_name, offset) in self._arch_alias_mapper.items():
+            self._arch_alias_info[name] = (base_name, offset, self._arch_regs_size.get(base_name))
+
     def _register_name(self, name):
         """Get register name.
         """
@@ -228,30 +311,52 @@ class SmtTranslator(object):
     def _get_var_name(self, name, fresh=False):
         """Get variable name.
         """
-        if name not in self._var_name_mappers:
-            self._var_name_mappers[name] = VariableNamer(name)
+        if not fresh:
+            var_name = self._var_names_curr.get(name)
+
+            if var_name is not None:
+                return var_name
+
+        namer = self._var_name_mappers.get(name)
+
+        if namer is None:
+            namer = self._var_name_mappers[name] = VariableNamer(name)
 
         if fresh:
-            var_name = self._var_name_mappers[name].get_next()
+            var_name = namer.get_next()
         else:
-            var_name = self._var_name_mappers[name].get_current()
+            var_name = namer.get_current()
+
+        self._var_names_curr[name] = var_name
 
         return var_name
 
+    def _make_fresh_bitvec(self, size, name):
+        # New versions of a variable are never declared yet, so there is
+        # no need to look them up first (declare_fun still rejects a
+        # duplicate).
+        assert size in {1, 8, 16, 32, 40, 64, 72, 128, 256}
+
+        bv = smtsymbol.BitVec(size, name)
+
+        self._solver.declare_fun(name, bv)
+
+        return bv
+
     def _translate_src_oprnd(self, operand):
         """Translate source operand to a SMT expression.
         """
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             return self._translate_src_register_oprnd(operand)
-        elif isinstance(operand, ReilImmediateOperand):
-            return smtsymbol.Constant(operand.size, operand.immediate)
+        elif type(operand) is ReilImmediateOperand:
+            return smtsymbol.make_constant(operand.size, operand.immediate)
         else:
             raise Exception("Invalid operand type")
 
     def _translate_dst_oprnd(self, operand):
         """Translate destination operand to a SMT expression.
         """
-        if isinstance(operand, ReilRegisterOperand):
+        if type(operand) is ReilRegisterOperand:
             return self._translate_dst_register_oprnd(operand)
         else:
             raise Exception("Invalid operand type")
@@ -259,257 +364,169 @@ class SmtTranslator(object):
     def _translate_src_register_oprnd(self, operand):
         """Translate source register operand to SMT expr.
         """
-        reg_info = self._arch_alias_mapper.get(operand.name, None)
+        reg_info = self._arch_alias_info.get(operand.name)
 
-        if reg_info:
-            var_base_name, offset = reg_info
+        if not reg_info:
+            var_name = self._get_var_name(operand.name)
 
-            var_size = self._arch_regs_size[var_base_name]
-        else:
-            var_base_name = operand.name
-            var_size = operand.size
+            return self.make_bitvec(operand.size, var_name)
+
+        var_base_name, offset, var_size = reg_info
 
         var_name = self._get_var_name(var_base_name)
         ret_val = self.make_bitvec(var_size, var_name)
 
-        if reg_info:
-            ret_val = smtfunction.extract(ret_val, offset, operand.size)
+        key = (var_name, offset, operand.size)
+
+        expr = self._src_oprnd_cache.get(key)
+
+        if expr is None:
+            expr = self._src_oprnd_cache[key] = smtfunction.extract(ret_val, offset, operand.size)
+
+        return expr
+
+    def _alias_dst_oprnd(self, operand, expr):
+        """Bind the next version of a destination operand to an expression,
+        so no equality has to be asserted. It is only done for REIL
+        temporal registers (native registers must stay declared, as their
+        names are handed out by get_name_init and get_name_curr) and when
+        the expression is a variable or a constant. Return whether the
+        operand was aliased.
+        """
+        if type(operand) is not ReilRegisterOperand or not _is_temporal(operand.name):
+            return False
+
+        if type(expr) is not smtsymbol.Constant and (type(expr) is not smtsymbol.BitVec or expr._op is not None):
+            return False
+
+        self._aliases[self._get_var_name(operand.name, fresh=True)] = expr
 
-        return ret_val
+        return True
 
     def _translate_dst_register_oprnd(self, operand):
         """Translate destination register operand to SMT expr.
         """
-        reg_info = self._arch_alias_mapper.get(operand.name, None)
+        reg_info = self._arch_alias_info.get(operand.name)
 
         parent_reg_constrs = []
 
         if reg_info:
-            var_base_name, offset = reg_info
+            var_base_name, offset, var_size = reg_info
 
             var_name_old = self._get_var_name(var_base_name, fresh=False)
             var_name_new = self._get_var_name(var_base_name, fresh=True)
-            var_size = self._arch_regs_size[var_base_name]
 
             ret_val_old = self.make_bitvec(var_size, var_name_old)
-            ret_val_new = self.make_bitvec(var_size, var_name_new)
+            ret_val_new = self._make_fresh_bitvec(var_size, var_name_new)
 
             ret_val = smtfunction.extract(ret_val_new, offset, operand.size)
 
-            if 0 < offset < var_size - 1:
-                lower_expr_1 = smtfunction.extract(ret_val_new, 0, offset)
-                lower_expr_2 = smtfunction.extract(ret_val_old, 0, offset)
+            # The bits of the base register outside the alias keep their
+            # value.
+            mask = ((1 << var_size) - 1) ^ (((1 << operand.size) - 1) << offset)
 
-                parent_reg_constrs += [lower_expr_1 == lower_expr_2]
-
-                upper_expr_1 = smtfunction.extract(ret_val_new, offset + operand.size, var_size - offset - operand.size)
-                upper_expr_2 = smtfunction.extract(ret_val_old, offset + operand.size, var_size - offset - operand.size)
-
-                parent_reg_constrs += [upper_expr_1 == upper_expr_2]
-            elif offset == 0:
-                upper_expr_1 = smtfunction.extract(ret_val_new, offset + operand.size, var_size - offset - operand.size)
-                upper_expr_2 = smtfunction.extract(ret_val_old, offset + operand.size, var_size - offset - operand.size)
-
-                parent_reg_constrs += [upper_expr_1 == upper_expr_2]
-            elif offset == var_size-1:
-                lower_expr_1 = smtfunction.extract(ret_val_new, 0, offset)
-                lower_expr_2 = smtfunction.extract(ret_val_old, 0, offset)
-
-                parent_reg_constrs += [lower_expr_1 == lower_expr_2]
+            if mask:
+                parent_reg_constrs += [ret_val_new & mask == ret_val_old & mask]
         else:
             var_name_new = self._get_var_name(operand.name, fresh=True)
 
-            ret_val = self.make_bitvec(operand.size, var_name_new)
+            ret_val = self._make_fresh_bitvec(operand.size, var_name_new)
 
         return ret_val, parent_reg_constrs
 
     # Arithmetic Instructions
     # ======================================================================== #
-    def _translate_add(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of an ADD instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+    def _translate_binary_op(self, operation, extend_operands, oprnd1, oprnd2, oprnd3):
+        """Return a formula representation of an ADD, SUB, MUL, DIV,
+        MOD, AND, OR or XOR instruction.
 
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+        When the result is wider than the operands, arithmetic
+        operations (*extend_operands*) are computed at the result size
+        so carries are kept; bitwise ones are extended afterwards.
 
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var, oprnd3.size) + smtfunction.zero_extend(op2_var, oprnd3.size)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var + op2_var, 0, oprnd3.size)
-        else:
-            result = op1_var + op2_var
-
-        return [op3_var == result] + op3_var_constrs
-
-    def _translate_sub(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of an SUB instruction.
         """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        assert oprnd1.size and oprnd1.size == oprnd2.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var, oprnd3.size) - smtfunction.zero_extend(op2_var, oprnd3.size)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var - op2_var, 0, oprnd3.size)
-        else:
-            result = op1_var - op2_var
+        size = oprnd3.size
 
-        return [op3_var == result] + op3_var_constrs
+        if size == oprnd1.size:
+            result = operation(op1_var, op2_var)
+        elif size < oprnd1.size:
+            result = smtfunction.extract(operation(op1_var, op2_var), 0, size)
+        elif extend_operands:
+            result = operation(smtfunction.zero_extend(op1_var, size), smtfunction.zero_extend(op2_var, size))
+        else:
+            result = smtfunction.zero_extend(operation(op1_var, op2_var), size)
 
-    def _translate_mul(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of an MUL instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        if self._alias_dst_oprnd(oprnd3, result):
+            return []
 
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
         op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var, oprnd3.size) * smtfunction.zero_extend(op2_var, oprnd3.size)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var * op2_var, 0, oprnd3.size)
-        else:
-            result = op1_var * op2_var
-
         return [op3_var == result] + op3_var_constrs
 
-    def _translate_div(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of an DIV instruction.
+    def _translate_bsh(self, oprnd1, oprnd2, oprnd3):
+        """Return a formula representation of a BSH instruction.
         """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        assert oprnd1.size and oprnd1.size == oprnd2.size and oprnd3.size
 
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+        # Shift of two immediates, fold it (as the emulator does).
+        if type(oprnd1) is ReilImmediateOperand and type(oprnd2) is ReilImmediateOperand:
+            op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
-        if oprnd3.size > oprnd1.size:
-            op1_var_zx = smtfunction.zero_extend(op1_var, oprnd3.size)
-            op2_var_zx = smtfunction.zero_extend(op2_var, oprnd3.size)
+            if extract_sign_bit(oprnd2.immediate, oprnd2.size) == 0:
+                value = oprnd1.immediate << min(oprnd2.immediate, oprnd3.size)
+            else:
+                value = oprnd1.immediate >> twos_complement(oprnd2.immediate, oprnd2.size)
 
-            result = op1_var_zx.udiv(op2_var_zx)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var.udiv(op2_var), 0, oprnd3.size)
-        else:
-            result = op1_var.udiv(op2_var)
-
-        return [op3_var == result] + op3_var_constrs
-
-    def _translate_mod(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of an MOD instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+            return [op3_var == smtsymbol.make_constant(oprnd3.size, value)] + op3_var_constrs
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op2_var = self._translate_src_oprnd(oprnd2)
         op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
-        if oprnd3.size > oprnd1.size:
-            op1_var_zx = smtfunction.zero_extend(op1_var, oprnd3.size)
-            op2_var_zx = smtfunction.zero_extend(op2_var, oprnd3.size)
-
-            result = op1_var_zx.umod(op2_var_zx)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var.umod(op2_var), 0, oprnd3.size)
+        # The direction of a shift by an immediate is known, only build
+        # that branch.
+        if type(oprnd2) is ReilImmediateOperand:
+            shift_left = extract_sign_bit(oprnd2.immediate, oprnd2.size) == 0
+            shift_right = not shift_left
         else:
-            result = op1_var.umod(op2_var)
-
-        return [op3_var == result] + op3_var_constrs
+            shift_left = shift_right = True
 
-    def _translate_bsh(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of a BSH instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
-
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+        shl = shr = None
 
         if oprnd3.size > oprnd1.size:
             op1_var_zx = smtfunction.zero_extend(op1_var, oprnd3.size)
-            op2_var_zx = smtfunction.zero_extend(op2_var, oprnd3.size)
-            op2_var_neg_sx = smtfunction.sign_extend(-op2_var, oprnd3.size)
 
-            shr = smtfunction.extract(op1_var_zx >> op2_var_neg_sx, 0, op3_var.size)
-            shl = smtfunction.extract(op1_var_zx << op2_var_zx, 0, op3_var.size)
-        elif oprnd3.size < oprnd1.size:
-            shr = smtfunction.extract(op1_var >> -op2_var, 0, op3_var.size)
-            shl = smtfunction.extract(op1_var << op2_var, 0, op3_var.size)
-        else:
-            shr = op1_var >> -op2_var
-            shl = op1_var << op2_var
+            if shift_right:
+                op2_var_neg_sx = smtfunction.sign_extend(-op2_var, oprnd3.size)
 
-        result = smtfunction.ite(oprnd3.size, op2_var >= 0, shl, shr)
+                shr = op1_var_zx >> op2_var_neg_sx
 
-        return [op3_var == result] + op3_var_constrs
+            if shift_left:
+                op2_var_zx = smtfunction.zero_extend(op2_var, oprnd3.size)
 
-    # Bitwise Instructions
-    # ======================================================================== #
-    def _translate_and(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of a AND instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
-
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
-
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var & op2_var, oprnd3.size)
+                shl = op1_var_zx << op2_var_zx
         elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var & op2_var, 0, oprnd3.size)
-        else:
-            result = op1_var & op2_var
-
-        return [op3_var == result] + op3_var_constrs
+            if shift_right:
+                shr = smtfunction.extract(op1_var >> -op2_var, 0, op3_var.size)
 
-    def _translate_or(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of a OR instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
-
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
-
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var | op2_var, oprnd3.size)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var | op2_var, 0, oprnd3.size)
+            if shift_left:
+                shl = smtfunction.extract(op1_var << op2_var, 0, op3_var.size)
         else:
-            result = op1_var | op2_var
+            if shift_right:
+                shr = op1_var >> -op2_var
 
-        return [op3_var == result] + op3_var_constrs
-
-    def _translate_xor(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of a AND instruction.
-        """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+            if shift_left:
+                shl = op1_var << op2_var
 
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op2_var = self._translate_src_oprnd(oprnd2)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
-
-        if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var ^ op2_var, oprnd3.size)
-        elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var ^ op2_var, 0, oprnd3.size)
+        if shift_left and shift_right:
+            result = smtfunction.ite(oprnd3.size, op2_var >= 0, shl, shr)
         else:
-            result = op1_var ^ op2_var
+            result = shl if shift_left else shr
 
         return [op3_var == result] + op3_var_constrs
 
@@ -518,30 +535,53 @@ class SmtTranslator(object):
     def _translate_ldm(self, oprnd1, oprnd2, oprnd3):
         """Return a formula representation of a LDM instruction.
         """
-        assert oprnd1.size and oprnd3.size
-        assert oprnd1.size == self._address_size
+        assert oprnd1.size == self._address_size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
-        exprs = []
+        mem_constrs = self._bind_pending_stores()
+
+        mem = self._mem_curr
 
-        for i in reversed(range(0, oprnd3.size, 8)):
-            exprs += [self._mem_curr[op1_var + i // 8] == smtfunction.extract(op3_var, i, 8)]
+        # Bind all the loaded bytes with a single equality.
+        value = smtfunction.concat(8, *[mem[op1_var + i] for i in reversed(range(oprnd3.size >> 3))])
 
-        return exprs + op3_var_constrs
+        return mem_constrs + [value == op3_var] + op3_var_constrs
 
     def _translate_stm(self, oprnd1, oprnd2, oprnd3):
         """Return a formula representation of a STM instruction.
         """
-        assert oprnd1.size and oprnd3.size
-        assert oprnd3.size == self._address_size
+        assert oprnd1.size and oprnd3.size == self._address_size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op3_var = self._translate_src_oprnd(oprnd3)
 
-        for i in range(0, oprnd1.size, 8):
-            self._mem_curr[op3_var + i//8] = smtfunction.extract(op1_var, i, 8)
+        # Build the stores on a copy, so the declared array of the
+        # current memory version is left as it is.
+        mem = copy(self._mem_curr)
+        extract = smtfunction.extract
+
+        for i in range(oprnd1.size >> 3):
+            mem[op3_var + i] = extract(op1_var, i << 3, 8)
+
+        # Consecutive stores are chained on the current memory, which is
+        # only bound to a new memory version (one equality for all of
+        # them) by the next load, or when the chain gets too long.
+        self._mem_curr = mem
+        self._mem_pending += 1
+
+        if self._mem_pending < _MEM_PENDING_STORES_MAX:
+            return []
+
+        return self._bind_pending_stores()
+
+    def _bind_pending_stores(self):
+        """Bind the stores chained on the current memory to a new memory
+        version. Return the formulas that do it.
+        """
+        if not self._mem_pending:
+            return []
 
         # Memory versioning.
         self._mem_instance += 1
@@ -550,6 +590,7 @@ class SmtTranslator(object):
         mem_new = self.make_array(self._address_size, "MEM_{}".format(self._mem_instance))
 
         self._mem_curr = mem_new
+        self._mem_pending = 0
 
         return [mem_new == mem_old]
 
@@ -559,15 +600,19 @@ class SmtTranslator(object):
         assert oprnd1.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
         if oprnd3.size > oprnd1.size:
-            result = smtfunction.zero_extend(op1_var, op3_var.size)
+            result = smtfunction.zero_extend(op1_var, oprnd3.size)
         elif oprnd3.size < oprnd1.size:
-            result = smtfunction.extract(op1_var, 0, op3_var.size)
+            result = smtfunction.extract(op1_var, 0, oprnd3.size)
         else:
             result = op1_var
 
+        if self._alias_dst_oprnd(oprnd3, result):
+            return []
+
+        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+
         return [op3_var == result] + op3_var_constrs
 
     # Conditional Instructions
@@ -577,11 +622,14 @@ class SmtTranslator(object):
         """
         assert oprnd1.size and oprnd3.size
 
-        op1_var = self._translate_src_oprnd(oprnd1)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+        if type(oprnd1) is ReilImmediateOperand:
+            result = smtsymbol.make_constant(oprnd3.size, 0x1 if oprnd1.immediate == 0x0 else 0x0)
+        else:
+            op1_var = self._translate_src_oprnd(oprnd1)
 
-        result = smtfunction.ite(oprnd3.size, op1_var == 0x0, smtsymbol.Constant(oprnd3.size, 0x1),
-                                    smtsymbol.Constant(oprnd3.size, 0x0))
+            result = smtfunction.ite(oprnd3.size, op1_var == 0x0, 0x1, 0x0)
+
+        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
         return [op3_var == result] + op3_var_constrs
 
@@ -606,11 +654,6 @@ class SmtTranslator(object):
         """
         raise Exception("Unsupported instruction : UNDEF")
 
-    def _translate_nop(self, oprnd1, oprnd2, oprnd3):
-        """Return a formula representation of a NOP instruction.
-        """
-        return []
-
     # Extension
     # ======================================================================== #
     def _translate_sext(self, oprnd1, oprnd2, oprnd3):
@@ -619,22 +662,25 @@ class SmtTranslator(object):
         assert oprnd1.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
-        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
 
         if oprnd3.size > oprnd1.size:
-            result = smtfunction.sign_extend(op1_var, op3_var.size)
+            result = smtfunction.sign_extend(op1_var, oprnd3.size)
         elif oprnd3.size < oprnd1.size:
             raise Exception("Operands size mismatch.")
         else:
             result = op1_var
 
+        if self._alias_dst_oprnd(oprnd3, result):
+            return []
+
+        op3_var, op3_var_constrs = self._translate_dst_oprnd(oprnd3)
+
         return [op3_var == result] + op3_var_constrs
 
     def _translate_sdiv(self, oprnd1, oprnd2, oprnd3):
         """Return a formula representation of an DIV instruction.
         """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        assert oprnd1.size and oprnd1.size == oprnd2.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op2_var = self._translate_src_oprnd(oprnd2)
@@ -655,8 +701,7 @@ class SmtTranslator(object):
     def _translate_smod(self, oprnd1, oprnd2, oprnd3):
         """Return a formula representation of an MOD instruction.
         """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        assert oprnd1.size and oprnd1.size == oprnd2.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op2_var = self._translate_src_oprnd(oprnd2)
@@ -677,8 +722,7 @@ class SmtTranslator(object):
     def _translate_smul(self, oprnd1, oprnd2, oprnd3):
         """Return a formula representation of an MUL instruction.
         """
-        assert oprnd1.size and oprnd2.size and oprnd3.size
-        assert oprnd1.size == oprnd2.size
+        assert oprnd1.size and oprnd1.size == oprnd2.size and oprnd3.size
 
         op1_var = self._translate_src_oprnd(oprnd1)
         op2_var = self._translate_src_oprnd(oprnd2)
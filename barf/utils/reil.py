@@ -83,14 +83,12 @@ class ReilContainerBuilder(object):
         return reil_container
 
     def __translate(self, asm_instrs, reil_container):
-        asm_instr_last = None
         instr_seq_prev = None
 
-        for asm_instr in asm_instrs:
+        for reil_instrs in self.__translator.translate_many(asm_instrs):
             instr_seq = ReilSequence()
 
-            for reil_instr in self.__translator.translate(asm_instr):
-                instr_seq.append(reil_instr)
+            instr_seq.extend(reil_instrs)
 
             if instr_seq_prev:
                 instr_seq_prev.next_sequence_address = instr_seq.address
@@ -99,10 +97,6 @@ class ReilContainerBuilder(object):
 
             instr_seq_prev = instr_seq
 
-        if instr_seq_prev:
-            if asm_instr_last:
-                instr_seq_prev.next_sequence_address = (asm_instr_last.address + asm_instr_last.size) << 8
-
         return reil_container
 
 
@@ -142,14 +136,12 @@ class ReilContainerEx(object):
         return reil_container
 
     def __translate(self, asm_instrs, reil_container):
-        asm_instr_last = None
         instr_seq_prev = None
 
-        for asm_instr in asm_instrs:
+        for reil_instrs in self.__translator.translate_many(asm_instrs):
             instr_seq = ReilSequence()
 
-            for reil_instr in self.__translator.translate(asm_instr):
-                instr_seq.append(reil_instr)
+            instr_seq.extend(reil_instrs)
 
             if instr_seq_prev:
                 instr_seq_prev.next_sequence_address = instr_seq.address
@@ -158,10 +150,6 @@ class ReilContainerEx(object):
 
             instr_seq_prev = instr_seq
 
-        if instr_seq_prev:
-            if asm_instr_last:
-                instr_seq_prev.next_sequence_address = (asm_instr_last.address + asm_instr_last.size) << 8
-
         return reil_container
 
     def add(self, sequence):
@@ -23,25 +23,53 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
+# Masks of the usual operand sizes, to avoid computing them on every call.
+_masks = dict((size, (1 << size) - 1) for size in (1, 8, 16, 32, 40, 64, 72, 128, 256))
+
+
 def extract_sign_bit(value, size):
     return value >> (size-1)
 
 
 def twos_complement(value, size):
-    return 2**size - value
+    return (1 << size) - value
 
 
 def extract_value(main_value, offset, size):
-    return (main_value >> offset) & 2**size-1
+    mask = _masks.get(size)
+
+    if mask is None:
+        mask = (1 << size) - 1
+
+    return (main_value >> offset) & mask
 
 
 def insert_value(main_value, value_to_insert, offset, size):
-    main_value &= ~((2**size-1) << offset)
-    main_value |= (value_to_insert & 2**size-1) << offset
+    mask = _masks.get(size)
+
+    if mask is None:
+        mask = (1 << size) - 1
+
+    main_value &= ~(mask << offset)
+    main_value |= (value_to_insert & mask) << offset
 
     return main_value
 
 
+def add_to_lru_cache(cache, size, key, value):
+    """Add an entry to a least recently used cache (an OrderedDict with
+    the most recently used entries last), evicting the oldest one if the
+    cache is full. A non-positive size disables the cache.
+    """
+    if size <= 0:
+        return
+
+    if len(cache) >= size:
+        cache.popitem(last=False)
+
+    cache[key] = value
+
+
 def read_c_string(emulator, address, max_length=1024):
     i = 0
     data = bytearray()
@@ -68,28 +96,26 @@ class VariableNamer(object):
         self._counter_curr = counter
         self._separator = separator
 
+        # Names are generated very often (one per REIL temporal register),
+        # so build the fixed part of the name only once.
+        self._prefix = base_name + separator
+
     def get_init(self):
         """Return initial name.
         """
-        suffix = self._separator + "%s" % str(self._counter_init)
-
-        return self._base_name + suffix
+        return self._prefix + str(self._counter_init)
 
     def get_current(self):
         """Return current name.
         """
-        suffix = self._separator + "%s" % str(self._counter_curr)
-
-        return self._base_name + suffix
+        return self._prefix + str(self._counter_curr)
 
     def get_next(self):
         """Return next name.
         """
         self._counter_curr += 1
 
-        suffix = self._separator + "%s" % str(self._counter_curr)
-
-        return self._base_name + suffix
+        return self._prefix + str(self._counter_curr)
 
     def reset(self):
         """Restart name counter.
@@ -0,0 +1,74 @@
+# Copyright (c) 2014, Fundacion Dr. Manuel Sadosky
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import
+
+import os
+import unittest
+
+from barf.arch import ARCH_ARM_MODE_ARM
+from barf.arch.arm.disassembler import ArmDisassembler
+from barf.core.binary import BinaryFile
+
+
+def get_full_path(filename):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
+
+class ArmDisassemblerTests(unittest.TestCase):
+
+    def setUp(self):
+        self._disassembler = ArmDisassembler(architecture_mode=ARCH_ARM_MODE_ARM)
+
+    def test_disassemble_all(self):
+        binary = BinaryFile(get_full_path("../samples/bin/loop-simple.arm"))
+
+        start, end = 0x10400, 0x10460
+
+        data = binary.text_section[start:end]
+
+        instrs = self._disassembler.disassemble_all(data, start)
+
+        # Disassemble the same range one instruction at a time.
+        addr = start
+
+        for instr in instrs:
+            expected = self._disassembler.disassemble(binary.text_section[addr:addr + 4], addr)
+
+            self.assertEqual(instr.address, expected.address)
+            self.assertEqual(instr.size, expected.size)
+            self.assertEqual(instr.bytes, expected.bytes)
+            self.assertEqual(str(instr), str(expected))
+
+            addr += instr.size
+
+        self.assertEqual(addr, end)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
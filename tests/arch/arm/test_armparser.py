@@ -125,6 +125,42 @@ class ArmParser32BitsTests(unittest.TestCase):
             asm = self._parser.parse(i)
             self.assertEqual(str(asm), i)
 
+    def test_cache_normalization(self):
+
+        inst_samples = [
+            "mov r0, #0x1",
+            "MOV R0, #0x1",
+            "mov  r0,#0x01",
+            " mov r0 , #0x001 ",
+        ]
+
+        for i in inst_samples:
+            asm = self._parser.parse(i)
+            self.assertEqual(str(asm), inst_samples[0])
+
+        self.assertEqual(len(self._parser._cache), 1)
+
+    def test_cache_disabled(self):
+        parser = ArmParser(ARCH_ARM_MODE_THUMB, cache_size=0)
+
+        asm = parser.parse("mov r0, #0x1")
+
+        self.assertEqual(str(asm), "mov r0, #0x1")
+        self.assertEqual(len(parser._cache), 0)
+
+    def test_parse_many(self):
+
+        inst_samples = [
+            "add r0, r0, r1, lsl #4",
+            "ldr r2, [r3, #-0x3]",
+            "stmfd r13, {r0 - r12, lr}",
+            "add r0, r0, r1, lsl #4",
+        ]
+
+        asms = self._parser.parse_many(inst_samples)
+
+        self.assertEqual([str(asm) for asm in asms], inst_samples)
+
 
 def main():
     unittest.main()
@@ -120,14 +120,12 @@ class ArmTranslationTestCase(unittest.TestCase):
     def _translate(self, asm_instrs):
         instr_container = ReilContainer()
 
-        asm_instr_last = None
         instr_seq_prev = None
 
         for asm_instr in asm_instrs:
             instr_seq = ReilSequence()
 
-            for reil_instr in self.arm_translator.translate(asm_instr):
-                instr_seq.append(reil_instr)
+            instr_seq.extend(self.arm_translator.translate(asm_instr))
 
             if instr_seq_prev:
                 instr_seq_prev.next_sequence_address = instr_seq.address
@@ -136,10 +134,6 @@ class ArmTranslationTestCase(unittest.TestCase):
 
             instr_seq_prev = instr_seq
 
-        if instr_seq_prev:
-            if asm_instr_last:
-                instr_seq_prev.next_sequence_address = (asm_instr_last.address + asm_instr_last.size) << 8
-
         return instr_container
 
     def _asm_to_reil(self, asm_list, address):
@@ -37,6 +37,7 @@ from barf.arch.arm.translator import ArmTranslator
 from barf.arch.emulator import Emulator
 from barf.arch.x86 import X86ArchitectureInformation
 from barf.arch.x86.disassembler import X86Disassembler
+from barf.arch.x86.parser import X86Parser
 from barf.arch.x86.translator import X86Translator
 from barf.core.binary import BinaryFile
 from barf.core.reil.emulator.emulator import ReilEmulator
@@ -106,3 +107,23 @@ class EmulatorTests(unittest.TestCase):
         emu.load_binary(binary)
 
         emu.emulate(0x10401, 0x10432, {}, None, True)
+
+    def test_execute_x86(self):
+        arch_info = X86ArchitectureInformation(ARCH_X86_MODE_32)
+        ir_emulator = ReilEmulator(arch_info)
+        disassembler = X86Disassembler(ARCH_X86_MODE_32)
+        ir_translator = X86Translator(ARCH_X86_MODE_32)
+
+        emu = Emulator(arch_info, ir_emulator, ir_translator, disassembler)
+
+        asm_instr = X86Parser(ARCH_X86_MODE_32).parse("add eax, 0x1")
+        asm_instr.address = 0x08048000
+        asm_instr.size = 3
+
+        ir_emulator.registers["eax"] = 0x0
+
+        for _ in range(3):
+            next_addr = emu.execute(asm_instr)
+
+        self.assertEqual(next_addr, 0x08048003)
+        self.assertEqual(ir_emulator.registers["eax"], 0x3)
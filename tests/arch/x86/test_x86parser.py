@@ -89,6 +89,25 @@ class X86Parser32BitsTests(unittest.TestCase):
 
         self.assertEqual(str(asm), "fucompi st1")
 
+    def test_cache(self):
+        asm1 = self._parser.parse("add eax, ebx")
+        asm1.address = 0x1000
+
+        asm2 = self._parser.parse("ADD EAX, EBX")
+
+        self.assertEqual(str(asm2), "add eax, ebx")
+        self.assertEqual(asm2.address, None)
+        self.assertFalse(asm1 is asm2)
+        self.assertEqual(len(self._parser._cache), 1)
+
+    def test_cache_disabled(self):
+        parser = X86Parser(ARCH_X86_MODE_32, cache_size=0)
+
+        asm = parser.parse("add eax, ebx")
+
+        self.assertEqual(str(asm), "add eax, ebx")
+        self.assertEqual(len(parser._cache), 0)
+
 
 class X86Parser64BitsTests(unittest.TestCase):
 
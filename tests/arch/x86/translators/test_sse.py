@@ -324,8 +324,15 @@ class X86TranslationSseTests(X86TranslationTestCase):
         self.assertEquals(reil_ctx_out["xmm0"], ctx_init["xmm0"])
 
     def test_movsd_sse(self):
-        # TODO: Implement.
-        pass
+        # MOVSD xmm1, xmm2 (f2 0f 10 /r)
+        registers = self._translated_registers(b"\xf2\x0f\x10\xc1", 0xdeadbeef)
+
+        self.assertEqual(registers, {"xmm0", "xmm1"})
+
+        # MOVSD xmm1, m64 (f2 0f 10 /r)
+        registers = self._translated_registers(b"\xf2\x0f\x10\x06", 0xdeadbeef)
+
+        self.assertEqual(registers, {"xmm0", "rsi"})
 
     def test_pcmpeqb(self):
         asm = ["pcmpeqb xmm0, xmm1"]
@@ -83,8 +83,17 @@ class X86TranslationStringTests(X86TranslationTestCase):
         pass
 
     def test_movsd(self):
-        # TODO: Implement.
-        pass
+        # MOVSD m32, m32 (a5)
+        registers = self._translated_registers(b"\xa5", 0xdeadbeef)
+
+        self.assertTrue({"rsi", "rdi"} <= registers)
+        self.assertFalse("rcx" in registers)
+
+    def test_rep_movsd(self):
+        # REP MOVSD m32, m32 (f3 a5)
+        registers = self._translated_registers(b"\xf3\xa5", 0xdeadbeef)
+
+        self.assertTrue({"rcx", "rsi", "rdi"} <= registers)
 
     def test_movsq(self):
         # TODO: Implement.
@@ -33,10 +33,12 @@ import pyasmjit
 
 from barf.arch import ARCH_X86_MODE_64
 from barf.arch.x86 import X86ArchitectureInformation
+from barf.arch.x86.disassembler import X86Disassembler
 from barf.arch.x86.helpers import compare_contexts
 from barf.arch.x86.helpers import print_contexts
 from barf.arch.x86.parser import X86Parser
 from barf.arch.x86.translator import X86Translator
+from barf.core.reil import ReilRegisterOperand
 from barf.core.reil.container import ReilContainer
 from barf.core.reil.container import ReilSequence
 from barf.core.reil.emulator.emulator import ReilEmulator
@@ -50,6 +52,7 @@ class X86TranslationTestCase(unittest.TestCase):
         self.arch_info = X86ArchitectureInformation(self.arch_mode)
 
         self.x86_parser = X86Parser(self.arch_mode)
+        self.x86_disassembler = X86Disassembler(self.arch_mode)
         self.x86_translator = X86Translator(self.arch_mode)
         self.reil_emulator = ReilEmulator(self.arch_info)
 
@@ -149,14 +152,12 @@ class X86TranslationTestCase(unittest.TestCase):
     def _translate(self, asm_instrs):
         instr_container = ReilContainer()
 
-        asm_instr_last = None
         instr_seq_prev = None
 
         for asm_instr in asm_instrs:
             instr_seq = ReilSequence()
 
-            for reil_instr in self.x86_translator.translate(asm_instr):
-                instr_seq.append(reil_instr)
+            instr_seq.extend(self.x86_translator.translate(asm_instr))
 
             if instr_seq_prev:
                 instr_seq_prev.next_sequence_address = instr_seq.address
@@ -165,12 +166,23 @@ class X86TranslationTestCase(unittest.TestCase):
 
             instr_seq_prev = instr_seq
 
-        if instr_seq_prev:
-            if asm_instr_last:
-                instr_seq_prev.next_sequence_address = (asm_instr_last.address + asm_instr_last.size) << 8
-
         return instr_container
 
+    def _translated_registers(self, data, address):
+        """Return the native registers accessed by the translation of an
+        encoded instruction.
+        """
+        x86_instr = self.x86_disassembler.disassemble(data, address)
+
+        registers = set()
+
+        for reil_instr in self.x86_translator.translate(x86_instr):
+            for oprnd in reil_instr.operands:
+                if isinstance(oprnd, ReilRegisterOperand) and oprnd.name in self.arch_info.registers_all:
+                    registers.add(oprnd.name)
+
+        return registers
+
     def _asm_to_reil(self, asm_list, address):
         x86_instrs = [self.x86_parser.parse(asm) for asm in asm_list]
 
@@ -140,6 +140,20 @@ class ReilCpuTests(unittest.TestCase):
 
         self.assertEquals((t0 << t1) & 2**32-1, cpu.registers['t2'])
 
+    def test_bsh_left_out_of_range(self):
+        mem = ReilMemoryEx(self.__address_size)
+        cpu = ReilCpu(mem)
+
+        instr = self.__parser.parse(["bsh [QWORD t0, QWORD t1, QWORD t2]"])[0]
+        instr.address = 0xcafecafe00
+
+        cpu.registers['t0'] = 0x12345678
+        cpu.registers['t1'] = 0x7ffffffff0
+
+        cpu.execute(instr)
+
+        self.assertEquals(0x0, cpu.registers['t2'])
+
     def test_bsh_rigt(self):
         mem = ReilMemoryEx(self.__address_size)
         cpu = ReilCpu(mem)
@@ -30,6 +30,7 @@ from barf.arch import ARCH_X86_MODE_32
 from barf.arch.x86 import X86ArchitectureInformation
 from barf.arch.x86.parser import X86Parser
 from barf.arch.x86.translator import X86Translator
+from barf.core.reil import ReilMnemonic
 from barf.core.reil.container import ReilContainer
 from barf.core.reil.container import ReilSequence
 from barf.core.reil.emulator import ReilCpuInvalidAddressError
@@ -40,15 +41,26 @@ from barf.core.reil.parser import ReilParser
 
 class ReilEmulatorTests(unittest.TestCase):
 
-    def setUp(self):
-        self._arch_info = X86ArchitectureInformation(ARCH_X86_MODE_32)
+    # Tests share no state besides the class fixtures, which setUp resets,
+    # so nose's multiprocess plugin may run them in different processes.
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls._arch_info = X86ArchitectureInformation(ARCH_X86_MODE_32)
 
-        self._emulator = ReilEmulator(self._arch_info)
+        cls._emulator = ReilEmulator(cls._arch_info)
 
-        self._asm_parser = X86Parser(ARCH_X86_MODE_32)
-        self._reil_parser = ReilParser()
+        cls._asm_parser = X86Parser(ARCH_X86_MODE_32)
+        cls._reil_parser = ReilParser()
 
-        self._translator = X86Translator(ARCH_X86_MODE_32)
+        cls._translator = X86Translator(ARCH_X86_MODE_32)
+
+    def setUp(self):
+        # Registers, memory, taint and handlers are left over by the
+        # previous test.
+        self._emulator.reset()
+        self._translator.reset()
 
     def test_add(self):
         asm_instrs  = self._asm_parser.parse("add eax, ebx")
@@ -78,31 +90,34 @@ class ReilEmulatorTests(unittest.TestCase):
         # 0x08048070 : 83 fb 00         cmp ebx,0x0
         # 0x08048073 : 75 f5            jne 0x0804806a
 
-        asm_instrs_str  = [(0x08048060, "mov eax,0x0", 5)]
-        asm_instrs_str += [(0x08048065, "mov ebx,0xa", 5)]
-        asm_instrs_str += [(0x0804806a, "add eax,0x1", 3)]
-        asm_instrs_str += [(0x0804806d, "sub ebx,0x1", 3)]
-        asm_instrs_str += [(0x08048070, "cmp ebx,0x0", 3)]
-        asm_instrs_str += [(0x08048073, "jne 0x0804806a", 2)]
+        for count in [0x1, 0xa, 0x40]:
+            asm_instrs_str  = [(0x08048060, "mov eax,0x0", 5)]
+            asm_instrs_str += [(0x08048065, "mov ebx,{:#x}".format(count), 5)]
+            asm_instrs_str += [(0x0804806a, "add eax,0x1", 3)]
+            asm_instrs_str += [(0x0804806d, "sub ebx,0x1", 3)]
+            asm_instrs_str += [(0x08048070, "cmp ebx,0x0", 3)]
+            asm_instrs_str += [(0x08048073, "jne 0x0804806a", 2)]
 
-        asm_instrs = []
+            asm_instrs = []
 
-        for addr, asm, size in asm_instrs_str:
-            asm_instr = self._asm_parser.parse(asm)
-            asm_instr.address = addr
-            asm_instr.size = size
+            for addr, asm, size in asm_instrs_str:
+                asm_instr = self._asm_parser.parse(asm)
+                asm_instr.address = addr
+                asm_instr.size = size
 
-            asm_instrs.append(asm_instr)
+                asm_instrs.append(asm_instr)
 
-        reil_instrs = self.__translate(asm_instrs)
+            reil_instrs = self.__translate(asm_instrs)
 
-        regs_final, _ = self._emulator.execute(
-            reil_instrs,
-            start=0x08048060 << 8
-        )
+            regs_final, _ = self._emulator.execute(
+                reil_instrs,
+                start=0x08048060 << 8
+            )
 
-        self.assertEqual(regs_final["eax"], 0xa)
-        self.assertEqual(regs_final["ebx"], 0x0)
+            eax, ebx = self.__loop(0x0, count)
+
+            self.assertEqual(regs_final["eax"], eax)
+            self.assertEqual(regs_final["ebx"], ebx)
 
     def test_mov(self):
         asm_instrs  = [self._asm_parser.parse("mov eax, 0xdeadbeef")]
@@ -125,7 +140,7 @@ class ReilEmulatorTests(unittest.TestCase):
 
     def test_pre_handler(self):
         def pre_handler(emulator, instruction, parameter):
-            paramter.append(True)
+            paramter.append(instruction.mnemonic)
 
         asm = ["mov eax, ebx"]
 
@@ -142,6 +157,7 @@ class ReilEmulatorTests(unittest.TestCase):
         )
 
         self.assertTrue(len(paramter) > 0)
+        self.assertTrue(all(mnemonic == ReilMnemonic.STR for mnemonic in paramter))
 
     def test_post_handler(self):
         def post_handler(emulator, instruction, parameter):
@@ -220,6 +236,15 @@ class ReilEmulatorTests(unittest.TestCase):
 
     # Auxiliary methods
     # ======================================================================== #
+    def __loop(self, eax, ebx):
+        # Reference implementation of the test_loop program.
+        while True:
+            eax = (eax + 1) & 0xffffffff
+            ebx = (ebx - 1) & 0xffffffff
+
+            if ebx == 0:
+                return eax, ebx
+
     def __set_address(self, address, asm_instrs):
         addr = address
 
@@ -230,14 +255,12 @@ class ReilEmulatorTests(unittest.TestCase):
     def __translate(self, asm_instrs):
         instr_container = ReilContainer()
 
-        asm_instr_last = None
         instr_seq_prev = None
 
-        for asm_instr in asm_instrs:
+        for reil_instrs in self._translator.translate_many(asm_instrs):
             instr_seq = ReilSequence()
 
-            for reil_instr in self._translator.translate(asm_instr):
-                instr_seq.append(reil_instr)
+            instr_seq.extend(reil_instrs)
 
             if instr_seq_prev:
                 instr_seq_prev.next_sequence_address = instr_seq.address
@@ -246,12 +269,6 @@ class ReilEmulatorTests(unittest.TestCase):
 
             instr_seq_prev = instr_seq
 
-        if instr_seq_prev:
-            if asm_instr_last:
-                instr_seq_prev.next_sequence_address = (asm_instr_last.address + asm_instr_last.size) << 8
-
-        # instr_container.dump()
-
         return instr_container
 
 
@@ -28,6 +28,7 @@ import unittest
 
 from barf.core.smt.smtsymbol import BitVec
 from barf.core.smt.smtsymbol import Bool
+from barf.core.smt.smtsymbol import Constant
 
 from barf.core.smt.smtfunction import concat
 from barf.core.smt.smtfunction import extract
@@ -62,6 +63,20 @@ class SmtFunctionTests(unittest.TestCase):
         self.assertEqual(x2.value, "((_ extract 23 16) x)")
         self.assertEqual(x3.value, "((_ extract 31 24) x)")
 
+    def test_extract_known_bits(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+        z = concat(32, x, y)
+        w = zero_extend(x, 64)
+
+        self.assertEqual(extract(z, 0, 32).value, "y")
+        self.assertEqual(extract(z, 32, 32).value, "x")
+        self.assertEqual(extract(z, 16, 32).value, "((_ extract 47 16) (concat x y))")
+        self.assertEqual(extract(w, 0, 32).value, "x")
+        self.assertEqual(extract(w, 32, 32).value, "#x00000000")
+        self.assertEqual(extract(x | 0xff00, 8, 8).value, "#xff")
+        self.assertEqual(extract(x & 0xff00, 16, 16).value, "#x0000")
+
     def test_ite(self):
         b = Bool("b")
         x = BitVec(32, "x")
@@ -73,6 +88,13 @@ class SmtFunctionTests(unittest.TestCase):
         self.assertEqual(v.value, "(ite (= x #x00000000) y z)")
         self.assertEqual(w.value, "(ite b y z)")
 
+    def test_ite_constants(self):
+        b = Bool("b")
+        v = ite(32, b, 1, 0)
+
+        self.assertEqual(v.value, "(ite b #x00000001 #x00000000)")
+        self.assertTrue(v is ite(32, b, 1, 0))
+
     def test_concat(self):
         x = BitVec(32, "x")
         y = BitVec(32, "y")
@@ -82,6 +104,39 @@ class SmtFunctionTests(unittest.TestCase):
         self.assertEqual(z.value, "(concat x y)")
         self.assertEqual(v.value, "x")
 
+    def test_constant_operands(self):
+        x = Constant(8, 0x80)
+        y = Constant(8, 0x01)
+
+        self.assertEqual(zero_extend(x, 16).value, "#x0080")
+        self.assertEqual(sign_extend(x, 16).value, "#xff80")
+        self.assertEqual(sign_extend(y, 16).value, "#x0001")
+        self.assertEqual(concat(8, x, y).value, "#x8001")
+
+    def test_known_bits_folding(self):
+        b = Bool("b")
+        x = BitVec(8, "x")
+
+        self.assertEqual(concat(8, x | 0xff, x & 0).value, "#xff00")
+        self.assertEqual(ite(8, b, x, x).value, "x")
+        self.assertEqual(ite(8, b, x | 0xff, Constant(8, 0xff)).value, "#xff")
+        self.assertEqual(extract(ite(16, b, zero_extend(x, 16), Constant(16, 1)), 8, 8).value, "#x00")
+        self.assertEqual(extract(sign_extend(x | 0x80, 16), 8, 8).value, "#xff")
+
+    def test_shared_expressions(self):
+        b = Bool("b")
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        self.assertTrue(zero_extend(x, 64) is zero_extend(x, 64))
+        self.assertTrue(sign_extend(x, 64) is sign_extend(x, 64))
+        self.assertTrue(extract(x, 8, 8) is extract(x, 8, 8))
+        self.assertTrue(ite(32, b, x, y) is ite(32, b, x, y))
+        self.assertTrue(concat(32, x, y) is concat(32, x, y))
+
+        self.assertFalse(zero_extend(x, 64) is sign_extend(x, 64))
+        self.assertFalse(concat(32, x, y) is concat(32, y, x))
+
 
 def main():
     unittest.main()
@@ -26,12 +26,25 @@ from __future__ import absolute_import
 
 import unittest
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 from barf.core.reil.parser import ReilParser
 from barf.core.smt.smtsymbol import BitVec
 from barf.core.smt.smtsymbol import Bool
 from barf.core.smt.smtsolver import Z3Solver as SmtSolver
+from barf.core.smt.smtsolver import Z3NativeSolver
+from barf.core.smt.smtsolver import _ResultCache
+from barf.core.smt.smtsolver import _read_response
 # from barf.core.smt.smtsolver import CVC4Solver as SmtSolver
 
+try:
+    import z3
+except ImportError:
+    z3 = None
+
 
 class SmtSolverBitVecTests(unittest.TestCase):
 
@@ -461,6 +474,196 @@ class SmtSolverBitVecTests(unittest.TestCase):
         # TODO Implement.
         pass
 
+    # Solver results.
+    def test_repeated_check(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        for _ in range(2):
+            self._solver.reset()
+
+            self._solver.declare_fun("x", x)
+            self._solver.declare_fun("y", y)
+
+            self._solver.add(x + y == 10)
+            self._solver.add(x > 1)
+
+            self.assertEqual(self._solver.check(), "sat")
+
+            x_val = self._solver.get_value(x)
+            y_val = self._solver.get_value(y)
+
+            self.assertTrue((x_val + y_val) & 0xffffffff == 10)
+
+            self._solver.add(x == y)
+            self._solver.add(x != y)
+
+            self.assertEqual(self._solver.check(), "unsat")
+
+    def test_get_value(self):
+        x = BitVec(1, "x")
+        y = BitVec(6, "y")
+
+        self._solver.declare_fun("x", x)
+        self._solver.declare_fun("y", y)
+
+        self._solver.add(x == 1)
+        self._solver.add(y == 45)
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertEqual(self._solver.get_value(x), 1)
+        self.assertEqual(self._solver.get_value(y), 45)
+        self.assertEqual(self._solver.get_value(y + 1), 46)
+
+    def test_get_value_new_model(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x > 1)
+
+        self.assertEqual(self._solver.check(), "sat")
+
+        value = self._solver.get_value(x)
+
+        self.assertEqual(self._solver.get_value(x), value)
+
+        # Values are not kept across models.
+        self._solver.add(x != value)
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertNotEqual(self._solver.get_value(x), value)
+
+    def test_push_pop(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x > 1)
+
+        self._solver.push()
+
+        self._solver.declare_fun("y", y)
+
+        self._solver.add(x == y)
+        self._solver.add(y < 1)
+
+        self.assertEqual(self._solver.check(), "unsat")
+
+        self._solver.pop()
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertTrue(self._solver.get_value(x) > 1)
+        self.assertFalse("y" in self._solver.declarations)
+
+        # Constraints and symbols removed by pop can be added again.
+        self._solver.declare_fun("y", y)
+
+        self._solver.add(x == y)
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertEqual(self._solver.get_value(y), self._solver.get_value(x))
+
+    def test_pop_checked(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x > 1)
+
+        self.assertEqual(self._solver.check(), "sat")
+
+        self._solver.push()
+
+        self._solver.add(x < 1)
+
+        self.assertEqual(self._solver.check(), "unsat")
+
+        self._solver.pop()
+
+        # The problem checked before the push is back.
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertTrue(self._solver.get_value(x) > 1)
+
+    def test_pop_unchecked(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x > 1)
+
+        self._solver.push()
+
+        # Never checked before the pop.
+        self._solver.add(x < 1)
+
+        self._solver.pop()
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertTrue(self._solver.get_value(x) > 1)
+
+    def test_serialize(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        self._solver.declare_fun("x", x)
+        self._solver.declare_fun("y", y)
+
+        self._solver.add(x + y == 10)
+        self._solver.add(x > 1)
+
+        out = StringIO()
+
+        self._solver.serialize(out)
+
+        self.assertEqual(out.getvalue(), str(self._solver) + "\n")
+
+    def test_str(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        text = str(self._solver)
+
+        self._solver.push()
+        self._solver.add(x > 1)
+
+        self.assertEqual(str(self._solver), text + "\n(assert (bvsgt x #x00000001))")
+
+        self._solver.pop()
+
+        self.assertEqual(str(self._solver), text)
+
+    def test_trivial_constraint(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x > 1)
+
+        self.assertEqual(self._solver.check(), "sat")
+
+        # Constraints that always hold are not added.
+        self._solver.add(x == x)
+        self._solver.add((x | 0xffffffff) == 0xffffffff)
+
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertEqual(str(self._solver), "(declare-fun x () (_ BitVec 32))\n(assert (bvsgt x #x00000001))")
+
+    def test_duplicate_constraint(self):
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        constraint = x > 1
+
+        self._solver.add(constraint)
+        self._solver.add(constraint)
+
+        self.assertEqual(str(self._solver).count("(assert"), 1)
+        self.assertEqual(self._solver.check(), "sat")
+
     # Arithmetic operators (unsigned)
     def test_udiv(self):
         # TODO Implement.
@@ -471,6 +674,102 @@ class SmtSolverBitVecTests(unittest.TestCase):
         pass
 
 
+class SmtSolverResponseTests(unittest.TestCase):
+
+    def test_read_response(self):
+        stream = StringIO("((x\n  #x00000001))\nsat\n")
+
+        self.assertEqual(_read_response(stream), "((x\n  #x00000001))")
+        self.assertEqual(_read_response(stream), "sat")
+
+    def test_read_response_quoted(self):
+        # Parentheses within strings are not counted.
+        stream = StringIO("(error \"line 1 column 5: '(' expected\")\nsat\n")
+
+        self.assertEqual(_read_response(stream), "(error \"line 1 column 5: '(' expected\")")
+        self.assertEqual(_read_response(stream), "sat")
+
+
+class SmtSolverResultCacheTests(unittest.TestCase):
+
+    def test_lookup(self):
+        cache = _ResultCache()
+
+        cache.store(frozenset(["a", "b"]), "sat")
+        cache.store(frozenset(["c", "d"]), "unsat")
+
+        self.assertEqual(cache.lookup(frozenset(["a", "b"])), "sat")
+        self.assertEqual(cache.lookup(frozenset(["b"])), "sat")
+        self.assertEqual(cache.lookup(frozenset(["c", "d"])), "unsat")
+        self.assertEqual(cache.lookup(frozenset(["a", "c", "d"])), "unsat")
+        self.assertEqual(cache.lookup(frozenset(["a", "c"])), None)
+
+    def test_eviction(self):
+        cache = _ResultCache(size=1)
+
+        cache.store(frozenset(["a"]), "sat")
+        cache.store(frozenset(["b"]), "sat")
+
+        self.assertEqual(cache.lookup(frozenset(["a"])), None)
+        self.assertEqual(cache.lookup(frozenset(["b"])), "sat")
+
+    def test_disabled(self):
+        cache = _ResultCache(size=0)
+
+        cache.store(frozenset(["a"]), "sat")
+
+        self.assertEqual(cache.lookup(frozenset(["a"])), None)
+
+    def test_clear(self):
+        cache = _ResultCache()
+
+        cache.store(frozenset(["a"]), "unsat")
+        cache.clear()
+
+        self.assertEqual(cache.lookup(frozenset(["a", "b"])), None)
+
+
+class SmtSolverResetTests(unittest.TestCase):
+
+    def setUp(self):
+        self._solver = SmtSolver()
+
+    def test_reset_after_error(self):
+        a = BitVec(32, "a")
+        b = BitVec(8, "b")
+
+        self._solver.declare_fun("a", a)
+        self._solver.declare_fun("b", b)
+
+        # Sorts do not match, z3 answers with an error.
+        self._solver.add(Bool("(= a b)"))
+
+        self.assertTrue(self._solver.check().startswith("(error"))
+
+        self._solver.reset()
+
+        x = BitVec(32, "x")
+
+        self._solver.declare_fun("x", x)
+
+        self._solver.add(x == 1)
+
+        self.assertEqual(self._solver.check(), "sat")
+
+        self._solver.add(x == 2)
+
+        self.assertEqual(self._solver.check(), "unsat")
+
+
+@unittest.skipUnless(z3, "z3 Python bindings not installed")
+class Z3NativeSolverBitVecTests(SmtSolverBitVecTests):
+
+    def setUp(self):
+        self._address_size = 32
+        self._parser = ReilParser()
+        self._solver = Z3NativeSolver()
+
+
 def main():
     unittest.main()
 
@@ -26,9 +26,17 @@ from __future__ import absolute_import
 
 import unittest
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 from barf.core.smt.smtsymbol import Bool
 from barf.core.smt.smtsymbol import BitVec
 from barf.core.smt.smtsymbol import BitVecArray
+from barf.core.smt.smtsymbol import Constant
+from barf.core.smt.smtsymbol import known_true
+from barf.core.smt.smtsymbol import make_constant
 
 
 class BoolTests(unittest.TestCase):
@@ -352,6 +360,82 @@ class BitVecTests(unittest.TestCase):
         self.assertEqual(z.value, "(bvurem x y)")
         self.assertEqual(v.value, "(bvurem x #x00000001)")
 
+    def test_serialize(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+        z = (x + y) * -x
+        out = StringIO()
+
+        z.serialize(out)
+
+        self.assertEqual(out.getvalue(), "(bvmul (bvadd x y) (bvneg x))")
+        self.assertEqual(z.value, "(bvmul (bvadd x y) (bvneg x))")
+
+    def test_deep_expression(self):
+        x = BitVec(32, "x")
+        z = x
+
+        for _ in range(10000):
+            z = z - x
+
+        self.assertEqual(z.value, "(bvsub " * 10000 + "x" + " x)" * 10000)
+
+    def test_associative_flattening(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+        z = BitVec(32, "z")
+
+        self.assertEqual(((x + y) + (z + x)).value, "(bvadd x y z x)")
+        self.assertEqual(((x + y) - (z + x)).value, "(bvsub (bvadd x y) (bvadd z x))")
+        self.assertEqual((((x & y) | z) & x).value, "(bvand (bvor (bvand x y) z) x)")
+        self.assertEqual(((x < y) & (y < z) & (z < x)).value, "(and (bvslt x y) (bvslt y z) (bvslt z x))")
+
+    def test_constant_folding(self):
+        x = BitVec(32, "x")
+        c = Constant(32, 0xfffffffe)
+
+        self.assertEqual((c + 3).value, "#x00000001")
+        self.assertEqual((c << 40).value, "#x00000000")
+        self.assertEqual((-c).value, "#x00000002")
+        self.assertEqual((x & 0).value, "#x00000000")
+        self.assertEqual((x | 0xffffffff).value, "#xffffffff")
+        self.assertEqual((x ^ x).value, "#x00000000")
+        self.assertEqual((x & c).value, "(bvand x #xfffffffe)")
+        self.assertEqual(c.udiv(3).value, "#x55555554")
+        self.assertEqual(c.udiv(0).value, "#xffffffff")
+        self.assertEqual(c.umod(0).value, "#xfffffffe")
+
+    def test_make_constant(self):
+        x = BitVec(8, "x")
+
+        self.assertTrue(make_constant(8, 0x12) is make_constant(8, 0x12))
+        self.assertTrue(make_constant(8, -1) is make_constant(8, 0xff))
+        self.assertEqual((x + 0x12).value, "(bvadd x #x12)")
+        self.assertTrue((x + 0x12)._children[1] is make_constant(8, 0x12))
+
+    def test_known_bits_folding(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        self.assertEqual(((x & 0xff) & (y & 0xff00)).value, "#x00000000")
+        self.assertEqual(((x | 0xffff0000) | (y | 0xffff)).value, "#xffffffff")
+        self.assertEqual((~(x | 0xffffffff)).value, "#x00000000")
+        self.assertEqual(((x & 0xff) & (y | 0xff)).value, "(bvand x #x000000ff (bvor y #x000000ff))")
+
+    def test_known_true(self):
+        x = BitVec(32, "x")
+        y = BitVec(32, "y")
+
+        self.assertTrue(known_true(x == x))
+        self.assertTrue(known_true(x.ule(x)))
+        self.assertTrue(known_true((x | 0xffffffff) == 0xffffffff))
+        self.assertTrue(known_true(Bool("true")))
+
+        self.assertFalse(known_true(x == y))
+        self.assertFalse(known_true(x.ult(x)))
+        self.assertFalse(known_true((x | 0xffffffff) == 0))
+        self.assertFalse(known_true((x | 0xff) == 0xff))
+
 
 class BitVecArrayTests(unittest.TestCase):
 
@@ -383,6 +467,24 @@ class BitVecArrayTests(unittest.TestCase):
         self.assertEqual(b.value, "(select a k)")
         self.assertEqual(c.value, "(select a #x00000001)")
 
+    def test_select_over_store(self):
+        a = BitVecArray(32, 8, "a")
+        k = BitVec(32, "k")
+        v = BitVec(8, "v")
+
+        a[1] = v
+        a[2] = 3
+
+        self.assertEqual(a[1].value, "v")
+        self.assertEqual(a[2].value, "#x03")
+        self.assertEqual(a[4].value, "(select a #x00000004)")
+        self.assertEqual(a[k].value, "(select (store (store a #x00000001 v) #x00000002 #x03) k)")
+
+        a[k] = v
+
+        self.assertEqual(a[k].value, "v")
+        self.assertEqual(a[4].value, "(select (store (store (store a #x00000001 v) #x00000002 #x03) k v) #x00000004)")
+
 
 def main():
     unittest.main()
@@ -78,7 +78,7 @@ class SmtTranslatorTests(unittest.TestCase):
         form = self._translator.translate(instr)
 
         self.assertEqual(len(form), 1)
-        self.assertEqual(form[0].value, "(= t2_1 (bvadd ((_ zero_extend 8) t0_0) ((_ zero_extend 8) #x12)))")
+        self.assertEqual(form[0].value, "(= t2_1 (bvadd ((_ zero_extend 8) t0_0) #x0012))")
 
     def test_translate_sub(self):
         instr = self._parser.parse(["sub [BYTE t0, BYTE t1, BYTE t2]"])[0]
@@ -115,6 +115,24 @@ class SmtTranslatorTests(unittest.TestCase):
         self.assertEqual(len(form), 1)
         self.assertEqual(form[0].value, "(= t2_1 (ite (bvsge t1_0 #x00000000) (bvshl t0_0 t1_0) (bvlshr t0_0 (bvneg t1_0))))")
 
+    def test_translate_bsh_immediate_shift(self):
+        instr1 = self._parser.parse(["bsh [DWORD t0, DWORD 0x4, DWORD t2]"])[0]
+        instr2 = self._parser.parse(["bsh [DWORD t0, DWORD 0xfffffffc, DWORD t3]"])[0]
+        form1 = self._translator.translate(instr1)
+        form2 = self._translator.translate(instr2)
+
+        self.assertEqual(form1[0].value, "(= t2_1 (bvshl t0_0 #x00000004))")
+        self.assertEqual(form2[0].value, "(= t3_1 (bvlshr t0_0 #x00000004))")
+
+    def test_translate_bsh_immediates(self):
+        instr1 = self._parser.parse(["bsh [DWORD 0x10, DWORD 0x4, QWORD t2]"])[0]
+        instr2 = self._parser.parse(["bsh [DWORD 0x10, DWORD 0xfffffffe, DWORD t3]"])[0]
+        form1 = self._translator.translate(instr1)
+        form2 = self._translator.translate(instr2)
+
+        self.assertEqual(form1[0].value, "(= #x0000000000000100 t2_1)")
+        self.assertEqual(form2[0].value, "(= #x00000004 t3_1)")
+
     # Bitwise Instructions
     def test_translate_and(self):
         instr = self._parser.parse(["and [BYTE t0, BYTE t1, BYTE t2]"])[0]
@@ -143,21 +161,75 @@ class SmtTranslatorTests(unittest.TestCase):
         form = self._translator.translate(instr)
 
         self.assertEqual(len(form), 1)
-        self.assertEqual(form[0].value, "(= (select MEM_0 (bvadd t0_0 #x00000000)) t2_1)")
+        self.assertEqual(form[0].value, "(= (select MEM_0 t0_0) t2_1)")
 
-    def test_translate_stm(self):
-        instr = self._parser.parse(["stm [BYTE t0, empty, DWORD t2]"])[0]
+    def test_translate_ldm_word(self):
+        instr = self._parser.parse(["ldm [DWORD t0, empty, WORD t2]"])[0]
         form = self._translator.translate(instr)
 
         self.assertEqual(len(form), 1)
-        self.assertEqual(form[0].value, "(= MEM_1 (store MEM_0 (bvadd t2_0 #x00000000) t0_0))")
+        self.assertEqual(form[0].value, "(= (concat (select MEM_0 (bvadd t0_0 #x00000001)) (select MEM_0 t0_0)) t2_1)")
+
+    def test_translate_stm(self):
+        instr1 = self._parser.parse(["stm [BYTE t0, empty, DWORD t2]"])[0]
+        instr2 = self._parser.parse(["stm [BYTE t1, empty, DWORD t3]"])[0]
+        instr3 = self._parser.parse(["ldm [DWORD t2, empty, BYTE t4]"])[0]
+        form1 = self._translator.translate(instr1)
+        form2 = self._translator.translate(instr2)
+        form3 = self._translator.translate(instr3)
+
+        # Consecutive stores are bound to a new memory version by the
+        # next load.
+        self.assertEqual(len(form1), 0)
+        self.assertEqual(len(form2), 0)
+        self.assertEqual(len(form3), 2)
+        self.assertEqual(form3[0].value, "(= MEM_1 (store (store MEM_0 t2_0 t0_0) t3_0 t1_0))")
+        self.assertEqual(form3[1].value, "(= (select MEM_1 t2_0) t4_1)")
+        self.assertEqual(self._solver.declarations["MEM_0"].array.value, "MEM_0")
 
     def test_translate_str(self):
         instr = self._parser.parse(["str [BYTE t0, empty, BYTE t2]"])[0]
         form = self._translator.translate(instr)
 
-        self.assertEqual(len(form), 1)
-        self.assertEqual(form[0].value, "(= t2_1 t0_0)")
+        # Same size operands, the destination is an alias of the source.
+        self.assertEqual(len(form), 0)
+        self.assertEqual(self._translator.make_bitvec(8, "t2_1").value, "t0_0")
+
+    def test_translate_str_register_alias(self):
+        instr = self._parser.parse(["str [BYTE t0, empty, BYTE ah]"])[0]
+        form = self._translator.translate(instr)
+
+        self.assertEqual(len(form), 2)
+        self.assertEqual(form[0].value, "(= ((_ extract 15 8) eax_1) t0_0)")
+        self.assertEqual(form[1].value, "(= (bvand eax_1 #xffff00ff) (bvand eax_0 #xffff00ff))")
+
+    def test_translate_str_alias(self):
+        instr1 = self._parser.parse(["str [BYTE t0, empty, BYTE t1]"])[0]
+        instr2 = self._parser.parse(["str [BYTE t1, empty, WORD t2]"])[0]
+        instr3 = self._parser.parse(["or [BYTE t1, BYTE 0x0, BYTE t3]"])[0]
+        form1 = self._translator.translate(instr1)
+        form2 = self._translator.translate(instr2)
+        form3 = self._translator.translate(instr3)
+
+        self.assertEqual(len(form1), 0)
+        self.assertEqual(form2[0].value, "(= t2_1 ((_ zero_extend 8) t0_0))")
+        self.assertEqual(len(form3), 0)
+        self.assertEqual(self._translator.make_bitvec(8, "t3_1").value, "t0_0")
+
+    def test_translate_str_native_register(self):
+        instr = self._parser.parse(["str [DWORD ebx, empty, DWORD eax]"])[0]
+
+        for form in self._translator.translate(instr):
+            self._solver.add(form)
+
+        eax = self._solver.declarations[self._translator.get_name_curr("eax")]
+        ebx = self._solver.declarations[self._translator.get_name_init("ebx")]
+
+        self._solver.add(ebx == 0x12345678)
+
+        # Native registers are declared, not aliased.
+        self.assertEqual(self._solver.check(), "sat")
+        self.assertEqual(self._solver.get_value(eax), 0x12345678)
 
     # Conditional Instructions
     def test_translate_bisz(self):
@@ -167,6 +239,12 @@ class SmtTranslatorTests(unittest.TestCase):
         self.assertEqual(len(form), 1)
         self.assertEqual(form[0].value, "(= t2_1 (ite (= t0_0 #x00000000) #x00000001 #x00000000))")
 
+    def test_translate_bisz_immediate(self):
+        instr = self._parser.parse(["bisz [DWORD 0x0, empty, BYTE t2]"])[0]
+        form = self._translator.translate(instr)
+
+        self.assertEqual(form[0].value, "(= #x01 t2_1)")
+
     def test_translate_jcc(self):
         instr = self._parser.parse(["jcc [BIT t0, empty, DWORD t2]"])[0]
         form = self._translator.translate(instr)